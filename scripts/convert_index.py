@@ -0,0 +1,19 @@
+import argparse
+
+from soundata.core import convert_index
+
+
+def main(args):
+    for json_path in args.index_paths:
+        print(convert_index(json_path))
+
+
+if __name__ == "__main__":
+    PARSER = argparse.ArgumentParser(
+        description="Convert JSON index files to the SQLite index format."
+    )
+    PARSER.add_argument(
+        "index_paths", type=str, nargs="+", help="Paths to JSON index files."
+    )
+
+    main(PARSER.parse_args())
@@ -1,18 +1,41 @@
 """Core soundata classes
 """
 
+import asyncio
+import atexit
+import collections
+import functools
 import json
 import os
 import random
+import sqlite3
+import tempfile
+import threading
 import types
+import urllib.request
+import uuid
+import weakref
+from collections.abc import Mapping
+from concurrent import futures
 from typing import Any, List, Optional
 
 import numpy as np
 
-from soundata import display_plot_utils, download_utils
+from soundata import download_utils
+from soundata import io
 from soundata import validate
 
 MAX_STR_LEN = 100
+SQLITE_INDEX_EXTENSION = ".sqlite"
+SQLITE_INDEX_SECTIONS = ("clips", "clipgroups")
+SQLITE_INDEX_MMAP_SIZE = 1 << 30
+SQLITE_METADATA_SECTION = "_metadata"
+SHARED_MEMORY_DIR = "/dev/shm"
+AUDIO_BACKENDS = ("thread", "process")
+ASYNC_MAX_CONCURRENCY = 32
+
+# dataset used by the worker processes of Dataset.iter_audio and Dataset.stream
+_worker_dataset = None
 DOCS_URL = "https://soundata.readthedocs.io/en/stable/source/soundata.html"
 DISCLAIMER = """
 ******************************************************************************************
@@ -95,6 +118,10 @@ class Dataset(object):
         readme (str): information about the dataset
         clip (function): a function mapping a clip_id to a soundata.core.Clip
         clipgroup (function): a function mapping a clipgroup_id to a soundata.core.Clipgroup
+        async_executor (concurrent.futures.Executor or None): executor running the
+            loads of the async methods. If None, the event loop's default executor is used
+        async_max_concurrency (int): maximum number of loads of the async methods
+            running at once, per event loop
 
     """
 
@@ -145,6 +172,11 @@ class Dataset(object):
         self._download_info = download_info
         self._license_info = license_info
         self.readme = "{}#module-soundata.datasets.{}".format(DOCS_URL, self.name)
+        self.async_executor = None
+        self.async_max_concurrency = ASYNC_MAX_CONCURRENCY
+        self._async_semaphores = weakref.WeakKeyDictionary()
+        # name of the shared index in use, see share and attach
+        self._shared_index = None
 
         # this is a hack to be able to have dataset-specific docstrings
         self.clip = lambda clip_id: self._clip(clip_id)
@@ -173,8 +205,7 @@ class Dataset(object):
     @cached_property
     def _index(self):
         try:
-            with open(self.index_path, encoding="utf-8") as fhandle:
-                index = json.load(fhandle)
+            index = load_index(self.index_path)
         except FileNotFoundError:
             if self._index_data.remote:
                 raise FileNotFoundError(
@@ -274,6 +305,282 @@ class Dataset(object):
             for clipgroup_id in self.clipgroup_ids
         }
 
+    def load_audio_batch(
+        self, clip_ids=None, num_workers=None, backend="thread", ordered=True
+    ):
+        """Load the audio of many clips concurrently
+
+        Args:
+            clip_ids (list or None): ids of the clips to load. If None, all clips are loaded
+            num_workers (int or None): number of clips decoded concurrently.
+                If None, the number of CPUs is used
+            backend (str): "thread" to decode in threads of this process, or
+                "process" to decode in worker processes
+            ordered (bool): If True, clips are returned in the order of clip_ids,
+                otherwise in the order they finish loading
+
+        Returns:
+            dict:
+                {`clip_id`: (audio signal, sample rate)}
+
+        Raises:
+            ValueError: if backend is not one of AUDIO_BACKENDS
+
+        """
+        return {
+            clip_id: (audio, sample_rate)
+            for clip_id, audio, sample_rate in self.iter_audio(
+                clip_ids, num_workers=num_workers, backend=backend, ordered=ordered
+            )
+        }
+
+    def iter_audio(
+        self, clip_ids=None, num_workers=None, backend="thread", ordered=True
+    ):
+        """Iterate over the audio of many clips, decoded concurrently
+
+        Only a few clips per worker are decoded ahead of the consumer, so memory
+        use does not grow with the number of clips.
+
+        Args:
+            clip_ids (list or None): ids of the clips to load. If None, all clips are loaded
+            num_workers (int or None): number of clips decoded concurrently.
+                If None, the number of CPUs is used
+            backend (str): "thread" to decode in threads of this process, or
+                "process" to decode in worker processes
+            ordered (bool): If True, clips are yielded in the order of clip_ids,
+                otherwise in the order they finish loading
+
+        Yields:
+            * str - clip id
+            * np.ndarray - audio signal
+            * float - sample rate
+
+        Raises:
+            ValueError: if backend is not one of AUDIO_BACKENDS
+
+        """
+        if num_workers is None:
+            num_workers = os.cpu_count() or 1
+        return self._map_clips(
+            "_load_clip_audio", clip_ids, num_workers, backend, ordered, 2 * num_workers
+        )
+
+    def stream(
+        self,
+        clip_ids=None,
+        fields=("audio",),
+        prefetch=64,
+        num_workers=None,
+        backend="thread",
+        ordered=True,
+    ):
+        """Iterate over records of clip fields, loaded ahead of the consumer by workers
+
+        At most ``prefetch`` records are loaded or waiting to be consumed at any
+        time, so memory use does not grow with the number of clips, and workers
+        wait when the consumer is slower than them. An exception raised while
+        loading a clip is raised by the iterator, and stops the workers.
+
+        Args:
+            clip_ids (list or None): ids of the clips to load. If None, all clips are loaded
+            fields (tuple): names of the Clip attributes to load, e.g. ("audio", "tags")
+            prefetch (int): maximum number of records loaded ahead of the consumer
+            num_workers (int or None): number of clips loaded concurrently.
+                If None, the number of CPUs is used
+            backend (str): "thread" to load in threads of this process, or
+                "process" to load in worker processes
+            ordered (bool): If True, records are yielded in the order of clip_ids,
+                otherwise in the order they finish loading
+
+        Yields:
+            * dict - {"clip_id": clip id, field: value of the field for each field}
+
+        Raises:
+            ValueError: if backend is not one of AUDIO_BACKENDS, or prefetch is
+                smaller than 1
+
+        """
+        if prefetch < 1:
+            raise ValueError("prefetch must be at least 1, got {}".format(prefetch))
+        if num_workers is None:
+            num_workers = os.cpu_count() or 1
+        return self._map_clips(
+            "_load_clip_fields",
+            clip_ids,
+            num_workers,
+            backend,
+            ordered,
+            prefetch,
+            tuple(fields),
+        )
+
+    def _map_clips(
+        self, method_name, clip_ids, num_workers, backend, ordered, prefetch, *args
+    ):
+        """Call a method of the dataset on many clips concurrently
+
+        Args:
+            method_name (str): name of the method, called as method(clip_id, *args)
+            clip_ids (list or None): ids of the clips. If None, all clips are used
+            num_workers (int): number of concurrent calls
+            backend (str): "thread" or "process"
+            ordered (bool): If True, results are yielded in the order of clip_ids
+            prefetch (int): maximum number of results computed ahead of the consumer
+            *args: extra arguments of the method
+
+        Returns:
+            generator: the results of the method
+
+        Raises:
+            ValueError: if backend is not one of AUDIO_BACKENDS
+
+        """
+        if backend not in AUDIO_BACKENDS:
+            raise ValueError(
+                "Invalid backend {}. Must be one of {}.".format(backend, AUDIO_BACKENDS)
+            )
+        if clip_ids is None:
+            clip_ids = self.clip_ids
+
+        if backend == "thread":
+            executor = futures.ThreadPoolExecutor(max_workers=num_workers)
+            function = getattr(self, method_name)
+        else:
+            # each worker process builds its own copy of the dataset once
+            executor = futures.ProcessPoolExecutor(
+                max_workers=num_workers,
+                initializer=_init_worker_dataset,
+                initargs=(
+                    type(self),
+                    self.data_home,
+                    self.version,
+                    self._worker_settings(),
+                ),
+            )
+            function = functools.partial(_call_worker_dataset, method_name)
+        return _map_concurrent(executor, function, clip_ids, ordered, prefetch, *args)
+
+    def _worker_settings(self):
+        """Settings of this dataset which worker processes apply to their own
+        copy of it, see _init_worker_dataset
+
+        Returns:
+            dict: {attribute: value}. ``shared_index`` is the name of the shared
+            index to attach to, if any
+
+        """
+        return {"index_path": self.index_path, "shared_index": self._shared_index}
+
+    def _load_clip_fields(self, clip_id, fields):
+        """Load some fields of a clip
+
+        Args:
+            clip_id (str): clip id of the clip
+            fields (tuple): names of the Clip attributes to load
+
+        Returns:
+            dict: {"clip_id": clip id, field: value of the field for each field}
+
+        """
+        clip = self.clip(clip_id)
+        record = {"clip_id": clip_id}
+        for field in fields:
+            record[field] = getattr(clip, field)
+        return record
+
+    async def aload_clip(self, clip_id, fields=("audio",)):
+        """Load some fields of a clip without blocking the event loop
+
+        The clip is loaded by ``async_executor``, and at most
+        ``async_max_concurrency`` clips are loaded at once. Cancelling the call
+        stops waiting for the clip, although a load that already started runs
+        to completion in its worker.
+
+        Args:
+            clip_id (str): clip id of the clip
+            fields (tuple): names of the Clip attributes to load, e.g. ("audio", "tags")
+
+        Returns:
+            dict: {"clip_id": clip id, field: value of the field for each field}
+
+        """
+        loop = asyncio.get_running_loop()
+        if loop not in self._async_semaphores:
+            self._async_semaphores[loop] = asyncio.Semaphore(self.async_max_concurrency)
+        async with self._async_semaphores[loop]:
+            return await loop.run_in_executor(
+                self.async_executor, self._load_clip_fields, clip_id, tuple(fields)
+            )
+
+    async def astream(
+        self, clip_ids=None, fields=("audio",), prefetch=64, ordered=True
+    ):
+        """Asynchronously iterate over records of clip fields, loaded ahead of the consumer
+
+        The async counterpart of ``stream``: clips are loaded with ``aload_clip``,
+        and at most ``prefetch`` records are loaded or waiting to be consumed at
+        any time. Closing or cancelling the iteration cancels the pending loads.
+
+        Args:
+            clip_ids (list or None): ids of the clips to load. If None, all clips are loaded
+            fields (tuple): names of the Clip attributes to load, e.g. ("audio", "tags")
+            prefetch (int): maximum number of records loaded ahead of the consumer
+            ordered (bool): If True, records are yielded in the order of clip_ids,
+                otherwise in the order they finish loading
+
+        Yields:
+            * dict - {"clip_id": clip id, field: value of the field for each field}
+
+        Raises:
+            ValueError: if prefetch is smaller than 1
+
+        """
+        if prefetch < 1:
+            raise ValueError("prefetch must be at least 1, got {}".format(prefetch))
+        if clip_ids is None:
+            clip_ids = self.clip_ids
+
+        clip_ids = iter(clip_ids)
+        pending = collections.deque()
+        try:
+            while True:
+                for clip_id in clip_ids:
+                    pending.append(
+                        asyncio.ensure_future(self.aload_clip(clip_id, fields))
+                    )
+                    if len(pending) >= prefetch:
+                        break
+                if not pending:
+                    return
+                if ordered:
+                    yield await pending.popleft()
+                else:
+                    done, _ = await asyncio.wait(
+                        pending, return_when=asyncio.FIRST_COMPLETED
+                    )
+                    for task in done:
+                        pending.remove(task)
+                        yield task.result()
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def _load_clip_audio(self, clip_id):
+        """Load the audio of a clip
+
+        Args:
+            clip_id (str): clip id of the clip
+
+        Returns:
+            * str - clip id
+            * np.ndarray - audio signal
+            * float - sample rate
+
+        """
+        audio, sample_rate = self.clip(clip_id).audio
+        return clip_id, audio, sample_rate
+
     def choice_clip(self):
         """Choose a random clip
 
@@ -307,7 +614,14 @@ class Dataset(object):
         print(self._license_info)
         print(DISCLAIMER)
 
-    def download(self, partial_download=None, force_overwrite=False, cleanup=False):
+    def download(
+        self,
+        partial_download=None,
+        force_overwrite=False,
+        cleanup=False,
+        num_workers=1,
+        stream=False,
+    ):
         """Download data to `save_dir` and optionally print a message.
 
         Args:
@@ -318,6 +632,12 @@ class Dataset(object):
                 If True, existing files are overwritten by the downloaded files.
             cleanup (bool):
                 Whether to delete any zip/tar files after extracting.
+            num_workers (int):
+                Number of files downloaded concurrently, and of zip members
+                extracted concurrently.
+            stream (bool):
+                If True, tar files are extracted while they are downloaded, and are
+                only kept on disk if cleanup is False.
 
         Raises:
             ValueError: if invalid keys are passed to partial_download
@@ -332,8 +652,52 @@ class Dataset(object):
             info_message=self._download_info,
             force_overwrite=force_overwrite,
             cleanup=cleanup,
+            num_workers=num_workers,
+            stream=stream,
         )
 
+    def share(self, name=None):
+        """Export the index and metadata to a read-only file in shared memory
+
+        The dataset then looks clips and their metadata up in that file instead
+        of keeping them in dictionaries, and so do worker processes forked from
+        this one: their memory use does not grow with the size of the dataset.
+        Processes that are not forked can use the same file by calling
+        ``attach`` with the returned name. The file is removed when this
+        process exits, and only its owner can read it. Metadata values are
+        stored as JSON, so tuples are read back as lists.
+
+        Args:
+            name (str or None): name of the shared index. If None, a unique name is used
+
+        Returns:
+            str: name of the shared index
+
+        """
+        if name is None:
+            name = "soundata_{}_{}_{}".format(self.name, self.version, uuid.uuid4().hex)
+        index_path = shared_index_path(name)
+        write_sqlite_index(self._index, index_path, metadata=self._metadata)
+        atexit.register(remove_shared_index, index_path, os.getpid())
+        self.attach(name)
+        return name
+
+    def attach(self, name):
+        """Use an index and metadata exported by ``share``, possibly in another process
+
+        Args:
+            name (str): name of the shared index
+
+        Raises:
+            FileNotFoundError: if there is no shared index with this name
+
+        """
+        index = load_index(shared_index_path(name))
+        # the cached dictionaries are replaced, and freed
+        self.__dict__["_index"] = index
+        self.__dict__["_metadata"] = index.metadata
+        self._shared_index = name
+
     def explore_dataset(self, clip_id=None):
         """Explore the dataset for a given clip_id or a random clip if clip_id is None.
 
@@ -342,6 +706,9 @@ class Dataset(object):
                 The identifier of the clip to explore. If None, a random clip will be chosen.
 
         """
+        # imported here so the plotting stack is only loaded when it is needed
+        from soundata import display_plot_utils
+
         display_plot_utils.perform_dataset_exploration(self, clip_id)
 
     @cached_property
@@ -368,11 +735,65 @@ class Dataset(object):
             raise AttributeError("This dataset does not have clipgroups")
         return list(self._index["clipgroups"].keys())
 
-    def validate(self, verbose=True):
+    def audio_info_table(self, num_workers=None, cache=True):
+        """Get the sample rate, length and number of channels of every clip's audio
+
+        Audio file headers are read once in parallel and cached under ``data_home``.
+        Later calls only read the headers of files that were added or modified.
+
+        Args:
+            num_workers (int or None): number of threads reading headers.
+                If None, the concurrent.futures default is used
+            cache (bool): If False, the cache file is neither read nor written
+
+        Returns:
+            dict:
+                {column: np.ndarray} with one row per clip in ``clip_ids`` order and the
+                columns ``clip_id``, ``sample_rate``, ``frames``, ``channels`` and
+                ``duration`` (in seconds). Clips whose audio is missing have a NaN
+                duration and zeros in the other columns
+
+        """
+        paths = [
+            self._index["clips"][clip_id].get("audio", (None, None))[0]
+            for clip_id in self.clip_ids
+        ]
+        cache_path = None
+        if cache and os.path.isdir(self.data_home):
+            cache_path = os.path.join(
+                self.data_home,
+                os.path.splitext(self._index_data.filename)[0] + "_audio_info.npz",
+            )
+
+        table = io.audio_info_table(
+            self.data_home, paths, cache_path=cache_path, num_workers=num_workers
+        )
+        table["clip_id"] = np.array(self.clip_ids)
+        return table
+
+    def validate(
+        self,
+        verbose=True,
+        num_workers=1,
+        chunk_size=validate.CHUNK_SIZE,
+        full=False,
+        mode="checksum",
+        sample_fraction=0.1,
+    ):
         """Validate if the stored dataset is a valid version
 
+        Files which did not change since a previous validation are not hashed again.
+
         Args:
             verbose (bool): If False, don't print output
+            num_workers (int): number of files checked concurrently
+            chunk_size (int): size in bytes of the blocks read while hashing
+            full (bool): If True, hash every file even if it did not change
+            mode (str): "checksum" hashes every file. "exists" only checks that
+                files exist, "size" also compares their size to the one recorded by
+                a previous validation, and "sample" additionally hashes a random
+                ``sample_fraction`` of the files
+            sample_fraction (float): fraction of the files hashed in "sample" mode
 
         Returns:
             * list - files in the index but are missing locally
@@ -380,7 +801,14 @@ class Dataset(object):
 
         """
         missing_files, invalid_checksums = validate.validator(
-            self._index, self.data_home, verbose=verbose
+            self._index,
+            self.data_home,
+            verbose=verbose,
+            num_workers=num_workers,
+            chunk_size=chunk_size,
+            full=full,
+            mode=mode,
+            sample_fraction=sample_fraction,
         )
         return missing_files, invalid_checksums
 
@@ -470,6 +898,72 @@ class Clip(object):
     def to_jams(self):
         raise NotImplementedError
 
+    @property
+    def audio_info(self):
+        """The clip's audio file information, read from the file header only
+
+        Returns:
+            * io.AudioInfo - sample rate, frames, channels, subtype and duration of the audio file
+
+        """
+        return io.audio_info(getattr(self, "audio_path", None))
+
+    @property
+    def duration(self):
+        """The clip's duration in seconds, read from the audio file header only
+
+        Returns:
+            * float - duration in seconds
+
+        """
+        audio_info = self.audio_info
+        return None if audio_info is None else audio_info.duration
+
+    async def aload(self, field="audio", executor=None):
+        """Load an attribute of the clip without blocking the event loop
+
+        Args:
+            field (str): name of the attribute, e.g. "audio" or "tags"
+            executor (concurrent.futures.Executor or None): executor running the load.
+                If None, the event loop's default executor is used
+
+        Returns:
+            the value of the attribute
+
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(executor, getattr, self, field)
+
+    async def aaudio(self, executor=None):
+        """Load the clip's audio without blocking the event loop
+
+        Args:
+            executor (concurrent.futures.Executor or None): executor running the load.
+                If None, the event loop's default executor is used
+
+        Returns:
+            * np.ndarray - audio signal
+            * float - sample rate
+
+        """
+        return await self.aload("audio", executor=executor)
+
+    def audio_segment(self, start, end=None):
+        """Load the clip's audio between start and end, seeking in the file and
+        decoding only the requested frames.
+
+        Args:
+            start (float): start time of the segment, in seconds
+            end (float or None): end time of the segment, in seconds.
+                If None, the audio is loaded until the end of the clip
+
+        Returns:
+            * np.ndarray - audio signal
+            * float - sample rate
+
+        """
+        raise NotImplementedError("Partial audio loading is not supported")
+
     def get_path(self, key):
         """Get absolute path to clip audio and annotations. Returns None if
         the path in the index is None
@@ -683,7 +1177,8 @@ class Index(object):
     """Class for storing information about dataset indexes.
 
     Args:
-        filename (str): The index filename (not path), e.g. "example_dataset_index_1.2.json"
+        filename (str): The index filename (not path), e.g. "example_dataset_index_1.2.json",
+            or "example_dataset_index_1.2.sqlite" for an index converted with convert_index
         url (str or None): None if index is not remote, or a url to download from
         checksum (str or None): None if index is not remote, or the md5 checksum of the file
         partial_download (list or None): if provided, specifies a subset of Dataset.remotes
@@ -739,3 +1234,398 @@ class Index(object):
             str: absolute path to the index file
         """
         return os.path.join(self.indexes_dir, self.filename)
+
+
+class SqliteIndex(Mapping):
+    """Read-only view of a dataset index stored in SQLite (see convert_index)
+
+    Behaves like the dictionary loaded from a JSON index, but entries of the
+    ``clips`` and ``clipgroups`` sections are looked up in the file one at a
+    time, in O(log n), and never all held in memory. The file is memory
+    mapped, so processes reading the same index share its pages.
+
+    Args:
+        index_path (str): path to the SQLite index file
+
+    """
+
+    def __init__(self, index_path):
+        self.index_path = index_path
+        self._connection = None
+        self._pid = None
+        self._lock = threading.Lock()
+        self._sections = {}
+        self._info = None
+
+    def __getstate__(self):
+        # connections cannot be shared with other processes
+        return {"index_path": self.index_path}
+
+    def __setstate__(self, state):
+        self.__init__(state["index_path"])
+
+    def execute(self, query, parameters=()):
+        """Run a query on the index file, opening it in this process if needed
+
+        Args:
+            query (str): SQL query
+            parameters (tuple): query parameters
+
+        Returns:
+            list: the rows returned by the query
+
+        """
+        with self._lock:
+            if self._connection is None or self._pid != os.getpid():
+                uri = "file:{}?mode=ro".format(
+                    urllib.request.pathname2url(self.index_path)
+                )
+                self._connection = sqlite3.connect(
+                    uri, uri=True, check_same_thread=False
+                )
+                self._connection.execute(
+                    "PRAGMA mmap_size = {}".format(SQLITE_INDEX_MMAP_SIZE)
+                )
+                self._pid = os.getpid()
+            return self._connection.execute(query, parameters).fetchall()
+
+    @property
+    def info(self):
+        """The top level entries of the index which are not sections, e.g. version
+
+        Returns:
+            * dict - {key: value}
+
+        """
+        if self._info is None:
+            self._info = {
+                key: json.loads(value)
+                for key, value in self.execute("SELECT key, value FROM info")
+            }
+        return self._info
+
+    def __getitem__(self, key):
+        if key in SQLITE_INDEX_SECTIONS:
+            if key not in self._sections:
+                if not self.execute(
+                    "SELECT 1 FROM entries WHERE section = ? LIMIT 1", (key,)
+                ):
+                    raise KeyError(key)
+                self._sections[key] = SqliteIndexSection(self, key)
+            return self._sections[key]
+        return self.info[key]
+
+    @property
+    def metadata(self):
+        """The dataset metadata stored with the index by Dataset.share
+
+        Returns:
+            * SqliteIndexSection or None - {key: metadata}, or None if no metadata was stored
+
+        """
+        if not self.execute(
+            "SELECT 1 FROM entries WHERE section = ? LIMIT 1",
+            (SQLITE_METADATA_SECTION,),
+        ):
+            return None
+        return SqliteIndexSection(self, SQLITE_METADATA_SECTION)
+
+    def __iter__(self):
+        sections = [
+            section
+            for (section,) in self.execute("SELECT DISTINCT section FROM entries")
+            if section in SQLITE_INDEX_SECTIONS
+        ]
+        return iter(sections + list(self.info))
+
+    def __len__(self):
+        return len(list(iter(self)))
+
+
+class SqliteIndexSection(Mapping):
+    """Lazy mapping from ids to entries of one section (``clips``,
+    ``clipgroups`` or the dataset metadata) of a SqliteIndex, iterated in the
+    order they were written
+
+    Args:
+        index (SqliteIndex): the index the section belongs to
+        section (str): the section name
+        loads (function): decodes an entry stored in the file
+
+    """
+
+    def __init__(self, index, section, loads=json.loads):
+        self._index = index
+        self._section = section
+        self._loads = loads
+
+    def __getitem__(self, key):
+        rows = self._index.execute(
+            "SELECT value FROM entries WHERE section = ? AND id = ?",
+            (self._section, key),
+        )
+        if not rows:
+            raise KeyError(key)
+        return self._loads(rows[0][0])
+
+    def __contains__(self, key):
+        return bool(
+            self._index.execute(
+                "SELECT 1 FROM entries WHERE section = ? AND id = ?",
+                (self._section, key),
+            )
+        )
+
+    def __iter__(self):
+        return iter(
+            [
+                key
+                for (key,) in self._index.execute(
+                    "SELECT id FROM entries WHERE section = ? ORDER BY rowid",
+                    (self._section,),
+                )
+            ]
+        )
+
+    def __len__(self):
+        return self._index.execute(
+            "SELECT COUNT(*) FROM entries WHERE section = ?", (self._section,)
+        )[0][0]
+
+    def __bool__(self):
+        # cheaper than counting the entries
+        return bool(
+            self._index.execute(
+                "SELECT 1 FROM entries WHERE section = ? LIMIT 1", (self._section,)
+            )
+        )
+
+
+def load_index(index_path):
+    """Load a dataset index, either a JSON file or a SQLite file made by convert_index
+
+    Args:
+        index_path (str): path to the index file
+
+    Returns:
+        dict or SqliteIndex: the index
+
+    Raises:
+        FileNotFoundError: if the index file does not exist
+
+    """
+    if os.path.splitext(index_path)[1] == SQLITE_INDEX_EXTENSION:
+        if not os.path.exists(index_path):
+            raise FileNotFoundError(index_path)
+        return SqliteIndex(index_path)
+
+    with open(index_path, encoding="utf-8") as fhandle:
+        return json.load(fhandle)
+
+
+def _map_concurrent(executor, function, items, ordered, prefetch, *args):
+    """Yield function(item, *args) for each item, computed by an executor
+
+    At most ``prefetch`` calls are submitted and not yet consumed at a time.
+    The executor is shut down, and its queued calls cancelled, when the
+    generator finishes, is closed or raises.
+
+    Args:
+        executor (concurrent.futures.Executor): the executor running the calls
+        function (function): the function to call
+        items (iterable): the first argument of each call
+        ordered (bool): If True, results are yielded in the order of items,
+            otherwise in the order they finish
+        prefetch (int): maximum number of calls submitted ahead of the consumer
+        *args: extra arguments of each call
+
+    Yields:
+        the results of the calls
+
+    """
+    items = iter(items)
+    pending = collections.deque()
+    try:
+        while True:
+            for item in items:
+                pending.append(executor.submit(function, item, *args))
+                if len(pending) >= prefetch:
+                    break
+            if not pending:
+                return
+            if ordered:
+                yield pending.popleft().result()
+            else:
+                done, _ = futures.wait(pending, return_when=futures.FIRST_COMPLETED)
+                for job in done:
+                    pending.remove(job)
+                    yield job.result()
+    finally:
+        for job in pending:
+            job.cancel()
+        executor.shutdown(wait=True)
+
+
+def _init_worker_dataset(dataset_class, data_home, version, settings):
+    """Build the dataset used by a worker process of Dataset.iter_audio and Dataset.stream
+
+    The worker attaches to the parent's shared index if it has one, so that it
+    does not load its own copy of the index and metadata.
+
+    Args:
+        dataset_class (type): the Dataset class
+        data_home (str): path where soundata will look for the dataset
+        version (str): dataset version
+        settings (dict): attributes set on the dataset, see Dataset._worker_settings
+
+    """
+    global _worker_dataset
+    settings = dict(settings)
+    shared_index = settings.pop("shared_index", None)
+    dataset = dataset_class(data_home, version=version)
+    for attribute, value in settings.items():
+        setattr(dataset, attribute, value)
+    if shared_index is not None:
+        dataset.attach(shared_index)
+    _worker_dataset = dataset
+
+
+def _call_worker_dataset(method_name, clip_id, *args):
+    """Call a method of the dataset of a worker process built by _init_worker_dataset
+
+    Args:
+        method_name (str): name of the method, called as method(clip_id, *args)
+        clip_id (str): clip id of the clip
+        *args: extra arguments of the method
+
+    Returns:
+        the result of the method
+
+    """
+    return getattr(_worker_dataset, method_name)(clip_id, *args)
+
+
+def write_sqlite_index(index, output_path, metadata=None):
+    """Write a dataset index, and optionally its metadata, to a SQLite index file
+
+    Args:
+        index (dict or SqliteIndex): the dataset index
+        output_path (str): path to the SQLite index to write
+        metadata (dict or None): the dataset's metadata, stored as one JSON row per key
+
+    """
+    # mkstemp creates a new file only its owner can read and write, so another
+    # user cannot plant or swap the file while it is written, e.g. in /dev/shm
+    fd, tmp_path = tempfile.mkstemp(
+        suffix=".tmp",
+        prefix=os.path.basename(output_path) + ".",
+        dir=os.path.dirname(os.path.abspath(output_path)),
+    )
+    os.close(fd)
+    connection = sqlite3.connect(tmp_path)
+    try:
+        with connection:
+            connection.execute(
+                "CREATE TABLE info (key TEXT PRIMARY KEY, value TEXT NOT NULL)"
+            )
+            connection.execute(
+                "CREATE TABLE entries "
+                + "(section TEXT NOT NULL, id TEXT NOT NULL, value TEXT NOT NULL)"
+            )
+            for key, value in index.items():
+                if key in SQLITE_INDEX_SECTIONS:
+                    # rows are inserted, and iterated, in the order of the JSON index
+                    connection.executemany(
+                        "INSERT INTO entries VALUES (?, ?, ?)",
+                        (
+                            (key, entry_id, json.dumps(entry))
+                            for entry_id, entry in value.items()
+                        ),
+                    )
+                else:
+                    connection.execute(
+                        "INSERT INTO info VALUES (?, ?)", (key, json.dumps(value))
+                    )
+            if metadata:
+                connection.executemany(
+                    "INSERT INTO entries VALUES (?, ?, ?)",
+                    (
+                        (
+                            SQLITE_METADATA_SECTION,
+                            key,
+                            json.dumps(value, default=_json_default),
+                        )
+                        for key, value in metadata.items()
+                    ),
+                )
+            connection.execute("CREATE UNIQUE INDEX entry_ids ON entries (section, id)")
+        connection.execute("VACUUM")
+    except BaseException:
+        connection.close()
+        os.remove(tmp_path)
+        raise
+    connection.close()
+    os.replace(tmp_path, output_path)
+
+
+def _json_default(value):
+    """Convert the numpy values found in dataset metadata for json.dumps"""
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    raise TypeError(
+        "Object of type {} is not JSON serializable".format(type(value).__name__)
+    )
+
+
+def convert_index(json_path, output_path=None):
+    """Convert a JSON dataset index to the SQLite format read by SqliteIndex
+
+    Args:
+        json_path (str): path to the JSON index
+        output_path (str or None): path to the SQLite index to write. If None,
+            it is written next to the JSON index with a .sqlite extension
+
+    Returns:
+        str: path to the SQLite index
+
+    """
+    if output_path is None:
+        output_path = os.path.splitext(json_path)[0] + SQLITE_INDEX_EXTENSION
+
+    with open(json_path, encoding="utf-8") as fhandle:
+        index = json.load(fhandle)
+
+    write_sqlite_index(index, output_path)
+    return output_path
+
+
+def shared_index_path(name):
+    """Get the path of a shared index exported with Dataset.share
+
+    Shared indexes are kept in /dev/shm, which is backed by memory, when it exists.
+
+    Args:
+        name (str): name of the shared index
+
+    Returns:
+        str: path to the shared index file
+
+    """
+    shared_dir = SHARED_MEMORY_DIR
+    if not os.path.isdir(shared_dir):
+        shared_dir = tempfile.gettempdir()
+    return os.path.join(shared_dir, name + SQLITE_INDEX_EXTENSION)
+
+
+def remove_shared_index(index_path, pid):
+    """Remove a shared index file, only from the process which created it
+
+    Args:
+        index_path (str): path to the shared index file
+        pid (int): id of the process which created it
+
+    """
+    if os.getpid() == pid and os.path.exists(index_path):
+        os.remove(index_path)
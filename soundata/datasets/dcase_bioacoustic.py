@@ -71,7 +71,6 @@
 import os
 from typing import BinaryIO, Optional, TextIO, Tuple
 
-import librosa
 import numpy as np
 import csv
 import jams
@@ -189,6 +188,25 @@ class Clip(core.Clip):
         """
         return load_audio(self.audio_path)
 
+    def audio_segment(self, start, end=None):
+        """The clip's audio between start and end, decoding only that segment
+
+        Args:
+            start (float): start time of the segment, in seconds
+            end (float or None): end time of the segment, in seconds.
+                If None, the audio is loaded until the end of the clip
+
+        Returns:
+            * np.ndarray - audio signal
+            * float - sample rate
+
+        """
+        return load_audio(
+            self.audio_path,
+            offset=start,
+            duration=None if end is None else end - start,
+        )
+
     @property
     def split(self):
         """The data splits (e.g. train)
@@ -257,20 +275,27 @@ class Clip(core.Clip):
 
 
 @io.coerce_to_bytes_io
-def load_audio(fhandle: BinaryIO, sr=None) -> Tuple[np.ndarray, float]:
+def load_audio(
+    fhandle: BinaryIO, sr=None, offset=0.0, duration=None
+) -> Tuple[np.ndarray, float]:
     """Load a DCASE bioacoustic audio file.
 
     Args:
         fhandle (str or file-like): File-like object or path to audio file
         sr (int or None): sample rate for loaded audio, None by default, which
             uses the file's original sample rate without resampling.
+        offset (float): start reading the file at this time, in seconds
+        duration (float or None): length of the audio to load, in seconds.
+            If None, the file is read until the end
 
     Returns:
         * np.ndarray - the mono audio signal
         * float - The sample rate of the audio file
 
     """
-    audio, sr = librosa.load(fhandle, sr=sr, mono=True)
+    audio, sr = io.load_audio(
+        fhandle, sr=sr, mono=True, offset=offset, duration=duration
+    )
     return audio, sr
 
 
@@ -46,7 +46,6 @@
 import os
 from typing import BinaryIO, Optional, TextIO, Tuple
 
-import librosa
 import numpy as np
 import csv
 import jams
@@ -166,6 +165,28 @@ class Clip(core.Clip):
         """
         return load_audio(self.audio_path)
 
+    def audio_segment(self, start=0.0, end=None, channels=None):
+        """The clip's audio between start and end, decoding only that segment
+
+        Args:
+            start (float): start time of the segment, in seconds
+            end (float or None): end time of the segment, in seconds.
+                If None, the audio is loaded until the end of the clip
+            channels (list or None): indices of the channels to load in ACN order, e.g. [0]
+                for the omnidirectional W channel. If None, all 25 channels are loaded
+
+        Returns:
+            * np.ndarray - audio signal
+            * float - sample rate
+
+        """
+        return load_audio(
+            self.audio_path,
+            offset=start,
+            duration=None if end is None else end - start,
+            channels=channels,
+        )
+
     @property
     def tags(self):
         """The clip's tags
@@ -229,19 +250,33 @@ class Clip(core.Clip):
 
 
 @io.coerce_to_bytes_io
-def load_audio(fhandle: BinaryIO, sr=None) -> Tuple[np.ndarray, float]:
+def load_audio(
+    fhandle: BinaryIO, sr=None, offset=0.0, duration=None, channels=None
+) -> Tuple[np.ndarray, float]:
     """Load an EigenScape audio file
 
     Args:
         fhandle (str or file-like): file-like object or path to audio file
         sr (int or None): sample rate for loaded audio, None by default, which
             uses the file's original sampling rate of 48000 without resampling.
+        offset (float): start reading the file at this time, in seconds
+        duration (float or None): length of the audio to load, in seconds.
+            If None, the file is read until the end
+        channels (list or None): indices of the channels to load in ACN order, e.g. [0]
+            for the omnidirectional W channel. If None, all 25 channels are loaded
 
     Returns:
         * np.ndarray - the audio signal
         * float - The sample rate of the audio file
     """
-    audio, sr = librosa.load(fhandle, sr=sr, mono=False)
+    audio, sr = io.load_audio(
+        fhandle,
+        sr=sr,
+        mono=False,
+        offset=offset,
+        duration=duration,
+        channels=channels,
+    )
     return audio, sr
 
 
@@ -191,11 +191,10 @@
 import os
 from typing import BinaryIO, Optional, Tuple
 
-import librosa
 import csv
 import json
 import logging
-import subprocess
+import types
 import numpy as np
 
 from soundata import download_utils, jams_utils, core, annotations, io
@@ -223,7 +222,7 @@ INDEXES = {
     "sample": core.Index(filename="fsd50k_index_1.0_sample.json"),
 }
 # a dictionary key that has a list of RemoteFileMetadata implies a multi-part zip
-# and will be processed as such using the zip subprocess (see soundata.download_utils)
+# and will be unzipped by reading its parts in place (see soundata.download_utils)
 REMOTES = {
     "FSD50K.dev_audio": [
         download_utils.RemoteFileMetadata(
@@ -288,6 +287,11 @@ REMOTES = {
 
 LICENSE_INFO = "Creative Commons Attribution 4.0 International"
 
+# pre-joined metadata, cached in data_home if Dataset.cache_metadata is set.
+# Bump the version when the metadata format changes
+METADATA_CACHE_FILENAME = "FSD50K.metadata_cache.json"
+METADATA_CACHE_VERSION = 1
+
 
 class Clip(core.Clip):
     """FSD50K Clip class
@@ -323,6 +327,25 @@ class Clip(core.Clip):
         """
         return load_audio(self.audio_path)
 
+    def audio_segment(self, start, end=None):
+        """The clip's audio between start and end, decoding only that segment
+
+        Args:
+            start (float): start time of the segment, in seconds
+            end (float or None): end time of the segment, in seconds.
+                If None, the audio is loaded until the end of the clip
+
+        Returns:
+            * np.ndarray - audio signal
+            * float - sample rate
+
+        """
+        return load_audio(
+            self.audio_path,
+            offset=start,
+            duration=None if end is None else end - start,
+        )
+
     @property
     def tags(self):
         """The clip's tags.
@@ -414,7 +437,9 @@ class Clip(core.Clip):
 
 
 @io.coerce_to_bytes_io
-def load_audio(fhandle: BinaryIO, sr=None) -> Tuple[np.ndarray, float]:
+def load_audio(
+    fhandle: BinaryIO, sr=None, offset=0.0, duration=None
+) -> Tuple[np.ndarray, float]:
     """Load a FSD50K audio file
 
     Args:
@@ -423,12 +448,17 @@ def load_audio(fhandle: BinaryIO, sr=None) -> Tuple[np.ndarray, float]:
             If different from file's sample rate it will be resampled on load.
             Use None to load the file using its original sample rate (sample rate
             varies from file to file).
+        offset (float): start reading the file at this time, in seconds
+        duration (float or None): length of the audio to load, in seconds.
+            If None, the file is read until the end
 
     Returns:
         * np.ndarray - the mono audio signal
         * float - The sample rate of the audio file
     """
-    audio, sr = librosa.load(fhandle, sr=sr, mono=True)
+    audio, sr = io.load_audio(
+        fhandle, sr=sr, mono=True, offset=offset, duration=duration
+    )
     return audio, sr
 
 
@@ -513,9 +543,138 @@ def load_fsd50k_vocabulary(data_path):
     return fsd50k_to_audioset, audioset_to_fsd50k
 
 
+class Vocabulary(object):
+    """Immutable FSD50K vocabulary, relating labels, AudioSet mids and class indices
+
+    Classes are sorted by the integer id given in the vocabulary file, and
+    their position in that order is the index used by ``encode`` and ``decode``.
+
+    Args:
+        ids (list): integer id of each class
+        labels (list): FSD50K label of each class
+        mids (list): AudioSet mid of each class
+
+    Attributes:
+        ids (np.ndarray): integer id of each class
+        labels (np.ndarray): FSD50K label of each class
+        mids (np.ndarray): AudioSet mid of each class
+        label_to_index (mappingproxy): {label: class index}
+        mid_to_index (mappingproxy): {mid: class index}
+        label_to_mid (mappingproxy): {label: mid}
+        mid_to_label (mappingproxy): {mid: label}
+
+    """
+
+    def __init__(self, ids, labels, mids):
+        order = np.argsort(np.asarray(ids, dtype=int), kind="stable")
+        self.ids = np.asarray(ids, dtype=int)[order]
+        self.labels = np.asarray(labels, dtype=str)[order]
+        self.mids = np.asarray(mids, dtype=str)[order]
+        for array in (self.ids, self.labels, self.mids):
+            array.flags.writeable = False
+
+        self.label_to_index = types.MappingProxyType(
+            {label: i for i, label in enumerate(self.labels.tolist())}
+        )
+        self.mid_to_index = types.MappingProxyType(
+            {mid: i for i, mid in enumerate(self.mids.tolist())}
+        )
+        self.label_to_mid = types.MappingProxyType(
+            dict(zip(self.labels.tolist(), self.mids.tolist()))
+        )
+        self.mid_to_label = types.MappingProxyType(
+            dict(zip(self.mids.tolist(), self.labels.tolist()))
+        )
+
+    def __len__(self):
+        return len(self.ids)
+
+    def index(self, labels):
+        """Get the class indices of some labels
+
+        Args:
+            labels (list): FSD50K labels or AudioSet mids
+
+        Returns:
+            * np.ndarray - class index of each label
+
+        Raises:
+            KeyError: if a label is not in the vocabulary
+
+        """
+        return np.array(
+            [
+                (
+                    self.mid_to_index[label]
+                    if label in self.mid_to_index
+                    else self.label_to_index[label]
+                )
+                for label in labels
+            ],
+            dtype=int,
+        )
+
+    def encode(self, labels):
+        """Multi-hot encode some labels
+
+        Args:
+            labels (list): FSD50K labels or AudioSet mids
+
+        Returns:
+            * np.ndarray - float32 array of length len(vocabulary), 1 for the given labels
+
+        """
+        multi_hot = np.zeros(len(self), dtype=np.float32)
+        multi_hot[self.index(labels)] = 1.0
+        return multi_hot
+
+    def decode(self, multi_hot, threshold=0.5):
+        """Get the labels of a multi-hot encoding, or of class scores
+
+        Args:
+            multi_hot (np.ndarray): array of length len(vocabulary)
+            threshold (float): classes with a value of at least threshold are returned
+
+        Returns:
+            * list - FSD50K labels
+
+        """
+        return self.labels[np.asarray(multi_hot) >= threshold].tolist()
+
+
+def load_vocabulary(data_path):
+    """Load a FSD50K vocabulary file as an immutable Vocabulary
+
+    Args:
+        data_path (str): Path to the vocabulary file
+
+    Returns:
+        * Vocabulary: the FSD50K vocabulary
+    """
+    ids, labels, mids = [], [], []
+    with open(data_path, "r") as fhandle:
+        reader = csv.reader(fhandle, delimiter=",")
+        for line in reader:
+            ids.append(int(line[0]))
+            labels.append(line[1])
+            mids.append(line[2])
+
+    return Vocabulary(ids, labels, mids)
+
+
 @core.docstring_inherit(core.Dataset)
 class Dataset(core.Dataset):
-    """The FSD50K dataset"""
+    """The FSD50K dataset
+
+    Attributes:
+        cache_metadata (bool): If True, the joined metadata of all clips is cached
+            as JSON in data_home, and later instances read it from there until one
+            of the metadata files changes. False by default, so that nothing is
+            written to data_home unless asked for
+
+    """
+
+    cache_metadata = False
 
     def __init__(self, data_home=None, version="default"):
         super().__init__(
@@ -589,81 +748,133 @@ class Dataset(core.Dataset):
     def load_fsd50k_vocabulary(self, *args, **kwargs):
         return load_fsd50k_vocabulary(*args, **kwargs)
 
-    @property
+    @core.copy_docs(load_vocabulary)
+    def load_vocabulary(self, *args, **kwargs):
+        return load_vocabulary(*args, **kwargs)
+
+    @core.cached_property
+    def vocabulary(self):
+        """The FSD50K vocabulary, loaded once
+
+        Returns:
+            * Vocabulary - labels, mids and class indices of the 200 FSD50K classes
+
+        """
+        return load_vocabulary(self.vocabulary_path)
+
+    @core.cached_property
+    def collection_vocabulary(self):
+        """The vocabularies of the dev and eval sound collection labels, loaded once
+
+        Returns:
+            * dict - {"dev": Vocabulary, "eval": Vocabulary}
+
+        """
+        return {
+            "dev": load_vocabulary(self.collection_vocabulary_dev_path),
+            "eval": load_vocabulary(self.collection_vocabulary_eval_path),
+        }
+
+    @core.cached_property
     def fsd50k_to_audioset(self):
-        return load_fsd50k_vocabulary(self.vocabulary_path)[0]
+        return dict(self.vocabulary.label_to_mid)
 
-    @property
+    @core.cached_property
     def audioset_to_fsd50k(self):
-        return load_fsd50k_vocabulary(self.vocabulary_path)[1]
+        return dict(self.vocabulary.mid_to_label)
 
-    @property
+    @core.cached_property
     def label_info(self):
-        return (
-            json.load(open(self.label_info_path, "r"))
-            if os.path.exists(self.label_info_path)
-            else None
-        )
+        if not os.path.exists(self.label_info_path):
+            return None
+        with open(self.label_info_path, "r") as fhandle:
+            return json.load(fhandle)
 
-    @property
+    @core.cached_property
     def collection_fsd50k_to_audioset(self):
         collection_fsd50k_to_audioset = {
-            "dev": load_fsd50k_vocabulary(self.collection_vocabulary_dev_path)[0],
-            "eval": load_fsd50k_vocabulary(self.collection_vocabulary_eval_path)[0],
+            split: dict(vocabulary.label_to_mid)
+            for split, vocabulary in self.collection_vocabulary.items()
         }
         return collection_fsd50k_to_audioset
 
-    @property
+    @core.cached_property
     def collection_audioset_to_fsd50k(self):
         collection_audioset_to_fsd50k = {
-            "dev": load_fsd50k_vocabulary(self.collection_vocabulary_dev_path)[1],
-            "eval": load_fsd50k_vocabulary(self.collection_vocabulary_eval_path)[1],
+            split: dict(vocabulary.mid_to_label)
+            for split, vocabulary in self.collection_vocabulary.items()
         }
         return collection_audioset_to_fsd50k
 
+    def _worker_settings(self):
+        settings = super()._worker_settings()
+        settings["cache_metadata"] = self.cache_metadata
+        return settings
+
     @core.cached_property
     def _metadata(self):
-        metadata_index = {}
-
-        ground_truth_dev, clip_ids_dev = load_ground_truth(self.ground_truth_dev_path)
-        ground_truth_eval, clip_ids_eval = load_ground_truth(
-            self.ground_truth_eval_path
+        return io.load_cached(
+            (
+                os.path.join(self.data_home, METADATA_CACHE_FILENAME)
+                if self.cache_metadata
+                else None
+            ),
+            [
+                self.ground_truth_dev_path,
+                self.ground_truth_eval_path,
+                self.collection_dev_path,
+                self.collection_eval_path,
+                self.clips_info_dev_path,
+                self.clips_info_eval_path,
+                self.pp_pnp_ratings_path,
+            ],
+            self._join_metadata,
+            key=(self.version, METADATA_CACHE_VERSION),
         )
 
+    def _join_metadata(self):
+        """Join the ground truth, collection labels, clip info and PP/PNP ratings
+        of every clip, looking clips up by id in the dictionaries loaded from each file
+
+        Returns:
+            * dict - {clip_id: metadata}
+
+        """
+        ground_truth_dev, _ = load_ground_truth(self.ground_truth_dev_path)
+        ground_truth_eval, _ = load_ground_truth(self.ground_truth_eval_path)
+
         collection_dev, _ = load_ground_truth(self.collection_dev_path)
         collection_eval, _ = load_ground_truth(self.collection_eval_path)
 
-        clips_info_dev = (
-            json.load(open(self.clips_info_dev_path, "r"))
-            if os.path.exists(self.clips_info_dev_path)
-            else None
-        )
-        clips_info_eval = (
-            json.load(open(self.clips_info_eval_path, "r"))
-            if os.path.exists(self.clips_info_eval_path)
-            else None
-        )
+        clips_info_dev = None
+        if os.path.exists(self.clips_info_dev_path):
+            with open(self.clips_info_dev_path, "r") as fhandle:
+                clips_info_dev = json.load(fhandle)
+        clips_info_eval = None
+        if os.path.exists(self.clips_info_eval_path):
+            with open(self.clips_info_eval_path, "r") as fhandle:
+                clips_info_eval = json.load(fhandle)
 
-        pp_pnp_ratings = (
-            json.load(open(self.pp_pnp_ratings_path, "r"))
-            if os.path.exists(self.pp_pnp_ratings_path)
-            else None
-        )
+        pp_pnp_ratings = None
+        if os.path.exists(self.pp_pnp_ratings_path):
+            with open(self.pp_pnp_ratings_path, "r") as fhandle:
+                pp_pnp_ratings = json.load(fhandle)
 
+        metadata_index = {}
         for clip_id in self.clip_ids:
-            if clip_id in clip_ids_dev:
-                metadata_index[clip_id] = {
-                    "ground_truth": ground_truth_dev[clip_id],
-                    "clip_info": clips_info_dev[clip_id],
-                    "pp_pnp_ratings": pp_pnp_ratings[clip_id],
-                    "collection_labels": collection_dev[clip_id],
-                }
-            if clip_id in clip_ids_eval:
+            if clip_id in ground_truth_eval:
                 metadata_index[clip_id] = {
                     "ground_truth": ground_truth_eval[clip_id],
                     "clip_info": clips_info_eval[clip_id],
                     "pp_pnp_ratings": pp_pnp_ratings[clip_id],
                     "collection_labels": collection_eval[clip_id],
                 }
+            elif clip_id in ground_truth_dev:
+                metadata_index[clip_id] = {
+                    "ground_truth": ground_truth_dev[clip_id],
+                    "clip_info": clips_info_dev[clip_id],
+                    "pp_pnp_ratings": pp_pnp_ratings[clip_id],
+                    "collection_labels": collection_dev[clip_id],
+                }
 
         return metadata_index
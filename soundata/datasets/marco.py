@@ -50,11 +50,9 @@
 import os
 from typing import BinaryIO, Optional, TextIO, Tuple
 
-import librosa
 import numpy as np
 import csv
 import jams
-import json
 import glob
 import numbers
 from itertools import cycle
@@ -171,6 +169,25 @@ class Clip(core.Clip):
         """
         return load_audio(self.audio_path)
 
+    def audio_segment(self, start, end=None):
+        """The clip's audio between start and end, decoding only that segment
+
+        Args:
+            start (float): start time of the segment, in seconds
+            end (float or None): end time of the segment, in seconds.
+                If None, the audio is loaded until the end of the clip
+
+        Returns:
+            * np.ndarray - audio signal
+            * float - sample rate
+
+        """
+        return load_audio(
+            self.audio_path,
+            offset=start,
+            duration=None if end is None else end - start,
+        )
+
     def to_jams(self):
         """Get the clip's data in jams format
 
@@ -184,18 +201,25 @@ class Clip(core.Clip):
 
 
 @io.coerce_to_bytes_io
-def load_audio(fhandle: BinaryIO, sr=48000) -> Tuple[np.ndarray, float]:
+def load_audio(
+    fhandle: BinaryIO, sr=48000, offset=0.0, duration=None
+) -> Tuple[np.ndarray, float]:
     """Load a 3D-MARCo audio file
 
     Args:
         fhandle (str or file-like): file-like object or path to audio file
         sr (int or None): sample rate for loaded audio, 48000 by default, which re-samples all files except the EigenMike ones, resulting in constant sampling rate between all clips in the dataset.
+        offset (float): start reading the file at this time, in seconds
+        duration (float or None): length of the audio to load, in seconds.
+            If None, the file is read until the end
 
     Returns:
         * np.ndarray - the audio signal
         * float - The sample rate of the audio file
     """
-    audio, sr = librosa.load(fhandle, sr=sr, mono=False)
+    audio, sr = io.load_audio(
+        fhandle, sr=sr, mono=False, offset=offset, duration=duration
+    )
     return audio, sr
 
 
@@ -224,9 +248,7 @@ class Dataset(core.Dataset):
         # parsing the data from the filenames due to lack of metadata file
         metadata_index = {}
 
-        with open(self.index_path) as f:
-            marco_index = json.load(f)
-            all_paths_filenames = list(marco_index["clips"].keys())
+        all_paths_filenames = list(self._index["clips"].keys())
 
         for path_filename in all_paths_filenames:
             clip_id = path_filename
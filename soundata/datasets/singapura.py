@@ -112,7 +112,6 @@ SINGA:PURA Dataset Loader
 import os
 from typing import Dict, List, Optional, TextIO, Union
 
-import librosa
 import numpy as np
 import pandas as pd
 from soundata import annotations, core, download_utils, io, jams_utils
@@ -247,6 +246,26 @@ class Clip(core.Clip):
         """
         return load_audio(self.audio_path)
 
+    def audio_segment(self, start, end=None):
+        """The clip's audio between start and end, decoding only that segment
+
+        Args:
+            start (float): start time of the segment, in seconds
+            end (float or None): end time of the segment, in seconds.
+                If None, the audio is loaded until the end of the clip
+
+        Returns:
+            * np.ndarray - audio signal
+            * float - sample rate
+
+        """
+        audio = load_audio(
+            self.audio_path,
+            offset=start,
+            duration=None if end is None else end - start,
+        )
+        return audio, 44100
+
     @property
     def sensor_id(self) -> str:
         """
@@ -336,17 +355,22 @@ def load_annotation(fhandle: TextIO) -> annotations.MultiAnnotator:
 
 
 @io.coerce_to_bytes_io
-def load_audio(fhandle):
+def load_audio(fhandle, offset=0.0, duration=None):
     """
     Load a Example audio file.
 
     Args:
         fhandle (str or file-like): path or file-like object pointing to an audio file
+        offset (float): start reading the file at this time, in seconds
+        duration (float or None): length of the audio to load, in seconds.
+            If None, the file is read until the end
 
     Returns:
         * np.ndarray - the audio signal at 44.1 kHz
     """
-    data, _ = librosa.load(fhandle, sr=44100, mono=False)
+    data, _ = io.load_audio(
+        fhandle, sr=44100, mono=False, offset=offset, duration=duration
+    )
     return data
 
 
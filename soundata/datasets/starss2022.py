@@ -87,11 +87,9 @@
 import os
 from typing import BinaryIO, Optional, TextIO, Tuple
 
-import librosa
 import numpy as np
 import csv
 import jams
-import json
 import glob
 import numbers
 from itertools import cycle
@@ -194,6 +192,29 @@ class Clip(core.Clip):
         """
         return load_audio(self.audio_path)
 
+    def audio_segment(self, start=0.0, end=None, channels=None):
+        """The clip's audio between start and end, decoding only that segment
+
+        Args:
+            start (float): start time of the segment, in seconds
+            end (float or None): end time of the segment, in seconds.
+                If None, the audio is loaded until the end of the clip
+            channels (list or None): indices of the channels to load, e.g. [0] for the
+                omnidirectional W channel of the FOA format. If None, all 4 channels
+                are loaded
+
+        Returns:
+            * np.ndarray - audio signal
+            * float - sample rate
+
+        """
+        return load_audio(
+            self.audio_path,
+            offset=start,
+            duration=None if end is None else end - start,
+            channels=channels,
+        )
+
     @core.cached_property
     def spatial_events(self) -> Optional[annotations.SpatialEvents]:
         """The clip's event annotations
@@ -231,7 +252,9 @@ class Clip(core.Clip):
 
 
 @io.coerce_to_bytes_io
-def load_audio(fhandle: BinaryIO, sr=24000) -> Tuple[np.ndarray, float]:
+def load_audio(
+    fhandle: BinaryIO, sr=24000, offset=0.0, duration=None, channels=None
+) -> Tuple[np.ndarray, float]:
     """Load a STARSS 2022 audio file
 
     Args:
@@ -239,11 +262,24 @@ def load_audio(fhandle: BinaryIO, sr=24000) -> Tuple[np.ndarray, float]:
         sr (int or None): sample rate for loaded audio, 24000 Hz by default.
         If different from file's sample rate it will be resampled on load.
         Use None to load the file using its original sample rate (24000)
+        offset (float): start reading the file at this time, in seconds
+        duration (float or None): length of the audio to load, in seconds.
+            If None, the file is read until the end
+        channels (list or None): indices of the channels to load, e.g. [0] for the
+            omnidirectional W channel of the FOA format. If None, all 4 channels
+            are loaded
     Returns:
         * np.ndarray - the audio signal
         * float - The sample rate of the audio file
     """
-    audio, sr = librosa.load(fhandle, sr=sr, mono=False)
+    audio, sr = io.load_audio(
+        fhandle,
+        sr=sr,
+        mono=False,
+        offset=offset,
+        duration=duration,
+        channels=channels,
+    )
     return audio, sr
 
 
@@ -263,117 +299,78 @@ def load_spatialevents(fhandle: TextIO, dt=0.1) -> annotations.SpatialEvents:
 
     def _process_raw_events(raw_reader, dt):
         # unpack columns in csv
-        time_frames, labels, event_num, azimuths, elevations = list(
-            map(list, zip(*raw_reader))
-        )
-
-        # find unique label+event_num pairs
-        # processing as dictionary to preserve order
-        unique_events_set = list({l_e: None for l_e in zip(labels, event_num)})
-
-        # find all the indices of each unique label+event_num pair
-        unique_events_indices = [
-            (np.array(list(zip(labels, event_num))) == event).all(axis=1).nonzero()[0]
-            for event in unique_events_set
-        ]
+        raw_events = np.array(raw_reader, dtype=int).reshape(-1, 5)
+        time_frames, _, _, azimuths, elevations = raw_events.T
 
-        # get sets of continuous indices for each unique label+event_num pair
-        unique_events_indices_grouped = [
-            np.split(
-                event_indices,
-                np.where(np.diff(np.array(time_frames)[event_indices]) != 1)[0] + 1,
+        # number the unique label+event_num pairs in order of first appearance
+        unique_events, first_rows, event_ids = np.unique(
+            raw_events[:, 1:3], axis=0, return_index=True, return_inverse=True
+        )
+        appearance_order = np.argsort(first_rows)
+        event_ranks = np.empty_like(appearance_order)
+        event_ranks[appearance_order] = np.arange(len(appearance_order))
+        event_ids = event_ranks[event_ids.reshape(-1)]
+        unique_events = unique_events[appearance_order]
+
+        # group the rows of each label+event_num pair, keeping their order in the file
+        rows = np.argsort(event_ids, kind="stable")
+        event_ids = event_ids[rows]
+        time_frames = time_frames[rows]
+        azimuths = azimuths[rows]
+        elevations = elevations[rows]
+
+        # run-length segmentation: an event instance starts with each pair, and
+        # wherever the frames of a pair are not continuous
+        starts = np.flatnonzero(
+            np.concatenate(
+                [[True], (np.diff(event_ids) != 0) | (np.diff(time_frames) != 1)]
             )
-            for event_indices in unique_events_indices
-        ]
-
-        # get start_time end_time pairs for all events
-        intervals = [
-            [
-                np.round(
-                    np.array(
-                        [
-                            np.array(time_frames)[indices_grouped[0]],
-                            np.array(time_frames)[indices_grouped[-1]],
-                        ]
-                    )
-                    * dt,
-                    decimals=1,
-                )
-                for indices_grouped in unique_event_indices_grouped
-            ]
-            for unique_event_indices_grouped in unique_events_indices_grouped
-        ]
-
-        # get azimuth arrays for all event instances
-        azimuths = [
-            [
-                np.array(azimuths)[indices_grouped]
-                for indices_grouped in unique_event_indices_grouped
-            ]
-            for unique_event_indices_grouped in unique_events_indices_grouped
-        ]
+        )
+        ends = np.append(starts[1:], len(rows))
 
-        # get elevations arrays for all event instances
-        elevations = [
-            [
-                np.array(elevations)[indices_grouped]
-                for indices_grouped in unique_event_indices_grouped
-            ]
-            for unique_event_indices_grouped in unique_events_indices_grouped
-        ]
+        # get start_time end_time pairs for all event instances
+        instance_intervals = np.round(
+            np.stack([time_frames[starts], time_frames[ends - 1]], axis=1) * dt,
+            decimals=1,
+        )
 
-        # keep only one value if the event is static
-        azimuths_elevations = [
-            [
-                (
-                    np.array([azimuth[0], elevation[0]])
-                    if (azimuth == azimuth[0]).all()
-                    and (elevation == elevation[0]).all()
-                    else np.concatenate(
-                        [azimuth[:, np.newaxis], elevation[:, np.newaxis]], axis=1
-                    )
-                )
-                for azimuth, elevation in zip(event_azimuths, event_elevations)
-            ]
-            for event_azimuths, event_elevations in zip(azimuths, elevations)
-        ]
+        # keep only one value if the event instance is static
+        static = (
+            np.maximum.reduceat(azimuths, starts)
+            == np.minimum.reduceat(azimuths, starts)
+        ) & (
+            np.maximum.reduceat(elevations, starts)
+            == np.minimum.reduceat(elevations, starts)
+        )
+        ends = np.where(static, starts + 1, ends)
 
-        # separate azimuths and elevations again
-        azimuths = [
-            [
-                (
-                    azimuth_elevation[:, 0]
-                    if len(azimuth_elevation.shape) == 2
-                    else np.array([azimuth_elevation[0]])
-                )
-                for azimuth_elevation in event_azimuths_elevations
-            ]
-            for event_azimuths_elevations in azimuths_elevations
-        ]
-        elevations = [
-            [
-                (
-                    azimuth_elevation[:, 1]
-                    if len(azimuth_elevation.shape) == 2
-                    else np.array([azimuth_elevation[1]])
-                )
-                for azimuth_elevation in event_azimuths_elevations
-            ]
-            for event_azimuths_elevations in azimuths_elevations
-        ]
+        intervals = [[] for _ in unique_events]
+        instance_azimuths = [[] for _ in unique_events]
+        instance_elevations = [[] for _ in unique_events]
+        for instance, (start, end) in enumerate(zip(starts, ends)):
+            event_id = event_ids[start]
+            intervals[event_id].append(instance_intervals[instance])
+            instance_azimuths[event_id].append(azimuths[start:end])
+            instance_elevations[event_id].append(elevations[start:end])
 
         # list of labels and clip_number_indices in str
-        labels, clip_number_indices = list(zip(*unique_events_set))
-        labels = [str(l) for l in labels]
-        clip_number_indices = [str(l) for l in clip_number_indices]
+        labels = [str(l) for l in unique_events[:, 0]]
+        clip_number_indices = [str(l) for l in unique_events[:, 1]]
 
         # create dummy distances with None
         distances = [
             [np.array([None] * len(azimuth)) for azimuth in event_azimuths]
-            for event_azimuths in azimuths
+            for event_azimuths in instance_azimuths
         ]
 
-        return intervals, labels, clip_number_indices, azimuths, elevations, distances
+        return (
+            intervals,
+            labels,
+            clip_number_indices,
+            instance_azimuths,
+            instance_elevations,
+            distances,
+        )
 
     raw_reader = csv.reader(fhandle, delimiter=",")
     raw_events = []
@@ -433,9 +430,7 @@ class Dataset(core.Dataset):
         # parsing the data from the filenames due to lack of metadata file
         metadata_index = {}
 
-        with open(self.index_path) as f:
-            starss2022_index = json.load(f)
-            all_paths_filenames = list(starss2022_index["clips"].keys())
+        all_paths_filenames = list(self._index["clips"].keys())
 
         for path_filename in all_paths_filenames:
             clip_id = path_filename
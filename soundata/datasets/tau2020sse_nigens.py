@@ -58,11 +58,9 @@
 import os
 from typing import BinaryIO, Optional, TextIO, Tuple
 
-import librosa
 import numpy as np
 import csv
 import jams
-import json
 import glob
 import numbers
 from itertools import cycle
@@ -185,6 +183,29 @@ class Clip(core.Clip):
         """
         return load_audio(self.audio_path)
 
+    def audio_segment(self, start=0.0, end=None, channels=None):
+        """The clip's audio between start and end, decoding only that segment
+
+        Args:
+            start (float): start time of the segment, in seconds
+            end (float or None): end time of the segment, in seconds.
+                If None, the audio is loaded until the end of the clip
+            channels (list or None): indices of the channels to load, e.g. [0] for the
+                omnidirectional W channel of the FOA format. If None, all 4 channels
+                are loaded
+
+        Returns:
+            * np.ndarray - audio signal
+            * float - sample rate
+
+        """
+        return load_audio(
+            self.audio_path,
+            offset=start,
+            duration=None if end is None else end - start,
+            channels=channels,
+        )
+
     @core.cached_property
     def spatial_events(self) -> Optional[annotations.SpatialEvents]:
         """The clip's event annotations
@@ -222,7 +243,9 @@ class Clip(core.Clip):
 
 
 @io.coerce_to_bytes_io
-def load_audio(fhandle: BinaryIO, sr=24000) -> Tuple[np.ndarray, float]:
+def load_audio(
+    fhandle: BinaryIO, sr=24000, offset=0.0, duration=None, channels=None
+) -> Tuple[np.ndarray, float]:
     """Load a TAU NIGENS SSE 2020 audio file
 
     Args:
@@ -230,11 +253,24 @@ def load_audio(fhandle: BinaryIO, sr=24000) -> Tuple[np.ndarray, float]:
         sr (int or None): sample rate for loaded audio, 24000 Hz by default.
         If different from file's sample rate it will be resampled on load.
         Use None to load the file using its original sample rate (24000)
+        offset (float): start reading the file at this time, in seconds
+        duration (float or None): length of the audio to load, in seconds.
+            If None, the file is read until the end
+        channels (list or None): indices of the channels to load, e.g. [0] for the
+            omnidirectional W channel of the FOA format. If None, all 4 channels
+            are loaded
     Returns:
         * np.ndarray - the audio signal
         * float - The sample rate of the audio file
     """
-    audio, sr = librosa.load(fhandle, sr=sr, mono=False)
+    audio, sr = io.load_audio(
+        fhandle,
+        sr=sr,
+        mono=False,
+        offset=offset,
+        duration=duration,
+        channels=channels,
+    )
     return audio, sr
 
 
@@ -423,9 +459,7 @@ class Dataset(core.Dataset):
         # parsing the data from the filenames due to lack of metadata file
         metadata_index = {}
 
-        with open(self.index_path) as f:
-            taunigenssse2020_index = json.load(f)
-            all_paths_filenames = list(taunigenssse2020_index["clips"].keys())
+        all_paths_filenames = list(self._index["clips"].keys())
 
         for path_filename in all_paths_filenames:
             clip_id = path_filename
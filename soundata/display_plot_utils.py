@@ -1,37 +1,89 @@
-# Audio Processing and Playback
-from pydub import AudioSegment  # For manipulating audio files
-from pydub.playback import play  # For playing audio files
-import simpleaudio as sa  # Alternative library for audio playback
+"""Interactive plotting and playback utilities for soundata datasets
+
+The plotting stack (matplotlib, seaborn, ipywidgets, IPython, pydub,
+simpleaudio and pandas) is only imported the first time one of its
+attributes is used, so importing soundata does not require the ``plots``
+extra to be installed.
+"""
+
+import importlib
+import types
+
 import librosa  # For advanced audio analysis
 
 # Multithreading and Time Management
 import threading  # For running processes in parallel
 import time  # For handling time-related functions
 
-# Data Handling and Visualization
-import pandas as pd  # For handling and analyzing data structures
 import numpy as np  # For numerical operations
-import seaborn as sns  # For statistical data visualization
-import matplotlib.pyplot as plt  # For creating static, animated, and interactive visualizations
-
-# User Interface and Widgets
-import ipywidgets as widgets  # For creating interactive UI components
-from ipywidgets import (
-    FloatSlider,
-    Button,
-    VBox,
-    HBox,
-    Checkbox,
-    Label,
-    Output,
-)  # Specific UI widgets
-from IPython.display import display  # For displaying widgets in IPython environments
 
 # Miscellaneous
 from functools import lru_cache  # For caching function call results
 from tqdm import tqdm  # For displaying progress bars
 
 
+class _LazyModule(types.ModuleType):
+    """Module placeholder which imports the real module on first attribute access
+
+    Attribute assignments and deletions are forwarded to the real module as
+    well, so patching e.g. ``display_plot_utils.sa.play_buffer`` patches
+    ``simpleaudio.play_buffer``.
+
+    Args:
+        name (str): full name of the module to import, e.g. "matplotlib.pyplot"
+
+    """
+
+    def __init__(self, name):
+        super().__init__(name)
+        self._soundata_module = None
+
+    def _load(self):
+        if self._soundata_module is None:
+            try:
+                self._soundata_module = importlib.import_module(self.__name__)
+            except ImportError as exc:
+                raise ImportError(
+                    "{} is required to explore and plot datasets. ".format(
+                        self.__name__
+                    )
+                    + "Install the optional dependencies with `pip install soundata[plots]`"
+                ) from exc
+        return self._soundata_module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __setattr__(self, attr, value):
+        if attr == "_soundata_module" or attr.startswith("__"):
+            super().__setattr__(attr, value)
+        else:
+            setattr(self._load(), attr, value)
+
+    def __delattr__(self, attr):
+        if attr == "_soundata_module" or attr.startswith("__"):
+            super().__delattr__(attr)
+        else:
+            delattr(self._load(), attr)
+
+    def __dir__(self):
+        return dir(self._load())
+
+
+# Audio Processing and Playback
+pydub = _LazyModule("pydub")  # For manipulating audio files
+sa = _LazyModule("simpleaudio")  # Alternative library for audio playback
+
+# Data Handling and Visualization
+pd = _LazyModule("pandas")  # For handling and analyzing data structures
+sns = _LazyModule("seaborn")  # For statistical data visualization
+plt = _LazyModule("matplotlib.pyplot")  # For creating static and interactive plots
+
+# User Interface and Widgets
+widgets = _LazyModule("ipywidgets")  # For creating interactive UI components
+ipython_display = _LazyModule("IPython.display")  # For displaying widgets
+
+
 def on_button_clicked(
     event_dist_check,
     dataset_analysis_check,
@@ -63,7 +115,7 @@ def on_button_clicked(
     """
     output.clear_output(wait=True)  # Clear the previous outputs
     with output:
-        display(loader)  # Display the loader
+        ipython_display.display(loader)  # Display the loader
         # Update the page with a loading message
         loader.value = "<p style='font-size:15px;'>Rendering plots...please wait!</p>"
 
@@ -100,15 +152,15 @@ def perform_dataset_exploration(self, clip_id=None):
     Displays interactive checkboxes for user input, a button to trigger exploration, and the exploration results.
     """
     # Interactive checkboxes for user input
-    event_dist_check = Checkbox(value=True, description="Class Distribution")
-    dataset_analysis_check = Checkbox(
+    event_dist_check = widgets.Checkbox(value=True, description="Class Distribution")
+    dataset_analysis_check = widgets.Checkbox(
         value=False, description="Statistics (Computational)"
     )
-    audio_plot_check = Checkbox(value=True, description="Audio Visualization")
+    audio_plot_check = widgets.Checkbox(value=True, description="Audio Visualization")
 
     # Button to execute plotting based on selected checkboxes
-    plot_button = Button(description="Explore Dataset")
-    output = Output()
+    plot_button = widgets.Button(description="Explore Dataset")
+    output = widgets.Output()
 
     # Loader HTML widget
     loader = widgets.HTML(
@@ -133,11 +185,13 @@ def perform_dataset_exploration(self, clip_id=None):
     intro_text = "Welcome to the Dataset Explorer!\nSelect the options below to explore your dataset:"
 
     # Display checkboxes, button, and output widget for user interaction
-    display(
-        VBox(
+    ipython_display.display(
+        widgets.VBox(
             [
                 widgets.HTML(value=intro_text),
-                HBox([event_dist_check, dataset_analysis_check, audio_plot_check]),
+                widgets.HBox(
+                    [event_dist_check, dataset_analysis_check, audio_plot_check]
+                ),
                 plot_button,
                 output,
             ]
@@ -159,13 +213,12 @@ def compute_clip_statistics(self):
     Calculates statistics such as total duration, mean duration, median duration, standard deviation,
     minimum duration, maximum duration, and total clip count.
     """
-    durations = [
-        len(self.clip(c_id).audio[0]) / self.clip(c_id).audio[1]
-        for c_id in tqdm(
-            list(self._index["clips"].keys()), desc="Calculating durations"
-        )
-        if hasattr(self.clip(c_id), "audio")  # Adding the check here
-    ]
+    # durations are read from the audio file headers, without decoding the audio
+    durations = []
+    for c_id in tqdm(list(self._index["clips"].keys()), desc="Calculating durations"):
+        audio_info = self.clip(c_id).audio_info
+        if audio_info is not None:
+            durations.append(audio_info.duration)
 
     # Calculate statistics
     total_duration = sum(durations)
@@ -635,7 +688,7 @@ def visualize_audio(self, clip_id):
     # Convert to int16 for playback
     audio_playback = np.int16(audio * 32767)
 
-    audio_segment = AudioSegment(
+    audio_segment = pydub.AudioSegment(
         audio_playback.tobytes(), frame_rate=sr, sample_width=2, channels=1
     )
 
@@ -692,7 +745,7 @@ def visualize_audio(self, clip_id):
     play_thread = [None]
 
     # Create UI elements
-    slider = FloatSlider(
+    slider = widgets.FloatSlider(
         value=0.0,
         min=0.0,
         max=duration,
@@ -700,8 +753,8 @@ def visualize_audio(self, clip_id):
         description="Seek:",
         tooltip="Drag the slider to a specific point in the audio to play from that time.",
     )
-    play_pause_button = Button(description="► Play")
-    reset_button = Button(description="Reset")
+    play_pause_button = widgets.Button(description="► Play")
+    reset_button = widgets.Button(description="Reset")
 
     # Setting up event handlers
     play_pause_button.on_click(
@@ -747,5 +800,9 @@ def visualize_audio(self, clip_id):
     )
 
     # Display the UI elements
-    slider_label = Label("Drag the slider to navigate through the audio:")
-    display(VBox([HBox([play_pause_button, reset_button]), slider_label, slider]))
+    slider_label = widgets.Label("Drag the slider to navigate through the audio:")
+    ipython_display.display(
+        widgets.VBox(
+            [widgets.HBox([play_pause_button, reset_button]), slider_label, slider]
+        )
+    )
@@ -1,21 +1,52 @@
 """utilities for downloading from the web.
 """
 
+import bisect
 import glob
+import hashlib
+import http.client
+import io
 import logging
 import os
 import shutil
+import socket
+import struct
 import tarfile
-import urllib
+import time
+import urllib.error
+import urllib.request
 import zipfile
-import subprocess
+import threading
+from concurrent import futures
+
 import py7zr
 from tqdm import tqdm
 
-from soundata.validate import md5
+from soundata import validate
 
 logging.basicConfig(format="%(levelname)s: %(message)s", level=logging.INFO)
 
+# number of attempts made to download a file, and the delay in seconds before
+# the first retry, doubled after each failed attempt
+DOWNLOAD_RETRIES = 5
+RETRY_BACKOFF = 1.0
+
+# HTTP errors below 500 which are transient, and retried like server errors:
+# request timeout and too many requests
+RETRY_HTTP_CODES = (408, 429)
+
+# seconds without receiving data after which a download attempt is abandoned
+DOWNLOAD_TIMEOUT = 60
+
+# size in bytes of the blocks written to disk while downloading
+DOWNLOAD_CHUNK_SIZE = 1 << 20
+
+# size in bytes of the blocks written to disk while extracting archive members
+EXTRACT_CHUNK_SIZE = 1 << 20
+
+# serializes updates of the validation manifest by concurrent downloads
+MANIFEST_LOCK = threading.Lock()
+
 
 class RemoteFileMetadata(object):
     """The metadata for a remote file
@@ -48,6 +79,8 @@ def downloader(
     info_message=None,
     force_overwrite=False,
     cleanup=False,
+    num_workers=1,
+    stream=False,
 ):
     """Download data to `save_dir` and optionally log a message
 
@@ -71,6 +104,14 @@ def downloader(
             If True, existing files are overwritten by the downloaded files.
         cleanup (bool):
             Whether to delete the zip/tar file after extracting.
+        num_workers (int):
+            Number of remotes downloaded concurrently. When a single remote is
+            downloaded, number of parts of a multipart zip file downloaded
+            concurrently and of zip members extracted concurrently instead.
+        stream (bool):
+            If True, tar files are extracted while they are downloaded, and are only
+            written to disk if cleanup is False. Zip files cannot be extracted from a
+            stream and are always downloaded first.
     """
     if not os.path.exists(save_dir):
         os.makedirs(save_dir)
@@ -123,52 +164,106 @@ def downloader(
         else:
             logging.info("Downloading {} to {}".format(objs_to_download, save_dir))
 
-        for k in objs_to_download:
-            if isinstance(remotes[k], list):
-                if all([remote.filename[-4:-2] == ".z" for remote in remotes[k]]):
-                    download_multipart_zip(
-                        remotes[k], save_dir, force_overwrite, cleanup
+        if num_workers <= 1 or len(objs_to_download) == 1:
+            for k in objs_to_download:
+                download_remote(
+                    k,
+                    remotes[k],
+                    save_dir,
+                    force_overwrite,
+                    cleanup,
+                    num_workers,
+                    stream,
+                )
+        else:
+            # each remote is downloaded and extracted serially by one worker,
+            # so that thread pools are never nested
+            with futures.ThreadPoolExecutor(max_workers=num_workers) as executor:
+                jobs = [
+                    executor.submit(
+                        download_remote,
+                        k,
+                        remotes[k],
+                        save_dir,
+                        force_overwrite,
+                        cleanup,
+                        1,
+                        stream,
                     )
-                else:
-                    raise NotImplementedError("Only multipart zip supported.")
+                    for k in objs_to_download
+                ]
+                for job in tqdm(
+                    futures.as_completed(jobs),
+                    total=len(jobs),
+                    desc="Downloaded remotes",
+                ):
+                    job.result()
 
-            else:
-                logging.info("[{}] downloading {}".format(k, remotes[k].filename))
-                extension = os.path.splitext(remotes[k].filename)[-1]
-                if ".zip" in extension:
-                    download_zip_file(remotes[k], save_dir, force_overwrite, cleanup)
-                elif ".gz" in extension or ".tar" in extension or ".bz2" in extension:
-                    download_tar_file(remotes[k], save_dir, force_overwrite, cleanup)
-                elif ".7z" in extension:
-                    download_7z_file(remotes[k], save_dir, force_overwrite, cleanup)
-                else:
-                    download_from_remote(remotes[k], save_dir, force_overwrite)
-
-                if remotes[k].unpack_directories:
-                    for src_dir in remotes[k].unpack_directories:
-                        # path to destination directory
-                        destination_dir = (
-                            os.path.join(save_dir, remotes[k].destination_dir)
-                            if remotes[k].destination_dir
-                            else save_dir
+        for k in objs_to_download:
+            if not isinstance(remotes[k], list) and remotes[k].unpack_directories:
+                for src_dir in remotes[k].unpack_directories:
+                    # path to destination directory
+                    destination_dir = (
+                        os.path.join(save_dir, remotes[k].destination_dir)
+                        if remotes[k].destination_dir
+                        else save_dir
+                    )
+                    # path to directory to unpack
+                    source_dir = os.path.join(destination_dir, src_dir)
+
+                    if not os.path.exists(source_dir):
+                        logging.info(
+                            "Data not downloaded, because it probably already exists on your computer. "
+                            + "Run .validate() to check, or rerun with force_overwrite=True to delete any "
+                            + "existing files and download from scratch"
                         )
-                        # path to directory to unpack
-                        source_dir = os.path.join(destination_dir, src_dir)
+                        return
 
-                        if not os.path.exists(source_dir):
-                            logging.info(
-                                "Data not downloaded, because it probably already exists on your computer. "
-                                + "Run .validate() to check, or rerun with force_overwrite=True to delete any "
-                                + "existing files and download from scratch"
-                            )
-                            return
-
-                        move_directory_contents(source_dir, destination_dir)
+                    move_directory_contents(source_dir, destination_dir)
 
     if info_message is not None:
         logging.info(info_message.format(save_dir))
 
 
+def download_remote(
+    key, remote, save_dir, force_overwrite, cleanup, num_workers=1, stream=False
+):
+    """Download a remote and uncompress it according to its file extension
+
+    Args:
+        key (str): the remote's key in the remotes dictionary
+        remote (RemoteFileMetadata or list):
+            Object containing download information, or a list of them for a
+            multipart zip file
+        save_dir (str): Path to save downloaded file
+        force_overwrite (bool): If True, overwrites existing files
+        cleanup (bool): If True, remove the compressed file after uncompressing
+        num_workers (int): Number of parts of a multipart zip file downloaded
+            concurrently, and of zip members extracted concurrently
+        stream (bool): If True, tar files are extracted while they are downloaded
+
+    """
+    if isinstance(remote, list):
+        if all([part.filename[-4:-2] == ".z" for part in remote]):
+            download_multipart_zip(
+                remote, save_dir, force_overwrite, cleanup, num_workers
+            )
+        else:
+            raise NotImplementedError("Only multipart zip supported.")
+
+    else:
+        logging.info("[{}] downloading {}".format(key, remote.filename))
+        extension = os.path.splitext(remote.filename)[-1]
+        if ".zip" in extension:
+            download_zip_file(remote, save_dir, force_overwrite, cleanup, num_workers)
+        elif ".gz" in extension or ".tar" in extension or ".bz2" in extension:
+            download_tar_file(remote, save_dir, force_overwrite, cleanup, stream)
+        elif ".7z" in extension:
+            download_7z_file(remote, save_dir, force_overwrite, cleanup)
+        else:
+            download_from_remote(remote, save_dir, force_overwrite)
+
+
 class DownloadProgressBar(tqdm):
     """Wrap tqdm to show download progress"""
 
@@ -178,7 +273,9 @@ class DownloadProgressBar(tqdm):
         self.update(b * bsize - self.n)
 
 
-def download_multipart_zip(zip_remotes, save_dir, force_overwrite, cleanup):
+def download_multipart_zip(
+    zip_remotes, save_dir, force_overwrite, cleanup, num_workers=1
+):
     """Download and unzip a multipart zip file.
 
     Args:
@@ -191,21 +288,299 @@ def download_multipart_zip(zip_remotes, save_dir, force_overwrite, cleanup):
             If True, overwrites existing files
         cleanup (bool):
             If True, remove zipfile after unziping
+        num_workers (int):
+            Number of parts downloaded and of members extracted concurrently
 
     """
-    for l in range(len(zip_remotes)):
-        download_from_remote(zip_remotes[l], save_dir, force_overwrite)
-    zip_path = os.path.join(
-        save_dir,
-        next((part.filename for part in zip_remotes if ".zip" in part.filename), None),
+    with futures.ThreadPoolExecutor(max_workers=num_workers) as executor:
+        for job in [
+            executor.submit(download_from_remote, part, save_dir, force_overwrite)
+            for part in zip_remotes
+        ]:
+            job.result()
+    part_paths = [os.path.join(save_dir, part.filename) for part in zip_remotes]
+    unzip_multipart(
+        sorted(part_paths, key=multipart_zip_order),
+        cleanup=cleanup,
+        num_workers=num_workers,
     )
-    out_path = zip_path.replace(".zip", "_single.zip")
-    subprocess.run(["zip", "-s", "0", zip_path, "--out", out_path], shell=True)
-    if cleanup:
-        for l in range(len(zip_remotes)):
-            zip_path = os.path.join(save_dir, zip_remotes[l].filename)
-            os.remove(zip_path)
-    unzip(out_path, cleanup=cleanup)
+
+
+def multipart_zip_order(part_path):
+    """Sort key ordering the parts of a multipart zip file as .z01, .z02, ..., .zip
+
+    Args:
+        part_path (str): path to a part of a multipart zip file
+
+    Returns:
+        int: position of the part in the archive
+
+    """
+    extension = os.path.splitext(part_path)[-1]
+    if extension == ".zip":
+        return float("inf")
+    return int(extension[2:])
+
+
+class MultipartZipStream(io.RawIOBase):
+    """A seekable read-only stream presenting the parts of a multipart (split)
+    zip file as a single zip file, without joining them on disk
+
+    The parts are read in place. Only the central directory, which locates each
+    member by part number and offset within that part, is rewritten in memory to
+    offsets in the joined stream, as ``zip -s 0`` does when joining the parts.
+
+    Args:
+        part_paths (list): paths to the parts of the archive in order, i.e.
+            .z01, .z02, ..., .zip
+
+    """
+
+    def __init__(self, part_paths):
+        super().__init__()
+        self._fhandles = [open(part_path, "rb") for part_path in part_paths]
+        sizes = [os.path.getsize(part_path) for part_path in part_paths]
+        # offset of each part in the joined stream
+        self._part_starts = [sum(sizes[:i]) for i in range(len(sizes))]
+        self._position = 0
+
+        try:
+            cd_start, central_directory = self._read_central_directory()
+        except (struct.error, IndexError) as exc:
+            self.close()
+            raise zipfile.BadZipFile("Invalid multipart zip file") from exc
+        self._data_end = cd_start
+        self._tail = central_directory
+        self._size = cd_start + len(central_directory)
+
+    def _read_part(self, disk, offset, size):
+        """Read size bytes starting at offset in a part, continuing in the next
+        parts if needed"""
+        return self._read_at(self._part_starts[disk] + offset, size)
+
+    def _read_at(self, position, size):
+        """Read size bytes of the joined parts starting at position"""
+        chunks = []
+        part = bisect.bisect_right(self._part_starts, position) - 1
+        while size > 0 and part < len(self._fhandles):
+            fhandle = self._fhandles[part]
+            fhandle.seek(position - self._part_starts[part])
+            chunk = fhandle.read(size)
+            chunks.append(chunk)
+            size -= len(chunk)
+            position += len(chunk)
+            part += 1
+        return b"".join(chunks)
+
+    def _read_central_directory(self):
+        """Read the central directory and rewrite it, with the end of central
+        directory records, for the joined stream
+
+        Returns:
+            * int - offset of the central directory in the joined stream
+            * bytes - the rewritten central directory and end records
+
+        """
+        last = self._fhandles[-1]
+        last.seek(0, 2)
+        last_size = last.tell()
+        # the end record is followed by a comment of at most 65535 bytes
+        search_size = min(last_size, zipfile.sizeEndCentDir + (1 << 16))
+        last.seek(last_size - search_size)
+        data = last.read(search_size)
+        end_offset = data.rfind(zipfile.stringEndArchive)
+        if end_offset < 0:
+            raise zipfile.BadZipFile("End of central directory not found")
+        end_record = struct.unpack(
+            zipfile.structEndArchive,
+            data[end_offset : end_offset + zipfile.sizeEndCentDir],
+        )
+        cd_disk, n_entries = end_record[2], end_record[4]
+        cd_size, cd_offset = end_record[5], end_record[6]
+
+        locator_offset = end_offset - zipfile.sizeEndCentDir64Locator
+        if (
+            locator_offset >= 0
+            and data[locator_offset : locator_offset + 4]
+            == zipfile.stringEndArchive64Locator
+        ):
+            _, zip64_disk, zip64_offset, _ = struct.unpack(
+                zipfile.structEndArchive64Locator,
+                data[locator_offset:end_offset],
+            )
+            zip64_record = struct.unpack(
+                zipfile.structEndArchive64,
+                self._read_part(zip64_disk, zip64_offset, zipfile.sizeEndCentDir64),
+            )
+            cd_disk, n_entries = zip64_record[5], zip64_record[7]
+            cd_size, cd_offset = zip64_record[8], zip64_record[9]
+
+        cd_start = self._part_starts[cd_disk] + cd_offset
+        central_directory = self._read_at(cd_start, cd_size)
+
+        entries = []
+        position = 0
+        for _ in range(n_entries):
+            entry, position = self._rewrite_entry(central_directory, position)
+            entries.append(entry)
+        central_directory = b"".join(entries)
+
+        # zip64 end records are always written, they hold any offset and size
+        zip64_end = struct.pack(
+            zipfile.structEndArchive64,
+            zipfile.stringEndArchive64,
+            zipfile.sizeEndCentDir64 - 12,
+            45,
+            45,
+            0,
+            0,
+            n_entries,
+            n_entries,
+            len(central_directory),
+            cd_start,
+        )
+        zip64_locator = struct.pack(
+            zipfile.structEndArchive64Locator,
+            zipfile.stringEndArchive64Locator,
+            0,
+            cd_start + len(central_directory),
+            1,
+        )
+        end = struct.pack(
+            zipfile.structEndArchive,
+            zipfile.stringEndArchive,
+            0,
+            0,
+            min(n_entries, 0xFFFF),
+            min(n_entries, 0xFFFF),
+            min(len(central_directory), 0xFFFFFFFF),
+            min(cd_start, 0xFFFFFFFF),
+            0,
+        )
+        return cd_start, central_directory + zip64_end + zip64_locator + end
+
+    def _rewrite_entry(self, central_directory, position):
+        """Rewrite the central directory entry starting at position so that its
+        local header offset is relative to the joined stream
+
+        Returns:
+            * bytes - the rewritten entry
+            * int - position of the next entry
+
+        """
+        header = list(
+            struct.unpack(
+                zipfile.structCentralDir,
+                central_directory[position : position + zipfile.sizeCentralDir],
+            )
+        )
+        if header[0] != zipfile.stringCentralDir:
+            raise zipfile.BadZipFile("Bad magic number for central directory")
+        name_length = header[zipfile._CD_FILENAME_LENGTH]
+        extra_length = header[zipfile._CD_EXTRA_FIELD_LENGTH]
+        comment_length = header[zipfile._CD_COMMENT_LENGTH]
+        name_start = position + zipfile.sizeCentralDir
+        extra_start = name_start + name_length
+        comment_start = extra_start + extra_length
+        next_position = comment_start + comment_length
+
+        file_size = header[zipfile._CD_UNCOMPRESSED_SIZE]
+        compress_size = header[zipfile._CD_COMPRESSED_SIZE]
+        offset = header[zipfile._CD_LOCAL_HEADER_OFFSET]
+        disk = header[zipfile._CD_DISK_NUMBER_START]
+
+        # values too large for the header are stored in the zip64 extra field,
+        # which is dropped here and written again below
+        extra = central_directory[extra_start:comment_start]
+        other_extra = []
+        while len(extra) >= 4:
+            field_id, field_size = struct.unpack("<HH", extra[:4])
+            field = extra[4 : 4 + field_size]
+            if field_id == 0x0001:
+                if file_size == 0xFFFFFFFF:
+                    (file_size,) = struct.unpack("<Q", field[:8])
+                    field = field[8:]
+                if compress_size == 0xFFFFFFFF:
+                    (compress_size,) = struct.unpack("<Q", field[:8])
+                    field = field[8:]
+                if offset == 0xFFFFFFFF:
+                    (offset,) = struct.unpack("<Q", field[:8])
+                    field = field[8:]
+                if disk == 0xFFFF:
+                    (disk,) = struct.unpack("<L", field[:4])
+            else:
+                other_extra.append(extra[: 4 + field_size])
+            extra = extra[4 + field_size :]
+        offset += self._part_starts[disk]
+
+        zip64 = []
+        for index, value in [
+            (zipfile._CD_UNCOMPRESSED_SIZE, file_size),
+            (zipfile._CD_COMPRESSED_SIZE, compress_size),
+            (zipfile._CD_LOCAL_HEADER_OFFSET, offset),
+        ]:
+            if value >= 0xFFFFFFFF:
+                header[index] = 0xFFFFFFFF
+                zip64.append(value)
+            else:
+                header[index] = value
+        if zip64:
+            other_extra.append(
+                struct.pack("<HH", 0x0001, 8 * len(zip64))
+                + struct.pack("<{}Q".format(len(zip64)), *zip64)
+            )
+        extra = b"".join(other_extra)
+        header[zipfile._CD_EXTRA_FIELD_LENGTH] = len(extra)
+        header[zipfile._CD_DISK_NUMBER_START] = 0
+
+        entry = (
+            struct.pack(zipfile.structCentralDir, *header)
+            + central_directory[name_start:extra_start]
+            + extra
+            + central_directory[comment_start:next_position]
+        )
+        return entry, next_position
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def tell(self):
+        return self._position
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_SET:
+            self._position = offset
+        elif whence == io.SEEK_CUR:
+            self._position += offset
+        elif whence == io.SEEK_END:
+            self._position = self._size + offset
+        else:
+            raise ValueError("Invalid whence ({})".format(whence))
+        if self._position < 0:
+            raise OSError("Negative seek position {}".format(self._position))
+        return self._position
+
+    def readinto(self, buffer):
+        size = min(len(buffer), max(self._size - self._position, 0))
+        data = b""
+        if self._position < self._data_end:
+            data = self._read_at(
+                self._position, min(size, self._data_end - self._position)
+            )
+        if len(data) < size:
+            tail_start = self._position + len(data) - self._data_end
+            data += self._tail[tail_start : tail_start + size - len(data)]
+        buffer[: len(data)] = data
+        self._position += len(data)
+        return len(data)
+
+    def close(self):
+        for fhandle in self._fhandles:
+            fhandle.close()
+        super().close()
 
 
 def download_from_remote(remote, save_dir, force_overwrite):
@@ -241,39 +616,37 @@ def download_from_remote(remote, save_dir, force_overwrite):
 
     if not os.path.exists(download_path) or force_overwrite:
         # if we got here, we want to overwrite any existing file
-        if os.path.exists(download_path):
-            os.remove(download_path)
+        for path in [download_path, download_path + ".part"]:
+            if force_overwrite and os.path.exists(path):
+                os.remove(path)
 
         # If file doesn't exist or we want to overwrite, download it
         with DownloadProgressBar(
-            unit="B", unit_scale=True, unit_divisor=1024, miniters=1
+            unit="B",
+            unit_scale=True,
+            unit_divisor=1024,
+            miniters=1,
+            desc=remote.filename,
         ) as t:
             try:
-                urllib.request.urlretrieve(
-                    remote.url,
-                    filename=download_path,
-                    reporthook=t.update_to,
-                    data=None,
-                )
+                checksum = fetch_url(remote.url, download_path, t)
             except Exception as exc:
-                error_msg = """
-                            soundata failed to download the dataset from {}!
-                            Please try again in a few minutes.
-                            If this error persists, please raise an issue at
-                            https://github.com/soundata/soundata,
-                            and tag it with 'broken-link'.
-                            """.format(
-                    remote.url
-                )
-                logging.error(error_msg)
+                log_download_error(remote.url)
                 raise exc
     else:
         logging.info(
             "{} already exists and will not be downloaded. ".format(download_path)
             + "Rerun with force_overwrite=True to delete this file and force the download."
         )
-
-    checksum = md5(download_path)
+        # reuses the checksum recorded when the file was downloaded if the file
+        # did not change since
+        manifest = validate.load_manifest(save_dir)
+        checksum = validate.file_signature(
+            download_path,
+            manifest_entry=manifest.get(os.path.relpath(download_path, save_dir)),
+        )[3]
+
+    record_checksum(save_dir, download_path, checksum)
     if remote.checksum != checksum:
         raise IOError(
             "{} has an MD5 checksum ({}) "
@@ -283,7 +656,148 @@ def download_from_remote(remote, save_dir, force_overwrite):
     return download_path
 
 
-def download_zip_file(zip_remote, save_dir, force_overwrite, cleanup):
+def log_download_error(url):
+    """Log that downloading from url failed
+
+    Args:
+        url (str): the url that could not be downloaded
+
+    """
+    error_msg = """
+                soundata failed to download the dataset from {}!
+                Please try again in a few minutes.
+                If this error persists, please raise an issue at
+                https://github.com/soundata/soundata,
+                and tag it with 'broken-link'.
+                """.format(
+        url
+    )
+    logging.error(error_msg)
+
+
+def record_checksum(save_dir, download_path, checksum):
+    """Record a downloaded file's checksum in the validation manifest of save_dir,
+    so that it is not hashed again by later downloads or validations
+
+    Args:
+        save_dir (str): Directory holding the manifest. Usually `data_home`
+        download_path (str): path of the downloaded file
+        checksum (str): md5 checksum of the downloaded file
+
+    """
+    # keyed like validate_index, by the path relative to data_home
+    key = os.path.relpath(download_path, save_dir)
+    with MANIFEST_LOCK:
+        manifest = validate.load_manifest(save_dir)
+        entry = validate.file_stat(download_path) + [checksum]
+        if manifest.get(key) != entry:
+            manifest[key] = entry
+            validate.save_manifest(save_dir, manifest)
+
+
+def fetch_url(url, download_path, progress=None):
+    """Download the contents of url to download_path
+
+    Data is written to ``download_path + ".part"``, which is renamed to download_path
+    once complete. If a ``.part`` file was left behind by an interrupted download,
+    only the missing bytes are requested with an HTTP Range request. Connection
+    errors, timeouts (after DOWNLOAD_TIMEOUT seconds without data), server errors
+    and RETRY_HTTP_CODES errors are retried DOWNLOAD_RETRIES times with exponential
+    backoff, resuming from the bytes received so far. The file is hashed as it is
+    written, so it doesn't need to be read again to verify its checksum.
+
+    Args:
+        url (str): url to download
+        download_path (str): path of the downloaded file
+        progress (DownloadProgressBar or None): progress bar updated with the
+            number of bytes downloaded
+
+    Returns:
+        str: md5 checksum of the downloaded file, computed while it is downloaded
+
+    """
+    part_path = download_path + ".part"
+    # md5 of the first hashed_bytes bytes of the part file
+    hash_md5, hashed_bytes = hashlib.md5(), 0
+    for attempt in range(DOWNLOAD_RETRIES):
+        offset = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+        request = urllib.request.Request(url)
+        if offset:
+            request.add_header("Range", "bytes={}-".format(offset))
+
+        try:
+            with urllib.request.urlopen(request, timeout=DOWNLOAD_TIMEOUT) as response:
+                if response.status != 206:
+                    # the server sent the whole file
+                    offset = 0
+                if hashed_bytes != offset:
+                    hash_md5, hashed_bytes = _md5_prefix(part_path, offset), offset
+                length = response.headers.get("Content-Length")
+                if progress is not None:
+                    progress.total = offset + int(length) if length else None
+                    progress.update(offset - progress.n)
+                with open(part_path, "ab" if offset else "wb") as fhandle:
+                    for chunk in iter(lambda: response.read(DOWNLOAD_CHUNK_SIZE), b""):
+                        fhandle.write(chunk)
+                        hash_md5.update(chunk)
+                        hashed_bytes += len(chunk)
+                        if progress is not None:
+                            progress.update(len(chunk))
+            break
+        except urllib.error.HTTPError as exc:
+            # the part file already holds the complete file
+            if exc.code == 416 and offset:
+                if hashed_bytes != offset:
+                    hash_md5 = _md5_prefix(part_path, offset)
+                break
+            if (
+                exc.code < 500 and exc.code not in RETRY_HTTP_CODES
+            ) or attempt == DOWNLOAD_RETRIES - 1:
+                raise
+        except (
+            urllib.error.URLError,
+            http.client.HTTPException,
+            # socket.timeout only became an alias of TimeoutError in Python 3.10
+            socket.timeout,
+            TimeoutError,
+            ConnectionError,
+        ):
+            if attempt == DOWNLOAD_RETRIES - 1:
+                raise
+
+        delay = RETRY_BACKOFF * 2**attempt
+        logging.warning(
+            "Downloading {} failed, retrying in {} seconds".format(url, delay)
+        )
+        time.sleep(delay)
+
+    os.replace(part_path, download_path)
+    return hash_md5.hexdigest()
+
+
+def _md5_prefix(file_path, n_bytes):
+    """Get the md5 hash object of the first n_bytes bytes of a file
+
+    Args:
+        file_path (str): File path
+        n_bytes (int): number of bytes to hash
+
+    Returns:
+        hashlib hash object: md5 of the first n_bytes of file_path
+
+    """
+    hash_md5 = hashlib.md5()
+    with open(file_path, "rb") as fhandle:
+        while n_bytes > 0:
+            chunk = fhandle.read(min(n_bytes, validate.CHUNK_SIZE))
+            if not chunk:
+                break
+            hash_md5.update(chunk)
+            n_bytes -= len(chunk)
+    return hash_md5
+
+
+def download_zip_file(zip_remote, save_dir, force_overwrite, cleanup, num_workers=1):
     """Download and unzip a zip file.
 
     Args:
@@ -295,51 +809,97 @@ def download_zip_file(zip_remote, save_dir, force_overwrite, cleanup):
             If True, overwrites existing files
         cleanup (bool):
             If True, remove zipfile after unziping
+        num_workers (int):
+            Number of members extracted concurrently
 
     """
     zip_download_path = download_from_remote(zip_remote, save_dir, force_overwrite)
-    unzip(zip_download_path, cleanup=cleanup)
+    unzip(zip_download_path, cleanup=cleanup, num_workers=num_workers)
+
 
+def extract_member(zfile, member, out_dir):
+    """Extract a single member of a zip archive to a output directory.
 
-def extractall_unicode(zfile, out_dir):
+    Args:
+        zfile (obj): Zip file object created with zipfile.ZipFile
+        member (zipfile.ZipInfo): the member to extract
+        out_dir (str): Output folder
+
+    """
+    try:
+        decoded_name = member.filename.encode("cp437").decode()
+    except UnicodeEncodeError:
+        decoded_name = member.filename
+
+    disk_file_name = os.path.join(out_dir, decoded_name)
+
+    dir_name = os.path.dirname(disk_file_name)
+    # members sharing a folder may create it concurrently
+    os.makedirs(dir_name, exist_ok=True)
+
+    if not os.path.isdir(disk_file_name):
+        # decompressed in blocks rather than loading the whole member in memory
+        with zfile.open(member) as source, open(disk_file_name, "wb") as fd:
+            shutil.copyfileobj(source, fd, EXTRACT_CHUNK_SIZE)
+
+
+def extractall_unicode(zfile, out_dir, num_workers=1):
     """Extract all files inside a zip archive to a output directory.
 
-    In comparison to the zipfile, it checks for correct file name encoding
+    In comparison to the zipfile, it checks for correct file name encoding.
+    Members are streamed to disk, so memory use does not grow with their size.
+    Members are compressed independently, so with num_workers > 1 they are
+    decompressed concurrently; reads of the archive itself are serialized by
+    zipfile.
 
     Args:
         zfile (obj): Zip file object created with zipfile.ZipFile
         out_dir (str): Output folder
+        num_workers (int): Number of members extracted concurrently
 
     """
-    for m in zfile.infolist():
-        data = zfile.read(m)  # extract zipped data into memory
+    if num_workers <= 1:
+        for m in zfile.infolist():
+            extract_member(zfile, m, out_dir)
+        return
 
-        try:
-            decoded_name = m.filename.encode("cp437").decode()
-        except UnicodeEncodeError:
-            decoded_name = m.filename
+    with futures.ThreadPoolExecutor(max_workers=num_workers) as executor:
+        for job in [
+            executor.submit(extract_member, zfile, m, out_dir) for m in zfile.infolist()
+        ]:
+            job.result()
 
-        disk_file_name = os.path.join(out_dir, decoded_name)
 
-        dir_name = os.path.dirname(disk_file_name)
-        if not os.path.exists(dir_name):
-            os.makedirs(dir_name)
+def unzip_multipart(part_paths, cleanup, num_workers=1):
+    """Unzip a multipart zip file inside the directory of its last part, reading
+    the parts in place
 
-        if not os.path.isdir(disk_file_name):
-            with open(disk_file_name, "wb") as fd:
-                fd.write(data)
+    Args:
+        part_paths (list): paths to the parts of the archive in order, i.e.
+            .z01, .z02, ..., .zip
+        cleanup (bool): If True, remove the parts after unzipping
+        num_workers (int): Number of members extracted concurrently
 
+    """
+    with MultipartZipStream(part_paths) as stream:
+        with zipfile.ZipFile(stream, "r") as zfile:
+            extractall_unicode(zfile, os.path.dirname(part_paths[-1]), num_workers)
+    if cleanup:
+        for part_path in part_paths:
+            os.remove(part_path)
 
-def unzip(zip_path, cleanup):
+
+def unzip(zip_path, cleanup, num_workers=1):
     """Unzip a zip file inside it's current directory.
 
     Args:
         zip_path (str): Path to zip file
         cleanup (bool): If True, remove zipfile after unzipping
+        num_workers (int): Number of members extracted concurrently
 
     """
     zfile = zipfile.ZipFile(zip_path, "r")
-    extractall_unicode(zfile, os.path.dirname(zip_path))
+    extractall_unicode(zfile, os.path.dirname(zip_path), num_workers)
     zfile.close()
     if cleanup:
         os.remove(zip_path)
@@ -362,6 +922,9 @@ def download_7z_file(tar_remote, save_dir, force_overwrite, cleanup):
 def un7z(sevenz_path, cleanup):
     """Unzip a 7z file inside its current directory.
 
+    py7zr already decompresses the solid blocks of an archive opened by path
+    concurrently, with a number of threads it chooses itself.
+
     Args:
         sevenz_path (str): Path to the 7z file
         cleanup (bool): If True, remove 7z file after extraction
@@ -373,7 +936,7 @@ def un7z(sevenz_path, cleanup):
         os.remove(sevenz_path)
 
 
-def download_tar_file(tar_remote, save_dir, force_overwrite, cleanup):
+def download_tar_file(tar_remote, save_dir, force_overwrite, cleanup, stream=False):
     """Download and untar a tar file.
 
     Args:
@@ -381,12 +944,121 @@ def download_tar_file(tar_remote, save_dir, force_overwrite, cleanup):
         save_dir (str): Path to save downloaded file
         force_overwrite (bool): If True, overwrites existing files
         cleanup (bool): If True, remove tarfile after untarring
+        stream (bool): If True, extract the tar file while it is downloaded,
+            see stream_tar_file
 
     """
+    if stream:
+        stream_tar_file(tar_remote, save_dir, force_overwrite, cleanup)
+        return
     tar_download_path = download_from_remote(tar_remote, save_dir, force_overwrite)
     untar(tar_download_path, cleanup=cleanup)
 
 
+class HashingReader(object):
+    """Wrap a file-like object to hash the bytes read from it, and optionally
+    copy them to a file and report them to a progress bar
+
+    Attributes:
+        hash_md5 (hashlib hash object): md5 of the bytes read so far
+
+    """
+
+    def __init__(self, fileobj, copy=None, progress=None):
+        self.fileobj = fileobj
+        self.copy = copy
+        self.progress = progress
+        self.hash_md5 = hashlib.md5()
+
+    def read(self, size=-1):
+        data = self.fileobj.read(size)
+        self.hash_md5.update(data)
+        if self.copy is not None:
+            self.copy.write(data)
+        if self.progress is not None:
+            self.progress.update(len(data))
+        return data
+
+    def drain(self):
+        """Read the remaining bytes of the stream"""
+        for _ in iter(lambda: self.read(DOWNLOAD_CHUNK_SIZE), b""):
+            pass
+
+
+def stream_tar_file(tar_remote, save_dir, force_overwrite, cleanup):
+    """Download a tar file and extract it as its bytes arrive
+
+    The archive is only written to disk if cleanup is False, in which case it is
+    copied from the same stream. An archive already on disk is extracted from
+    there unless force_overwrite is True. The checksum of the streamed bytes is
+    verified once the download is complete.
+
+    Args:
+        tar_remote (RemoteFileMetadata): Object containing download information
+        save_dir (str): Path to save downloaded file
+        force_overwrite (bool): If True, overwrites existing files
+        cleanup (bool): If True, the tar file is not kept on disk
+
+    Raises:
+        IOError: if the streamed bytes have an unexpected checksum. The extracted
+            files may then be corrupted
+
+    """
+    if tar_remote.destination_dir is None:
+        download_dir = save_dir
+    else:
+        download_dir = os.path.join(save_dir, tar_remote.destination_dir)
+
+    if not os.path.exists(download_dir):
+        os.makedirs(download_dir)
+
+    download_path = os.path.join(download_dir, tar_remote.filename)
+    if os.path.exists(download_path) and not force_overwrite:
+        download_tar_file(tar_remote, save_dir, force_overwrite, cleanup)
+        return
+
+    with DownloadProgressBar(
+        unit="B",
+        unit_scale=True,
+        unit_divisor=1024,
+        miniters=1,
+        desc=tar_remote.filename,
+    ) as t:
+        copy = None if cleanup else open(download_path + ".part", "wb")
+        try:
+            with urllib.request.urlopen(
+                tar_remote.url, timeout=DOWNLOAD_TIMEOUT
+            ) as response:
+                length = response.headers.get("Content-Length")
+                t.total = int(length) if length else None
+                reader = HashingReader(response, copy, t)
+                with tarfile.open(fileobj=reader, mode="r|*") as tfile:
+                    tfile.extractall(download_dir)
+                reader.drain()
+        except Exception as exc:
+            log_download_error(tar_remote.url)
+            raise exc
+        finally:
+            if copy is not None:
+                copy.close()
+
+    checksum = reader.hash_md5.hexdigest()
+    if tar_remote.checksum != checksum:
+        if copy is not None:
+            os.remove(download_path + ".part")
+        raise IOError(
+            "{} has an MD5 checksum ({}) "
+            "differing from expected ({}), "
+            "extracted files may be corrupted.".format(
+                tar_remote.url, checksum, tar_remote.checksum
+            )
+        )
+
+    if copy is not None:
+        os.replace(download_path + ".part", download_path)
+        record_checksum(save_dir, download_path, checksum)
+
+
 def untar(tar_path, cleanup):
     """Untar a tar file inside it's current directory.
 
@@ -1,22 +1,55 @@
 import functools
 import io
-from typing import BinaryIO, Callable, Optional, TextIO, TypeVar, Union
+import json
+import logging
+import os
+from concurrent import futures
+from typing import (
+    Any,
+    BinaryIO,
+    Callable,
+    Dict,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    TextIO,
+    Tuple,
+    TypeVar,
+    Union,
+)
+
+import librosa
+import numpy as np
+import soundfile as sf
 
 T = TypeVar("T")  # Can be anything
 
+# integer PCM subtypes which are faster to decode as integers and scale in numpy
+# than through libsndfile's float conversion: {subtype: (dtype, scale)}
+PCM_SUBTYPES = {"PCM_16": ("int16", 2**15)}
+
+# columns of the table returned by audio_info_table
+AUDIO_INFO_COLUMNS = ("sample_rate", "frames", "channels", "duration")
+
+# number of frames decoded at a time when only some channels are loaded
+BLOCK_FRAMES = 65536
+
 
 def coerce_to_string_io(
     func: Callable[[TextIO], T]
 ) -> Callable[[Optional[Union[str, TextIO]]], Optional[T]]:
     @functools.wraps(func)
-    def wrapper(file_path_or_obj: Optional[Union[str, TextIO]]) -> Optional[T]:
+    def wrapper(
+        file_path_or_obj: Optional[Union[str, TextIO]], *args, **kwargs
+    ) -> Optional[T]:
         if not file_path_or_obj:
             return None
         if isinstance(file_path_or_obj, str):
             with open(file_path_or_obj) as f:
-                return func(f)
+                return func(f, *args, **kwargs)
         elif isinstance(file_path_or_obj, io.StringIO):
-            return func(file_path_or_obj)
+            return func(file_path_or_obj, *args, **kwargs)
         else:
             raise ValueError(
                 "Invalid argument passed to {}, argument has the type {}",
@@ -31,14 +64,16 @@ def coerce_to_bytes_io(
     func: Callable[[BinaryIO], T]
 ) -> Callable[[Optional[Union[str, BinaryIO]]], Optional[T]]:
     @functools.wraps(func)
-    def wrapper(file_path_or_obj: Optional[Union[str, BinaryIO]]) -> Optional[T]:
+    def wrapper(
+        file_path_or_obj: Optional[Union[str, BinaryIO]], *args, **kwargs
+    ) -> Optional[T]:
         if not file_path_or_obj:
             return None
         if isinstance(file_path_or_obj, str):
             with open(file_path_or_obj, "rb") as f:
-                return func(f)
+                return func(f, *args, **kwargs)
         elif isinstance(file_path_or_obj, io.BytesIO):
-            return func(file_path_or_obj)
+            return func(file_path_or_obj, *args, **kwargs)
         else:
             raise ValueError(
                 "Invalid argument passed to {}, argument has the type {}",
@@ -47,3 +82,382 @@ def coerce_to_bytes_io(
             )
 
     return wrapper
+
+
+class AudioInfo(NamedTuple):
+    """Audio file information read from the file header
+
+    Attributes:
+        sample_rate (int): native sample rate of the file
+        frames (int): number of frames (samples per channel) in the file
+        channels (int or None): number of channels, None if unknown
+        subtype (str or None): sample format, e.g. "PCM_16", None if unknown
+        duration (float): duration of the file in seconds
+
+    """
+
+    sample_rate: int
+    frames: int
+    channels: Optional[int]
+    subtype: Optional[str]
+    duration: float
+
+
+@coerce_to_bytes_io
+def audio_info(fhandle: BinaryIO) -> AudioInfo:
+    """Read an audio file's information from its header, without decoding it.
+
+    Formats supported by libsndfile are probed with soundfile. For other formats
+    the sample rate and duration are obtained through librosa, and the number of
+    channels and subtype are None.
+
+    Args:
+        fhandle (str or file-like): path or file-like object pointing to an audio file
+
+    Returns:
+        AudioInfo: sample rate, number of frames, channels, subtype and duration
+
+    """
+    try:
+        with sf.SoundFile(fhandle) as sfo:
+            return AudioInfo(
+                sfo.samplerate,
+                sfo.frames,
+                sfo.channels,
+                sfo.subtype,
+                sfo.frames / sfo.samplerate,
+            )
+    except sf.SoundFileRuntimeError:
+        # librosa falls back to audioread here, which needs a path on disk
+        path = getattr(fhandle, "name", None)
+        if not isinstance(path, str):
+            raise
+        sample_rate = int(librosa.get_samplerate(path))
+        duration = librosa.get_duration(path=path)
+        return AudioInfo(
+            sample_rate, int(round(duration * sample_rate)), None, None, duration
+        )
+
+
+def audio_info_table(
+    data_home: str,
+    paths: List[Optional[str]],
+    cache_path: Optional[str] = None,
+    num_workers: Optional[int] = None,
+) -> Dict[str, np.ndarray]:
+    """Read the header information of many audio files as a columnar table.
+
+    Headers are read in parallel and, if cache_path is given, persisted to an
+    ``.npz`` file keyed by each file's path, modification time and size. On
+    later calls only files which are new or have changed since are read again.
+
+    Args:
+        data_home (str): directory the paths are relative to
+        paths (list): audio file paths relative to data_home. None entries and
+            missing files get a duration of NaN and zeros in the other columns
+        cache_path (str or None): path of the cache file. If None, nothing is cached
+        num_workers (int or None): number of threads reading headers.
+            If None, the concurrent.futures default is used
+
+    Returns:
+        dict: {column: np.ndarray} for the columns in AUDIO_INFO_COLUMNS, with
+        one row per path in the order given. Unknown channel counts are 0
+
+    """
+    n_paths = len(paths)
+    table = {
+        "sample_rate": np.zeros(n_paths, dtype=np.int64),
+        "frames": np.zeros(n_paths, dtype=np.int64),
+        "channels": np.zeros(n_paths, dtype=np.int64),
+        "duration": np.full(n_paths, np.nan),
+    }
+    mtimes = np.zeros(n_paths, dtype=np.int64)
+    sizes = np.zeros(n_paths, dtype=np.int64)
+    present = np.zeros(n_paths, dtype=bool)
+
+    cache = _load_audio_info_cache(cache_path)
+    cached_rows = {path: row for row, path in enumerate(cache.get("path", []))}
+
+    stale = []
+    stale_paths = []
+    for i, path in enumerate(paths):
+        if path is None:
+            continue
+        full_path = os.path.join(data_home, path)
+        try:
+            stat = os.stat(full_path)
+        except FileNotFoundError:
+            continue
+        present[i] = True
+        mtimes[i] = stat.st_mtime_ns
+        sizes[i] = stat.st_size
+
+        row = cached_rows.get(path)
+        if (
+            row is not None
+            and cache["mtime"][row] == mtimes[i]
+            and cache["size"][row] == sizes[i]
+        ):
+            for column in AUDIO_INFO_COLUMNS:
+                table[column][i] = cache[column][row]
+        else:
+            stale.append(i)
+            stale_paths.append(full_path)
+
+    if stale:
+        with futures.ThreadPoolExecutor(max_workers=num_workers) as executor:
+            infos = executor.map(audio_info, stale_paths)
+            for i, info in zip(stale, infos):
+                if info is None:
+                    continue
+                table["sample_rate"][i] = info.sample_rate
+                table["frames"][i] = info.frames
+                table["channels"][i] = info.channels or 0
+                table["duration"][i] = info.duration
+
+    if cache_path is not None and (stale or len(cached_rows) != present.sum()):
+        cache = {column: values[present] for column, values in table.items()}
+        cache["path"] = np.array([path for path, p in zip(paths, present) if p])
+        cache["mtime"] = mtimes[present]
+        cache["size"] = sizes[present]
+        # written to a temporary file first so an interrupted write never
+        # leaves a corrupt cache behind, and concurrent writers never share one
+        tmp_path = "{}.{}.tmp".format(cache_path, os.getpid())
+        try:
+            with open(tmp_path, "wb") as fhandle:
+                np.savez(fhandle, **cache)
+            os.replace(tmp_path, cache_path)
+        except OSError as error:
+            logging.warning("Could not write cache {}: {}".format(cache_path, error))
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    return table
+
+
+def _load_audio_info_cache(cache_path):
+    """Load a cache written by audio_info_table, or an empty dict if there is no
+    usable cache at cache_path
+
+    """
+    if cache_path is None or not os.path.exists(cache_path):
+        return {}
+    try:
+        with np.load(cache_path) as cache:
+            return {key: cache[key] for key in cache.files}
+    except (OSError, ValueError):
+        return {}
+
+
+def load_cached(
+    cache_path: Optional[str],
+    source_paths: Sequence[str],
+    build: Callable[[], T],
+    key: Any = None,
+) -> T:
+    """Build data from some source files once, and persist it to a JSON cache.
+
+    The cache is keyed by each source file's path, modification time and size,
+    and by ``key``, and is rebuilt when any of them changes. It is plain JSON,
+    so reading a cache planted by someone else cannot run code. The data must
+    be JSON serializable, with str dictionary keys and lists rather than tuples,
+    to be read back unchanged.
+
+    Args:
+        cache_path (str or None): path of the cache file. If None, or if its
+            directory does not exist, nothing is cached
+        source_paths (list): paths of the files the data is built from
+        build (function): function building the data from the source files
+        key (object): anything else the data depends on, e.g. an index version.
+            Must be JSON serializable
+
+    Returns:
+        the data returned by build
+
+    """
+    signature = [key]
+    for path in source_paths:
+        try:
+            stat = os.stat(path)
+            signature.append([path, stat.st_mtime_ns, stat.st_size])
+        except FileNotFoundError:
+            signature.append([path, None, None])
+    # compared with the signature read back from the cache
+    signature = json.loads(json.dumps(signature))
+
+    if cache_path is None or not os.path.isdir(os.path.dirname(cache_path)):
+        return build()
+
+    try:
+        with open(cache_path, encoding="utf-8") as fhandle:
+            cache = json.load(fhandle)
+        if cache["signature"] == signature:
+            return cache["data"]
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+
+    data = build()
+    # written to a temporary file first so an interrupted write never
+    # leaves a corrupt cache behind, and concurrent writers never share one
+    tmp_path = "{}.{}.tmp".format(cache_path, os.getpid())
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as fhandle:
+            json.dump({"signature": signature, "data": data}, fhandle)
+        os.replace(tmp_path, cache_path)
+    except (OSError, TypeError, ValueError) as error:
+        logging.warning("Could not write cache {}: {}".format(cache_path, error))
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return data
+
+
+def _decode_frames(sfo, frames, dtype, channels):
+    """Decode frames from an open soundfile.SoundFile
+
+    Args:
+        sfo (soundfile.SoundFile): open sound file, positioned at the first frame to read
+        frames (int): number of frames to read, or -1 to read until the end
+        dtype (type): data type of the returned signal
+        channels (list or None): indices of the channels to keep, or None for all
+
+    Returns:
+        np.ndarray: audio signal with shape (n_channels, n_samples)
+
+    """
+    read_dtype, scale = PCM_SUBTYPES.get(sfo.subtype, (dtype, None))
+    if channels is None:
+        audio = sfo.read(frames, dtype=read_dtype, always_2d=True).T
+        if scale is not None:
+            audio = audio.astype(dtype)
+    else:
+        # copy the selected channels out block by block, so the interleaved
+        # frames of the dropped channels are never held in memory at once
+        remaining = sfo.frames - sfo.tell()
+        if frames >= 0:
+            remaining = min(frames, remaining)
+        audio = np.empty((len(channels), remaining), dtype=dtype)
+        position = 0
+        while position < remaining:
+            block = sfo.read(
+                min(BLOCK_FRAMES, remaining - position),
+                dtype=read_dtype,
+                always_2d=True,
+            )
+            if not len(block):
+                break
+            audio[:, position : position + len(block)] = block[:, channels].T
+            position += len(block)
+        audio = audio[:, :position]
+
+    if scale is not None:
+        # integer PCM is scaled to [-1, 1) as libsndfile does
+        audio *= dtype(1.0 / scale)
+    return audio
+
+
+def load_audio(
+    fhandle: BinaryIO,
+    sr: Optional[float] = None,
+    mono: bool = True,
+    offset: float = 0.0,
+    duration: Optional[float] = None,
+    channels: Optional[Sequence[int]] = None,
+    dtype: type = np.float32,
+) -> Tuple[np.ndarray, float]:
+    """Decode an audio file, resampling only when it is needed.
+
+    Equivalent to ``librosa.load(fhandle, sr=sr, mono=mono)``, but the file header is
+    read first so the signal is only resampled when its native sample rate differs
+    from ``sr``, and formats supported by libsndfile (e.g. PCM WAV, FLAC) are decoded
+    directly with soundfile. Other formats fall back to librosa.
+
+    When ``offset`` or ``duration`` are given, the file is seeked to ``offset`` and only
+    the requested frames are decoded. When ``channels`` is given, only those channels
+    are kept, and the rest are dropped block by block while decoding.
+
+    Args:
+        fhandle (str or file-like): path or file-like object pointing to an audio file
+        sr (float or None): target sample rate. If None, the native sample rate is kept
+        mono (bool): if True, average all channels into a mono signal
+        offset (float): start reading the file at this time, in seconds
+        duration (float or None): length of the audio to load, in seconds.
+            If None, the file is read until the end
+        channels (list or None): indices of the channels to load. If None, all
+            channels are loaded
+        dtype (type): data type of the returned signal
+
+    Returns:
+        * np.ndarray - audio signal, with shape (n_samples,) or (n_channels, n_samples)
+        * float - the sample rate of the audio signal
+
+    Raises:
+        ValueError: if offset or duration are negative, or channels are out of range
+
+    """
+    if offset < 0 or (duration is not None and duration < 0):
+        raise ValueError(
+            "offset and duration must be positive, got offset={} and duration={}".format(
+                offset, duration
+            )
+        )
+
+    try:
+        with sf.SoundFile(fhandle) as sfo:
+            native_sr = sfo.samplerate
+            channels = _check_channels(channels, sfo.channels)
+            start = min(int(round(offset * native_sr)), sfo.frames)
+            if start > 0:
+                sfo.seek(start)
+            frames = -1 if duration is None else int(round(duration * native_sr))
+            audio = _decode_frames(sfo, frames, dtype, channels)
+    except sf.SoundFileRuntimeError:
+        # libsndfile cannot decode this format, let librosa try its other backends
+        audio, native_sr = librosa.load(
+            getattr(fhandle, "name", fhandle),
+            sr=None,
+            mono=False,
+            offset=offset,
+            duration=duration,
+            dtype=dtype,
+        )
+        audio = np.atleast_2d(audio)
+        channels = _check_channels(channels, audio.shape[0])
+        if channels is not None:
+            audio = audio[channels]
+
+    if audio.shape[0] == 1:
+        audio = audio[0]
+    elif mono:
+        audio = np.mean(audio, axis=0)
+
+    if sr is None:
+        return audio, native_sr
+    if sr != native_sr:
+        audio = librosa.resample(audio, orig_sr=native_sr, target_sr=sr)
+    return audio, sr
+
+
+def _check_channels(channels, n_channels):
+    """Validate channel indices against the number of channels of a file
+
+    Args:
+        channels (list or None): channel indices, or None for all channels
+        n_channels (int): number of channels in the file
+
+    Returns:
+        list or None: the channel indices as a list
+
+    Raises:
+        ValueError: if any channel index is out of range
+
+    """
+    if channels is None:
+        return None
+    channels = [int(c) for c in np.atleast_1d(channels)]
+    if any(c < -n_channels or c >= n_channels for c in channels):
+        raise ValueError(
+            "Invalid channels {} for a file with {} channels".format(
+                channels, n_channels
+            )
+        )
+    return channels
@@ -6,9 +6,8 @@ import os
 from typing import Callable, List
 
 import jams
-import librosa
 
-from soundata import annotations
+from soundata import annotations, io
 
 
 def jams_converter(
@@ -19,7 +18,7 @@ def jams_converter(
     Args:
         audio_path (str or None):
             A path to the corresponding audio file, or None. If provided,
-            the audio file will be read to compute the duration. If None,
+            the audio file header will be read to compute the duration. If None,
             'duration' must be a field in the metadata dictionary, or the
             resulting jam object will not validate.
         spectrogram_path (str or None):
@@ -39,7 +38,7 @@ def jams_converter(
     duration = None
     if audio_path is not None:
         if os.path.exists(audio_path):
-            duration = librosa.get_duration(path=audio_path)
+            duration = io.audio_info(audio_path).duration
         else:
             raise OSError(
                 "jams conversion failed because the audio file "
@@ -0,0 +1,337 @@
+"""Batch samplers for training on soundata datasets
+"""
+
+from concurrent import futures
+from typing import List, NamedTuple
+
+import numpy as np
+
+
+class CropBatch(NamedTuple):
+    """A batch of fixed-length audio windows
+
+    Attributes:
+        clip_ids (list): the clip id of each window
+        offsets (np.ndarray): the start time of each window in its clip, in seconds
+        audio (np.ndarray): float32 audio with shape (batch, channels, samples),
+            zero-padded after the end of clips shorter than the window
+        mask (np.ndarray): boolean array with shape (batch, samples), False on padding
+        sample_rate (float): the sample rate of the audio
+
+    """
+
+    clip_ids: List[str]
+    offsets: np.ndarray
+    audio: np.ndarray
+    mask: np.ndarray
+    sample_rate: float
+
+
+class RandomCropBatchSampler(object):
+    """Draw batches of fixed-length windows at random positions of random clips
+
+    Clip durations are read once from the audio file headers with
+    ``Dataset.audio_info_table``, and only the frames of each window are decoded,
+    through ``Clip.audio_segment``. Clips whose audio is missing are never drawn.
+    Iterating over the sampler yields CropBatch objects endlessly.
+
+    Args:
+        dataset (core.Dataset): the dataset to sample from
+        window (float): length of the windows, in seconds
+        batch_size (int): number of windows per batch
+        clip_ids (list or None): ids of the clips to sample from. If None, all clips are used
+        num_workers (int): number of windows decoded concurrently
+        seed (int or None): seed of the random number generator
+        cache (bool): If True, the clip durations are cached under ``data_home``,
+            see ``Dataset.audio_info_table``
+
+    Raises:
+        ValueError: if window or batch_size are not positive, or no clip has audio
+
+    """
+
+    def __init__(
+        self,
+        dataset,
+        window,
+        batch_size,
+        clip_ids=None,
+        num_workers=1,
+        seed=None,
+        cache=True,
+    ):
+        if window <= 0 or batch_size < 1:
+            raise ValueError(
+                "window and batch_size must be positive, got window={} and batch_size={}".format(
+                    window, batch_size
+                )
+            )
+        self.dataset = dataset
+        self.window = window
+        self.batch_size = batch_size
+        self.num_workers = num_workers
+        self.rng = np.random.default_rng(seed)
+
+        table = dataset.audio_info_table(cache=cache)
+        durations = dict(zip(table["clip_id"], table["duration"]))
+        if clip_ids is None:
+            clip_ids = dataset.clip_ids
+        available = [
+            clip_id for clip_id in clip_ids if not np.isnan(durations[clip_id])
+        ]
+        if not available:
+            raise ValueError("None of the clips to sample from has audio")
+        self.clip_ids = np.array(available)
+        self.durations = np.array([durations[clip_id] for clip_id in available])
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        return self.load(*self.sample())
+
+    def sample(self):
+        """Draw the clips and window offsets of a batch
+
+        Clips are drawn uniformly with replacement, and offsets uniformly among
+        the positions where the window fits in the clip. Windows of clips shorter
+        than the window start at 0.
+
+        Returns:
+            * list - the clip id of each window
+            * np.ndarray - the start time of each window, in seconds
+
+        """
+        rows = self.rng.integers(len(self.clip_ids), size=self.batch_size)
+        max_offsets = np.maximum(self.durations[rows] - self.window, 0.0)
+        offsets = self.rng.random(self.batch_size) * max_offsets
+        return self.clip_ids[rows].tolist(), offsets
+
+    def load(self, clip_ids, offsets):
+        """Decode the windows of a batch
+
+        Args:
+            clip_ids (list): the clip id of each window
+            offsets (np.ndarray): the start time of each window, in seconds
+
+        Returns:
+            CropBatch: the batch
+
+        Raises:
+            ValueError: if the clips do not all have the same sample rate and
+                number of channels
+
+        """
+        if self.num_workers > 1:
+            with futures.ThreadPoolExecutor(max_workers=self.num_workers) as executor:
+                segments = list(executor.map(self._load_window, clip_ids, offsets))
+        else:
+            segments = [
+                self._load_window(clip_id, offset)
+                for clip_id, offset in zip(clip_ids, offsets)
+            ]
+
+        sample_rates = {sample_rate for _, sample_rate in segments}
+        n_channels = {audio.shape[0] for audio, _ in segments}
+        if len(sample_rates) > 1 or len(n_channels) > 1:
+            raise ValueError(
+                "Clips {} have different sample rates {} or numbers of channels {}".format(
+                    clip_ids, sample_rates, n_channels
+                )
+            )
+        sample_rate = sample_rates.pop()
+        n_samples = int(round(self.window * sample_rate))
+
+        audio = np.zeros((len(segments), n_channels.pop(), n_samples), dtype=np.float32)
+        mask = np.zeros((len(segments), n_samples), dtype=bool)
+        for i, (segment, _) in enumerate(segments):
+            length = min(segment.shape[1], n_samples)
+            audio[i, :, :length] = segment[:, :length]
+            mask[i, :length] = True
+
+        return CropBatch(list(clip_ids), np.asarray(offsets), audio, mask, sample_rate)
+
+    def _load_window(self, clip_id, offset):
+        """Decode a window of a clip
+
+        Args:
+            clip_id (str): clip id of the clip
+            offset (float): start time of the window, in seconds
+
+        Returns:
+            * np.ndarray - audio signal with shape (channels, samples)
+            * float - sample rate
+
+        """
+        audio, sample_rate = self.dataset.clip(clip_id).audio_segment(
+            offset, offset + self.window
+        )
+        return np.atleast_2d(audio), sample_rate
+
+
+def padding_fraction(durations, batches):
+    """Fraction of a set of batches made of padding
+
+    Each batch is padded to its longest clip.
+
+    Args:
+        durations (np.ndarray): duration of each clip, in seconds
+        batches (list): batches, as arrays of indexes into durations
+
+    Returns:
+        float: the padded duration over the total duration of the padded batches
+
+    """
+    total = 0.0
+    padded = 0.0
+    for batch in batches:
+        batch_durations = durations[np.asarray(batch)]
+        length = batch_durations.max() * len(batch_durations)
+        total += length
+        padded += length - batch_durations.sum()
+    return padded / total if total > 0 else 0.0
+
+
+def bucket_batches(durations, batch_size, max_padding_ratio, rng=None):
+    """Group clips of similar durations into batches
+
+    Clips are sorted by duration and each batch is filled with consecutive
+    clips while its padding fraction stays within max_padding_ratio. When rng
+    is given, ties between durations are broken at random and the order of the
+    batches is shuffled.
+
+    Args:
+        durations (np.ndarray): duration of each clip, in seconds
+        batch_size (int): maximum number of clips per batch
+        max_padding_ratio (float): maximum fraction of a batch made of padding
+        rng (np.random.Generator or None): random number generator. If None,
+            batches are returned from the shortest to the longest clips
+
+    Returns:
+        list: batches, as arrays of indexes into durations
+
+    """
+    durations = np.asarray(durations, dtype=float)
+    if rng is None:
+        order = np.argsort(durations, kind="stable")
+    else:
+        permutation = rng.permutation(len(durations))
+        order = permutation[np.argsort(durations[permutation], kind="stable")]
+
+    batches = []
+    start = 0
+    total = 0.0
+    for end, index in enumerate(order):
+        # the clip being added is the longest of the batch, as clips are sorted
+        size = end - start + 1
+        # batches of zero-duration clips have no padding
+        padding = (
+            1.0 - (total + durations[index]) / (size * durations[index])
+            if durations[index] > 0
+            else 0.0
+        )
+        if size > batch_size or padding > max_padding_ratio:
+            batches.append(order[start:end])
+            start = end
+            total = 0.0
+        total += durations[index]
+    if start < len(order):
+        batches.append(order[start:])
+
+    if rng is not None:
+        batches = [batches[i] for i in rng.permutation(len(batches))]
+    return batches
+
+
+class BucketBatchSampler(object):
+    """Batch clips of similar durations together to limit padding
+
+    Clip durations are read once from the audio file headers with
+    ``Dataset.audio_info_table``, see ``bucket_batches`` for how clips are
+    grouped. Clips whose audio is missing are left out. Iterating over the
+    sampler yields the clip ids of each batch for one epoch, and batches are
+    redrawn at every epoch.
+
+    Args:
+        dataset (core.Dataset): the dataset to sample from
+        batch_size (int): maximum number of clips per batch
+        max_padding_ratio (float): maximum fraction of a batch made of padding,
+            between 0 and 1
+        clip_ids (list or None): ids of the clips to batch. If None, all clips are used
+        shuffle (bool): If True, ties between durations are broken and batches are
+            ordered at random. If False, batches go from the shortest to the longest clips
+        seed (int or None): seed of the random number generator
+        cache (bool): If True, the clip durations are cached under ``data_home``,
+            see ``Dataset.audio_info_table``
+
+    Raises:
+        ValueError: if batch_size is not positive, max_padding_ratio is not
+            between 0 and 1, or no clip has audio
+
+    """
+
+    def __init__(
+        self,
+        dataset,
+        batch_size,
+        max_padding_ratio=0.1,
+        clip_ids=None,
+        shuffle=True,
+        seed=None,
+        cache=True,
+    ):
+        if batch_size < 1:
+            raise ValueError("batch_size must be positive, got {}".format(batch_size))
+        if not 0 <= max_padding_ratio < 1:
+            raise ValueError(
+                "max_padding_ratio must be between 0 and 1, got {}".format(
+                    max_padding_ratio
+                )
+            )
+        self.dataset = dataset
+        self.batch_size = batch_size
+        self.max_padding_ratio = max_padding_ratio
+        self.shuffle = shuffle
+        self.rng = np.random.default_rng(seed)
+
+        table = dataset.audio_info_table(cache=cache)
+        durations = dict(zip(table["clip_id"], table["duration"]))
+        if clip_ids is None:
+            clip_ids = dataset.clip_ids
+        available = [
+            clip_id for clip_id in clip_ids if not np.isnan(durations[clip_id])
+        ]
+        if not available:
+            raise ValueError("None of the clips to batch has audio")
+        self.clip_ids = np.array(available)
+        self.durations = np.array([durations[clip_id] for clip_id in available])
+
+    def __iter__(self):
+        for batch in self.batches():
+            yield self.clip_ids[batch].tolist()
+
+    def batches(self):
+        """Draw the batches of one epoch
+
+        Returns:
+            list: batches, as arrays of indexes into ``self.clip_ids``
+
+        """
+        return bucket_batches(
+            self.durations,
+            self.batch_size,
+            self.max_padding_ratio,
+            self.rng if self.shuffle else None,
+        )
+
+    def padding_fraction(self, batches):
+        """Fraction of a set of batches made of padding
+
+        Args:
+            batches (list): batches, as arrays of indexes into ``self.clip_ids``
+
+        Returns:
+            float: the padded duration over the total duration of the padded batches
+
+        """
+        return padding_fraction(self.durations, batches)
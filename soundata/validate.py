@@ -1,16 +1,37 @@
 """Utility functions for soundata"""
 
 import hashlib
+import json
 import logging
+import math
 import os
+import random
+from concurrent import futures
+
 import tqdm
 
+# size in bytes of the blocks read from disk while hashing a file
+CHUNK_SIZE = 1 << 20
+
+# name of the file in data_home recording the checksums of validated files
+MANIFEST_FILENAME = ".soundata_manifest.json"
+
+# checksum: hash every file
+# exists: only check that files exist
+# size: check that files exist and have the size recorded in the manifest
+# sample: check sizes as in "size" and hash a random subset of the files
+VALIDATION_MODES = ("checksum", "exists", "size", "sample")
 
-def md5(file_path):
+# md5 checksum of an empty file
+EMPTY_MD5 = "d41d8cd98f00b204e9800998ecf8427e"
+
+
+def md5(file_path, chunk_size=CHUNK_SIZE):
     """Get md5 hash of a file.
 
     Args:
         file_path (str): File path
+        chunk_size (int): size in bytes of the blocks read from the file
 
     Returns:
         str: md5 hash of data in file_path
@@ -18,7 +39,7 @@ def md5(file_path):
     """
     hash_md5 = hashlib.md5()
     with open(file_path, "rb") as fhandle:
-        for chunk in iter(lambda: fhandle.read(4096), b""):
+        for chunk in iter(lambda: fhandle.read(chunk_size), b""):
             hash_md5.update(chunk)
     return hash_md5.hexdigest()
 
@@ -35,12 +56,13 @@ def log_message(message, verbose=True):
         logging.info(message)
 
 
-def validate(local_path, checksum):
+def validate(local_path, checksum, chunk_size=CHUNK_SIZE):
     """Validate that a file exists and has the correct checksum
 
     Args:
         local_path (str): file path
         checksum (str): md5 checksum
+        chunk_size (int): size in bytes of the blocks read while hashing
 
     Returns:
         * bool - True if file exists
@@ -52,7 +74,7 @@ def validate(local_path, checksum):
         return False, False
 
     # validate that the checksum matches
-    if md5(local_path) != checksum:
+    if md5(local_path, chunk_size) != checksum:
         valid = False
     else:
         valid = True
@@ -60,22 +82,253 @@ def validate(local_path, checksum):
     return True, valid
 
 
-def validate_files(file_dict, data_home, verbose):
-    """Validate files
+def file_stat(local_path):
+    """Get a file's stat signature
+
+    Args:
+        local_path (str): file path
+
+    Returns:
+        list or None: [size, mtime_ns, inode] of the file, or None if the file
+        does not exist
+
+    """
+    try:
+        stat = os.stat(local_path)
+    except FileNotFoundError:
+        return None
+    return [stat.st_size, stat.st_mtime_ns, stat.st_ino]
+
+
+def size_valid(signature, checksum, manifest_entry):
+    """Check a file's size without hashing it
+
+    The file is compared against its manifest entry if it has one. Otherwise
+    only empty files, whose checksum is known, can be found to be invalid.
+
+    Args:
+        signature (list): [size, mtime_ns, inode] of the file
+        checksum (str): expected md5 checksum
+        manifest_entry (list or None): [size, mtime_ns, inode, md5] recorded for
+            the file by a previous validation
+
+    Returns:
+        bool: False if the file is known to be invalid
+
+    """
+    if manifest_entry is not None:
+        # unchanged since it was hashed
+        if manifest_entry[:3] == signature:
+            return manifest_entry[3] == checksum
+        if manifest_entry[3] == checksum:
+            return manifest_entry[0] == signature[0]
+    return signature[0] > 0 or checksum == EMPTY_MD5
+
+
+def file_signature(local_path, chunk_size=CHUNK_SIZE, manifest_entry=None):
+    """Get a file's stat signature and md5 checksum. The checksum recorded in
+    the file's manifest entry is reused if its size, mtime and inode have not
+    changed.
+
+    Args:
+        local_path (str): file path
+        chunk_size (int): size in bytes of the blocks read while hashing
+        manifest_entry (list or None): [size, mtime_ns, inode, md5] recorded for
+            the file by a previous validation
+
+    Returns:
+        list or None: [size, mtime_ns, inode, md5] of the file, or None if the
+        file does not exist
+
+    """
+    signature = file_stat(local_path)
+    if signature is None:
+        return None
+
+    if manifest_entry is not None and manifest_entry[:3] == signature:
+        return manifest_entry
+
+    return signature + [md5(local_path, chunk_size)]
+
+
+def load_manifest(data_home):
+    """Load the checksum manifest written by a previous validation
 
     Args:
-        file_dict (dict): dictionary of file information
         data_home (str): path where the data lives
+
+    Returns:
+        dict: {path: [size, mtime_ns, inode, md5]} with paths relative to
+        data_home, empty if there is no readable manifest
+
+    """
+    manifest_path = os.path.join(data_home, MANIFEST_FILENAME)
+    if not os.path.exists(manifest_path):
+        return {}
+    try:
+        with open(manifest_path, encoding="utf-8") as fhandle:
+            return json.load(fhandle)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_manifest(data_home, manifest):
+    """Write the checksum manifest to data_home. Nothing is written if data_home
+    does not exist, and a failed write (e.g. on a read-only mount) is only logged
+
+    Args:
+        data_home (str): path where the data lives
+        manifest (dict): {path: [size, mtime_ns, inode, md5]} with paths
+            relative to data_home
+
+    """
+    if not os.path.isdir(data_home):
+        return
+    manifest_path = os.path.join(data_home, MANIFEST_FILENAME)
+    try:
+        # written to a temporary file first so an interrupted write never
+        # leaves a corrupt manifest behind
+        with open(manifest_path + ".tmp", "w", encoding="utf-8") as fhandle:
+            json.dump(manifest, fhandle)
+        os.replace(manifest_path + ".tmp", manifest_path)
+    except OSError as exc:
+        logging.warning("Could not write {}: {}".format(manifest_path, exc))
+
+
+def validate_paths(
+    file_paths,
+    verbose,
+    num_workers=1,
+    chunk_size=CHUNK_SIZE,
+    manifest=None,
+    mode="checksum",
+    sample_fraction=0.1,
+    data_home=None,
+):
+    """Validate a list of files, hashing them concurrently
+
+    md5 hashing releases the GIL, so files are hashed by a pool of threads.
+
+    Args:
+        file_paths (list): list of (file_id, local_path, checksum) tuples
         verbose (bool): if True, show progress
+        num_workers (int): number of files checked concurrently
+        chunk_size (int): size in bytes of the blocks read while hashing
+        manifest (dict or None): {path: [size, mtime_ns, inode, md5]}.
+            Files whose stat signature matches their entry are not hashed again.
+            Updated in place with the files that were hashed
+        mode (str): one of VALIDATION_MODES
+        sample_fraction (float): fraction of the existing files hashed in
+            "sample" mode. At least one file is hashed
+        data_home (str or None): manifest entries are keyed by paths relative
+            to data_home, so that they still apply when the data is moved or
+            reached through a symlink. If None, they are keyed by local_path
 
     Returns:
         * dict - missing files
         * dict - files with invalid checksums
 
     """
+    if mode not in VALIDATION_MODES:
+        raise ValueError(
+            "Invalid validation mode {}. Must be one of {}.".format(
+                mode, VALIDATION_MODES
+            )
+        )
+
+    if manifest is None:
+        manifest_keys = [None] * len(file_paths)
+    elif data_home is None:
+        manifest_keys = [path for _, path, _ in file_paths]
+    else:
+        manifest_keys = [os.path.relpath(path, data_home) for _, path, _ in file_paths]
+
     missing = {}
     invalid = {}
-    for file_id, file in tqdm.tqdm(file_dict.items(), disable=not verbose):
+    with futures.ThreadPoolExecutor(max_workers=num_workers) as executor:
+        # files are stat'ed first so that only existing files are sampled
+        stats = list(executor.map(file_stat, [path for _, path, _ in file_paths]))
+        existing = [i for i, stat in enumerate(stats) if stat is not None]
+        if mode == "checksum":
+            hashed = set(existing)
+        elif mode == "sample" and existing:
+            n_hashed = min(
+                len(existing), max(1, math.ceil(sample_fraction * len(existing)))
+            )
+            hashed = set(random.sample(existing, n_hashed))
+        else:
+            hashed = set()
+
+        def check(i):
+            if i in hashed:
+                manifest_entry = (
+                    None if manifest is None else manifest.get(manifest_keys[i])
+                )
+                return file_signature(file_paths[i][1], chunk_size, manifest_entry)
+            return stats[i]
+
+        results = executor.map(check, range(len(file_paths)))
+        for (file_id, local_path, checksum), key, entry in zip(
+            file_paths,
+            manifest_keys,
+            tqdm.tqdm(results, total=len(file_paths), disable=not verbose),
+        ):
+            if entry is None:
+                if manifest is not None:
+                    manifest.pop(key, None)
+                valid = True
+            elif len(entry) == 4:
+                if manifest is not None:
+                    manifest[key] = entry
+                valid = entry[3] == checksum
+            elif mode == "exists":
+                valid = True
+            else:
+                manifest_entry = None if manifest is None else manifest.get(key)
+                valid = size_valid(entry, checksum, manifest_entry)
+
+            if entry is None:
+                if file_id not in missing.keys():
+                    missing[file_id] = []
+                missing[file_id].append(local_path)
+            elif not valid:
+                if file_id not in invalid.keys():
+                    invalid[file_id] = []
+                invalid[file_id].append(local_path)
+
+    return missing, invalid
+
+
+def validate_files(
+    file_dict,
+    data_home,
+    verbose,
+    num_workers=1,
+    chunk_size=CHUNK_SIZE,
+    manifest=None,
+    mode="checksum",
+    sample_fraction=0.1,
+):
+    """Validate files
+
+    Args:
+        file_dict (dict): dictionary of file information
+        data_home (str): path where the data lives
+        verbose (bool): if True, show progress
+        num_workers (int): number of files hashed concurrently
+        chunk_size (int): size in bytes of the blocks read while hashing
+        manifest (dict or None): checksums of previously validated files,
+            see validate_paths
+        mode (str): one of VALIDATION_MODES
+        sample_fraction (float): fraction of the files hashed in "sample" mode
+
+    Returns:
+        * dict - missing files
+        * dict - files with invalid checksums
+
+    """
+    file_paths = []
+    for file_id, file in file_dict.items():
         for clips in file.keys():
             # clipgroup case
             if clips == "clips":
@@ -86,59 +339,90 @@ def validate_files(file_dict, data_home, verbose):
                 checksum = file[clips][1]
                 if filepath is not None:
                     local_path = os.path.join(data_home, filepath)
-                    exists, valid = validate(local_path, checksum)
-                    if not exists:
-                        if file_id not in missing.keys():
-                            missing[file_id] = []
-                        missing[file_id].append(local_path)
-                    elif not valid:
-                        if file_id not in invalid.keys():
-                            invalid[file_id] = []
-                        invalid[file_id].append(local_path)
-
-    return missing, invalid
-
-
-def validate_metadata(file_dict, data_home, verbose):
+                    file_paths.append((file_id, local_path, checksum))
+
+    return validate_paths(
+        file_paths,
+        verbose,
+        num_workers,
+        chunk_size,
+        manifest,
+        mode,
+        sample_fraction,
+        data_home,
+    )
+
+
+def validate_metadata(
+    file_dict,
+    data_home,
+    verbose,
+    num_workers=1,
+    chunk_size=CHUNK_SIZE,
+    manifest=None,
+    mode="checksum",
+    sample_fraction=0.1,
+):
     """Validate files
 
     Args:
         file_dict (dict): dictionary of file information
         data_home (str): path where the data lives
         verbose (bool): if True, show progress
+        num_workers (int): number of files hashed concurrently
+        chunk_size (int): size in bytes of the blocks read while hashing
+        manifest (dict or None): checksums of previously validated files,
+            see validate_paths
+        mode (str): one of VALIDATION_MODES
+        sample_fraction (float): fraction of the files hashed in "sample" mode
 
     Returns:
         * dict - missing files
         * dict - files with invalid checksums
 
     """
-    missing = {}
-    invalid = {}
-    for file_id, file in tqdm.tqdm(file_dict.items(), disable=not verbose):
+    file_paths = []
+    for file_id, file in file_dict.items():
         filepath = file[0]
         checksum = file[1]
         if filepath is not None:
             local_path = os.path.join(data_home, filepath)
-            exists, valid = validate(local_path, checksum)
-            if not exists:
-                if file_id not in missing.keys():
-                    missing[file_id] = []
-                missing[file_id].append(local_path)
-            elif not valid:
-                if file_id not in invalid.keys():
-                    invalid[file_id] = []
-                invalid[file_id].append(local_path)
-
-    return missing, invalid
-
-
-def validate_index(dataset_index, data_home, verbose=True):
+            file_paths.append((file_id, local_path, checksum))
+
+    return validate_paths(
+        file_paths,
+        verbose,
+        num_workers,
+        chunk_size,
+        manifest,
+        mode,
+        sample_fraction,
+        data_home,
+    )
+
+
+def validate_index(
+    dataset_index,
+    data_home,
+    verbose=True,
+    num_workers=1,
+    chunk_size=CHUNK_SIZE,
+    manifest=None,
+    mode="checksum",
+    sample_fraction=0.1,
+):
     """Validate files in a dataset's index
 
     Args:
         dataset_index (list): dataset indices
         data_home (str): Local home path that the dataset is being stored
         verbose (bool): if true, prints validation status while running
+        num_workers (int): number of files hashed concurrently
+        chunk_size (int): size in bytes of the blocks read while hashing
+        manifest (dict or None): checksums of previously validated files,
+            see validate_paths
+        mode (str): one of VALIDATION_MODES
+        sample_fraction (float): fraction of the files hashed in "sample" mode
 
     Returns:
         * dict - file paths that are in the index but missing locally
@@ -151,21 +435,42 @@ def validate_index(dataset_index, data_home, verbose=True):
     # check index
     if "metadata" in dataset_index and dataset_index["metadata"] is not None:
         missing_metadata, invalid_metadata = validate_metadata(
-            dataset_index["metadata"], data_home, verbose
+            dataset_index["metadata"],
+            data_home,
+            verbose,
+            num_workers,
+            chunk_size,
+            manifest,
+            mode,
+            sample_fraction,
         )
         missing_files["metadata"] = missing_metadata
         invalid_checksums["metadata"] = invalid_metadata
 
     if "clips" in dataset_index and dataset_index["clips"] is not None:
         missing_clips, invalid_clips = validate_files(
-            dataset_index["clips"], data_home, verbose
+            dataset_index["clips"],
+            data_home,
+            verbose,
+            num_workers,
+            chunk_size,
+            manifest,
+            mode,
+            sample_fraction,
         )
         missing_files["clips"] = missing_clips
         invalid_checksums["clips"] = invalid_clips
 
     if "clipgroups" in dataset_index and dataset_index["clipgroups"] is not None:
         missing_clipgroups, invalid_clipgroups = validate_files(
-            dataset_index["clipgroups"], data_home, verbose
+            dataset_index["clipgroups"],
+            data_home,
+            verbose,
+            num_workers,
+            chunk_size,
+            manifest,
+            mode,
+            sample_fraction,
         )
         missing_files["clipgroups"] = missing_clipgroups
         invalid_checksums["clipgroups"] = invalid_clipgroups
@@ -173,16 +478,36 @@ def validate_index(dataset_index, data_home, verbose=True):
     return missing_files, invalid_checksums
 
 
-def validator(dataset_index, data_home, verbose=True):
+def validator(
+    dataset_index,
+    data_home,
+    verbose=True,
+    num_workers=1,
+    chunk_size=CHUNK_SIZE,
+    full=False,
+    mode="checksum",
+    sample_fraction=0.1,
+):
     """Checks the existence and validity of files stored locally with
     respect to the paths and file checksums stored in the reference index.
     Logs invalid checksums and missing files.
 
+    The checksums of validated files are recorded in a manifest in data_home, and
+    later runs only hash files whose size, mtime or inode changed since.
+
     Args:
         dataset_index (list): dataset indices
         data_home (str): Local home path that the dataset is being stored
         verbose (bool): if True (default), prints missing and invalid files
             to stdout. Otherwise, this function is equivalent to validate_index.
+        num_workers (int): number of files hashed concurrently
+        chunk_size (int): size in bytes of the blocks read while hashing
+        full (bool): if True, ignore the manifest and hash every file
+        mode (str): one of VALIDATION_MODES. "exists" and "size" only stat the
+            files, "sample" also hashes a random subset of them. Files which are
+            not hashed are not reported in invalid_checksums unless their size is
+            known to be wrong
+        sample_fraction (float): fraction of the files hashed in "sample" mode
 
     Returns:
         missing_files (list): List of file paths that are in the dataset index
@@ -192,7 +517,18 @@ def validator(dataset_index, data_home, verbose=True):
             checksum.
 
     """
-    missing_files, invalid_checksums = validate_index(dataset_index, data_home, verbose)
+    manifest = {} if full else load_manifest(data_home)
+    missing_files, invalid_checksums = validate_index(
+        dataset_index,
+        data_home,
+        verbose,
+        num_workers,
+        chunk_size,
+        manifest,
+        mode,
+        sample_fraction,
+    )
+    save_manifest(data_home, manifest)
 
     # print path of any missing files
     has_any_missing_file = False
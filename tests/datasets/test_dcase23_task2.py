@@ -24,6 +24,8 @@ def test_clip():
     }
 
     expected_property_types = {
+        "audio_info": tuple,
+        "duration": float,
         "file_name": str,
         "d1p": str,
         "d1v": str,
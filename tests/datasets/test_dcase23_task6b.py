@@ -25,6 +25,8 @@ def test_clip():
     }
 
     expected_property_types = {
+        "audio_info": tuple,
+        "duration": float,
         "audio": tuple,
         "file_name": str,
         "keywords": str,
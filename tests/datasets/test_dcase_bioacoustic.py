@@ -28,6 +28,8 @@ def test_clip():
     }
 
     expected_property_types = {
+        "audio_info": tuple,
+        "duration": float,
         "split": str,
         "subdataset": str,
         "audio": tuple,
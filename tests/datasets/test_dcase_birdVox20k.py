@@ -25,6 +25,8 @@ def test_clip():
     }
 
     expected_property_types = {
+        "audio_info": tuple,
+        "duration": float,
         "item_id": str,
         "dataset_id": str,
         "has_bird": str,
@@ -23,6 +23,8 @@ def test_clip():
     }
 
     expected_property_types = {
+        "audio_info": tuple,
+        "duration": float,
         "audio": tuple,
         "tags": annotations.Tags,
         "location": str,
@@ -46,6 +48,16 @@ def test_load_audio():
     assert audio.shape[0] == 25  # check audio is 25ch (HOA 4th order)
     assert audio.shape[1] == 48000 * 1.0  # Check audio duration is as expected
 
+    # channel selection
+    audio_w, sr = eigenscape.load_audio(audio_path, channels=[0])
+    assert audio_w.shape == (48000,)
+    assert np.array_equal(audio_w, audio[0])
+    audio_pair, sr = eigenscape.load_audio(audio_path, channels=[1, 3])
+    assert audio_pair.shape == (2, 48000)
+    assert np.array_equal(audio_pair, audio[[1, 3]])
+    audio_segment, sr = clip.audio_segment(0.5, channels=[0, 1])
+    assert np.array_equal(audio_segment, audio[:2, 48000 // 2 :])
+
 
 def test_load_tags():
     # dataset
@@ -24,6 +24,8 @@ def test_clip():
     }
 
     expected_property_types = {
+        "audio_info": tuple,
+        "duration": float,
         "audio": tuple,
         "tags": annotations.Tags,
         "location": str,
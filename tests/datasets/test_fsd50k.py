@@ -5,6 +5,7 @@ from tests.test_utils import run_clip_tests
 from soundata import annotations, download_utils
 from soundata.datasets import fsd50k
 
+import json
 import os
 import shutil
 import pytest
@@ -25,6 +26,8 @@ def test_clip():
     }
 
     expected_property_types = {
+        "audio_info": tuple,
+        "duration": float,
         "audio": tuple,
         "tags": annotations.Tags,
         "mids": annotations.Tags,
@@ -205,7 +208,7 @@ def test_dev_metadata():
         "/m/09x0r",
         "/m/09l8g",
     ]
-    assert clip_ground_truth["split"] is "test"
+    assert clip_ground_truth["split"] == "test"
 
     clip_info = clip_metadata[default_clipid]["clip_info"]
     assert type(clip_info) is dict
@@ -220,6 +223,35 @@ def test_dev_metadata():
     assert clip_pp_pnp == {"/m/03cczk": [0.5, 0.5]}
 
 
+def test_metadata_cache(tmp_path, mocker):
+    data_home = str(tmp_path / "fsd50k")
+    shutil.copytree(TEST_DATA_HOME, data_home)
+    cache_path = os.path.join(data_home, fsd50k.METADATA_CACHE_FILENAME)
+    mocker.patch.object(fsd50k.Dataset, "cache_metadata", True)
+
+    # the cache is opt-in
+    dataset = fsd50k.Dataset(data_home, version="test")
+    dataset.cache_metadata = False
+    metadata = dataset._metadata
+    assert not os.path.exists(cache_path)
+
+    assert fsd50k.Dataset(data_home, version="test")._metadata == metadata
+    assert os.path.exists(cache_path)
+    with open(cache_path) as fhandle:
+        assert json.load(fhandle)["data"] == metadata
+
+    # later instances load the joined metadata from the cache
+    probe = mocker.spy(fsd50k, "load_ground_truth")
+    assert fsd50k.Dataset(data_home, version="test")._metadata == metadata
+    assert probe.call_count == 0
+    assert fsd50k.Dataset(data_home, version="test")._join_metadata() == metadata
+
+    # and join it again when a source file changes
+    os.utime(os.path.join(data_home, "FSD50K.ground_truth", "dev.csv"), ns=(0, 0))
+    assert fsd50k.Dataset(data_home, version="test")._metadata == metadata
+    assert probe.call_count == 8
+
+
 def test_load_vocabulary():
     dataset = fsd50k.Dataset(TEST_DATA_HOME, version="test")
 
@@ -293,6 +325,39 @@ def test_vocabularies():
     assert audioset_to_fsd50k["/m/02sgy"] == "Electric_guitar"
 
 
+def test_vocabulary():
+    dataset = fsd50k.Dataset(TEST_DATA_HOME, version="test")
+    vocabulary = dataset.vocabulary
+    assert dataset.vocabulary is vocabulary
+    assert dataset.fsd50k_to_audioset is dataset.fsd50k_to_audioset
+
+    assert len(vocabulary) == 2
+    assert vocabulary.ids.tolist() == [53, 69]
+    assert vocabulary.labels.tolist() == ["Crushing", "Electric_guitar"]
+    assert vocabulary.mids.tolist() == ["/m/07plct2", "/m/02sgy"]
+    assert vocabulary.label_to_mid == dataset.fsd50k_to_audioset
+    assert vocabulary.mid_to_label == dataset.audioset_to_fsd50k
+
+    assert vocabulary.index(["Electric_guitar", "/m/07plct2"]).tolist() == [1, 0]
+    assert np.array_equal(vocabulary.encode(["Electric_guitar"]), [0.0, 1.0])
+    assert np.array_equal(
+        vocabulary.encode(["/m/02sgy", "Crushing"]), np.ones(2, dtype=np.float32)
+    )
+    assert vocabulary.decode([0.7, 0.2]) == ["Crushing"]
+    with pytest.raises(KeyError):
+        vocabulary.encode(["Chatter"])
+
+    # the vocabulary is immutable
+    with pytest.raises(ValueError):
+        vocabulary.labels[0] = "Chatter"
+    with pytest.raises(TypeError):
+        vocabulary.label_to_index["Chatter"] = 2
+
+    collection_vocabulary = dataset.collection_vocabulary
+    assert collection_vocabulary["dev"].labels.tolist() == ["Electric_guitar"]
+    assert collection_vocabulary["eval"].label_to_mid["Chatter"] == "/m/07rkbfh"
+
+
 def test_collection_vocabulary():
     dataset = fsd50k.Dataset(TEST_DATA_HOME, version="test")
 
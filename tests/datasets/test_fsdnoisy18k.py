@@ -23,6 +23,8 @@ def test_clip():
     }
 
     expected_property_types = {
+        "audio_info": tuple,
+        "duration": float,
         "audio": tuple,
         "tags": annotations.Tags,
         "split": str,
@@ -44,6 +46,8 @@ def test_clip():
     }
 
     expected_property_types_test = {
+        "audio_info": tuple,
+        "duration": float,
         "audio": tuple,
         "tags": annotations.Tags,
         "split": str,
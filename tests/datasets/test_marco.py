@@ -27,7 +27,11 @@ def test_clip():
         "microphone_info": ["OCT3D", "2", "FR"],
     }
 
-    expected_property_types = {"audio": tuple}
+    expected_property_types = {
+        "audio": tuple,
+        "audio_info": tuple,
+        "duration": float,
+    }
 
     run_clip_tests(clip, expected_attributes, expected_property_types)
 
@@ -36,6 +36,8 @@ def test_clip():
     }
 
     expected_property_types = {
+        "audio_info": tuple,
+        "duration": float,
         "audio": np.ndarray,
         "events": annotations.MultiAnnotator,
         "audio_path": str,
@@ -61,6 +63,18 @@ def test_load_audio():
     assert audio.shape[0] == 44100  # Check audio duration is as expected
 
 
+def test_audio_segment():
+    default_clipid = "[b827ebf3744c][2020-08-19T22-46-04Z][manual][---][4edbade2d41d5f80e324ee4f10d401c0][]-135"
+    dataset = singapura.Dataset(TEST_DATA_HOME, version="test")
+    clip = dataset.clip(default_clipid)
+    segment = clip.audio_segment(0.25, 0.75)
+    assert isinstance(segment, tuple)
+    audio, sr = segment
+    assert sr == 44100
+    assert type(audio) is np.ndarray
+    assert audio.shape == (22050,)
+
+
 def test_to_jams():
     default_clipid = "[b827ebf3744c][2020-08-19T22-46-04Z][manual][---][4edbade2d41d5f80e324ee4f10d401c0][]-135"
     dataset = singapura.Dataset(TEST_DATA_HOME, version="test")
@@ -1,4 +1,6 @@
+import io
 import os
+import time
 import numpy as np
 import pytest
 
@@ -31,6 +33,8 @@ def test_clip():
     }
 
     expected_property_types = {
+        "audio_info": tuple,
+        "duration": float,
         "audio": tuple,
         "spatial_events": annotations.SpatialEvents,
     }
@@ -49,6 +53,16 @@ def test_load_audio():
     assert audio.shape[0] == 4  # check audio is loaded as 4 channels
     assert audio.shape[1] == 24000  # check audio duration in samples is as expected
 
+    # channel selection
+    audio_w, sr = starss2022.load_audio(audio_path, channels=[0])
+    assert audio_w.shape == (24000,)
+    assert np.array_equal(audio_w, audio[0])
+    audio_pair, sr = starss2022.load_audio(audio_path, channels=[1, 3])
+    assert audio_pair.shape == (2, 24000)
+    assert np.array_equal(audio_pair, audio[[1, 3]])
+    audio_segment, sr = clip.audio_segment(0.5, channels=[0, 1])
+    assert np.array_equal(audio_segment, audio[:2, 24000 // 2 :])
+
 
 def test_load_SpatialEvents():
     dataset = starss2022.Dataset(TEST_DATA_HOME, version="test")
@@ -125,6 +139,72 @@ def test_load_SpatialEvents():
         annotations.validate_locations(np.array([[90, 181, None], [2, 3, None]]))
 
 
+def _synthetic_events_csv(n_frames=600, n_sources=12, seed=0):
+    # one minute of frames with many overlapping sources, which pause and move
+    rng = np.random.default_rng(seed)
+    lines = []
+    for frame in range(n_frames):
+        for source in range(n_sources):
+            if rng.random() < 0.3:
+                continue
+            label, event_num = source % 5, source // 5
+            if source % 3:
+                azimuth, elevation = source * 10 - 90, source - 20
+            else:
+                azimuth, elevation = (frame + source) % 360 - 180, frame % 90 - 45
+            lines.append(
+                "{},{},{},{},{}".format(frame, label, event_num, azimuth, elevation)
+            )
+    return "\n".join(lines) + "\n"
+
+
+def _group_events(csv_text, dt):
+    # row by row reference grouping of continuous frames of each label+event_num
+    events = {}
+    for line in csv_text.strip().split("\n"):
+        frame, label, event_num, azimuth, elevation = [int(v) for v in line.split(",")]
+        instances = events.setdefault((label, event_num), [])
+        if instances and frame == instances[-1][-1][0] + 1:
+            instances[-1].append((frame, azimuth, elevation))
+        else:
+            instances.append([(frame, azimuth, elevation)])
+    return events
+
+
+def test_load_SpatialEvents_many_sources():
+    csv_text = _synthetic_events_csv()
+    starss_annotations = starss2022.load_spatialevents(io.StringIO(csv_text))
+    events = _group_events(csv_text, 0.1)
+
+    assert starss_annotations.labels == [str(label) for label, _ in events]
+    assert starss_annotations.clip_number_index == [str(num) for _, num in events]
+    for i, instances in enumerate(events.values()):
+        assert len(starss_annotations.intervals[i]) == len(instances)
+        for j, instance in enumerate(instances):
+            frames, azimuths, elevations = [np.array(v) for v in zip(*instance)]
+            assert np.array_equal(
+                starss_annotations.intervals[i][j],
+                np.round(np.array([frames[0], frames[-1]]) * 0.1, decimals=1),
+            )
+            if np.all(azimuths == azimuths[0]) and np.all(elevations == elevations[0]):
+                azimuths, elevations = azimuths[:1], elevations[:1]
+            assert np.array_equal(starss_annotations.azimuths[i][j], azimuths)
+            assert np.array_equal(starss_annotations.elevations[i][j], elevations)
+            assert list(starss_annotations.distances[i][j]) == [None] * len(azimuths)
+
+
+def test_load_SpatialEvents_benchmark():
+    # parsing rate of a dense one-minute annotation file with many sources
+    csv_text = _synthetic_events_csv()
+    n_runs = 5
+    start = time.perf_counter()
+    for _ in range(n_runs):
+        starss2022.load_spatialevents(io.StringIO(csv_text))
+    rate = n_runs / (time.perf_counter() - start)
+    print("load_spatialevents: {:.1f} files/sec".format(rate))
+    assert rate > 0
+
+
 def test_to_jams():
     default_clipid = "foa_dev/dev-train-sony/fold3_room21_mix001"
     dataset = starss2022.Dataset(TEST_DATA_HOME, version="test")
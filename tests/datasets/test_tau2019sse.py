@@ -31,6 +31,8 @@ def test_clip():
     }
 
     expected_property_types = {
+        "audio_info": tuple,
+        "duration": float,
         "audio": tuple,
         "spatial_events": tau2019sse.TAU2019_SpatialEvents,
     }
@@ -49,6 +51,16 @@ def test_load_audio():
     assert audio.shape[0] == 4  # Check audio is 4 chanels
     assert audio.shape[1] == 48000  # Check audio duration in samples is as expected
 
+    # channel selection
+    audio_w, sr = tau2019sse.load_audio(audio_path, channels=[0])
+    assert audio_w.shape == (48000,)
+    assert np.array_equal(audio_w, audio[0])
+    audio_pair, sr = tau2019sse.load_audio(audio_path, channels=[1, 3])
+    assert audio_pair.shape == (2, 48000)
+    assert np.array_equal(audio_pair, audio[[1, 3]])
+    audio_segment, sr = clip.audio_segment(0.5, channels=[0, 1])
+    assert np.array_equal(audio_segment, audio[:2, 48000 // 2 :])
+
 
 def test_to_jams():
     # Note: original file  tsrimmed to 1 sec
@@ -31,6 +31,8 @@ def test_clip():
     }
 
     expected_property_types = {
+        "audio_info": tuple,
+        "duration": float,
         "audio": tuple,
         "spatial_events": annotations.SpatialEvents,
     }
@@ -49,6 +51,16 @@ def test_load_audio():
     assert audio.shape[0] == 4  # check audio is loaded as 4 channels
     assert audio.shape[1] == 24000  # check audio duration in samples is as expected
 
+    # channel selection
+    audio_w, sr = tau2020sse_nigens.load_audio(audio_path, channels=[0])
+    assert audio_w.shape == (24000,)
+    assert np.array_equal(audio_w, audio[0])
+    audio_pair, sr = tau2020sse_nigens.load_audio(audio_path, channels=[1, 3])
+    assert audio_pair.shape == (2, 24000)
+    assert np.array_equal(audio_pair, audio[[1, 3]])
+    audio_segment, sr = clip.audio_segment(0.5, channels=[0, 1])
+    assert np.array_equal(audio_segment, audio[:2, 24000 // 2 :])
+
 
 def test_load_SpatialEvents():
     dataset = tau2020sse_nigens.Dataset(TEST_DATA_HOME, version="test")
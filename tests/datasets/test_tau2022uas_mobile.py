@@ -25,6 +25,8 @@ def test_clip():
     }
 
     expected_property_types = {
+        "audio_info": tuple,
+        "duration": float,
         "split": str,
         "audio": tuple,
         "tags": annotations.Tags,
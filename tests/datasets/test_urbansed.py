@@ -32,6 +32,8 @@ def test_clip():
     }
 
     expected_property_types = {
+        "audio_info": tuple,
+        "duration": float,
         "split": str,
         "audio": tuple,
         "events": annotations.Events,
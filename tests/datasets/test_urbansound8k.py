@@ -25,6 +25,8 @@ def test_clip():
     }
 
     expected_property_types = {
+        "audio_info": tuple,
+        "duration": float,
         "slice_file_name": str,
         "freesound_id": str,
         "freesound_start_time": float,
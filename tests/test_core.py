@@ -1,9 +1,17 @@
 import pytest
+import asyncio
+import json
+import multiprocessing
 import os
+import pickle
+import shutil
+import threading
+import time
 import numpy as np
 
 import soundata
 from soundata import core
+from soundata.datasets import esc50, fsd50k
 from tests.test_utils import DEFAULT_DATA_HOME
 from unittest.mock import Mock, patch
 
@@ -36,6 +44,12 @@ def test_clip():
     with pytest.raises(NotImplementedError):
         clip.to_jams()
 
+    with pytest.raises(NotImplementedError):
+        clip.audio_segment(0.0, 1.0)
+
+    assert clip.audio_info is None
+    assert clip.duration is None
+
     path_good = clip.get_path("annotation")
     assert path_good == os.path.normpath("tests/resources/sound_datasets/asdf/asdd")
     path_none = clip.get_path("audio")
@@ -104,6 +118,10 @@ def test_clip_repr():
     expected2 = """c={1: 'a', 'b': 2},\n  e=None,\n  """
     expected3 = """long="...{}",\n  """.format("b" * 50 + "c" * 50)
     expected4 = (
+        """audio_info: The clip's audio file information, read from the file header only\n"""
+        """            * io.AudioInfo - sample rate, frames, channels, subtype and duration of the audio file,\n  """
+        """duration: The clip's duration in seconds, read from the audio file header only\n"""
+        """            * float - duration in seconds,\n  """
         """f: The proper docstring.\n                * str - yay this is correct,\n)"""
     )
 
@@ -188,6 +206,324 @@ def test_dataset():
     print(dataset)  # test that repr doesn't fail
 
 
+def test_dataset_audio_info_table(tmp_path):
+    data_home = str(tmp_path / "urbansound8k")
+    shutil.copytree("tests/resources/sound_datasets/urbansound8k", data_home)
+    dataset = soundata.initialize("urbansound8k", data_home=data_home, version="test")
+
+    table = dataset.audio_info_table()
+    assert list(table["clip_id"]) == dataset.clip_ids
+    clip = dataset.clip(dataset.clip_ids[0])
+    assert table["sample_rate"][0] == clip.audio_info.sample_rate
+    assert table["frames"][0] == clip.audio_info.frames
+    assert table["channels"][0] == clip.audio_info.channels
+    assert table["duration"][0] == clip.duration
+    assert os.path.exists(
+        os.path.join(data_home, "urbansound8k_index_1.0_sample_audio_info.npz")
+    )
+
+    no_cache_table = dataset.audio_info_table(cache=False)
+    assert np.array_equal(no_cache_table["frames"], table["frames"])
+
+
+def test_sqlite_index(tmp_path):
+    dataset = soundata.initialize("singapura", version="test")
+    sqlite_path = core.convert_index(
+        dataset.index_path, str(tmp_path / "singapura_index.sqlite")
+    )
+    sqlite_dataset = soundata.initialize("singapura", version="test")
+    sqlite_dataset.index_path = sqlite_path
+
+    index = sqlite_dataset._index
+    assert isinstance(index, core.SqliteIndex)
+    assert index["version"] == dataset._index["version"]
+    assert index["metadata"] == dataset._index["metadata"]
+    assert "clipgroups" not in index
+    assert index.get("clipgroups") is None
+    assert sorted(index) == sorted(dataset._index)
+    assert len(index["clips"]) == len(dataset._index["clips"])
+    assert dict(index["clips"]) == dataset._index["clips"]
+
+    assert sqlite_dataset.clip_ids == dataset.clip_ids
+    clip_id = dataset.clip_ids[-1]
+    assert sqlite_dataset.clip(clip_id).audio_path == dataset.clip(clip_id).audio_path
+    with pytest.raises(ValueError):
+        sqlite_dataset.clip("not_a_clip")
+
+    # the index can be sent to other processes, e.g. DataLoader workers
+    unpickled = pickle.loads(pickle.dumps(index))
+    assert unpickled["clips"][clip_id] == dataset._index["clips"][clip_id]
+
+    assert sqlite_dataset.validate(verbose=False) == dataset.validate(verbose=False)
+
+    # loaders which build their metadata from the index read it through _index
+    for dataset_name in ["marco", "starss2022", "tau2019sse"]:
+        data_home = os.path.join("tests/resources/sound_datasets", dataset_name)
+        dataset = soundata.initialize(dataset_name, data_home, version="test")
+        sqlite_dataset = soundata.initialize(dataset_name, data_home, version="test")
+        sqlite_dataset.index_path = core.convert_index(
+            dataset.index_path, str(tmp_path / (dataset_name + ".sqlite"))
+        )
+        assert dict(sqlite_dataset._metadata) == dataset._metadata
+        clip_id = dataset.clip_ids[0]
+        assert (
+            sqlite_dataset.clip(clip_id)._clip_metadata
+            == dataset.clip(clip_id)._clip_metadata
+        )
+
+
+def test_load_index_sqlite_missing(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        core.load_index(str(tmp_path / "missing.sqlite"))
+
+
+SHARED_DATASET = None
+
+
+def _shared_clip_category(clip_id):
+    return SHARED_DATASET.clip(clip_id).category
+
+
+@pytest.mark.skipif(
+    not os.path.isdir(core.SHARED_MEMORY_DIR)
+    or "fork" not in multiprocessing.get_all_start_methods(),
+    reason="needs /dev/shm and forked worker processes",
+)
+def test_dataset_share():
+    global SHARED_DATASET
+    data_home = "tests/resources/sound_datasets/esc50"
+    dataset = soundata.initialize("esc50", data_home=data_home, version="test")
+    expected = {clip_id: dataset.clip(clip_id).category for clip_id in dataset.clip_ids}
+    metadata = dataset._metadata
+
+    name = dataset.share()
+    index_path = core.shared_index_path(name)
+    assert os.path.exists(index_path)
+    assert os.stat(index_path).st_mode & 0o077 == 0
+    assert isinstance(dataset._index, core.SqliteIndex)
+    assert isinstance(dataset._metadata, core.SqliteIndexSection)
+    assert dict(dataset._metadata) == metadata
+    assert dataset._metadata
+    assert "_metadata" not in dataset._index
+    # metadata is stored as JSON, which can't run code when it is read
+    ((value,),) = dataset._index.execute(
+        "SELECT value FROM entries WHERE section = ? LIMIT 1",
+        (core.SQLITE_METADATA_SECTION,),
+    )
+    assert isinstance(json.loads(value), dict)
+    assert {
+        clip_id: dataset.clip(clip_id).category for clip_id in dataset.clip_ids
+    } == expected
+
+    # forked workers read the shared file
+    SHARED_DATASET = dataset
+    with multiprocessing.get_context("fork").Pool(2) as pool:
+        categories = pool.map(_shared_clip_category, dataset.clip_ids)
+    SHARED_DATASET = None
+    assert categories == [expected[clip_id] for clip_id in dataset.clip_ids]
+
+    # other processes attach to it by name
+    attached = soundata.initialize("esc50", data_home="not/a/path", version="test")
+    attached.attach(name)
+    assert dict(attached._metadata) == metadata
+    with pytest.raises(FileNotFoundError):
+        attached.attach("not_a_shared_index")
+
+    core.remove_shared_index(index_path, os.getpid())
+    assert not os.path.exists(index_path)
+
+
+class IndexTypeDataset(esc50.Dataset):
+    def index_types(self, clip_id):
+        return type(self._index).__name__, type(self._metadata).__name__
+
+
+@pytest.mark.skipif(
+    not os.path.isdir(core.SHARED_MEMORY_DIR),
+    reason="needs /dev/shm",
+)
+def test_worker_dataset_settings(tmp_path):
+    data_home = "tests/resources/sound_datasets/esc50"
+    clip_ids = IndexTypeDataset(data_home, version="test").clip_ids
+
+    # workers started after share() attach to the shared index
+    dataset = IndexTypeDataset(data_home, version="test")
+    name = dataset.share()
+    results = list(dataset._map_clips("index_types", clip_ids, 2, "process", True, 4))
+    assert results == [("SqliteIndex", "SqliteIndexSection")] * len(clip_ids)
+    core.remove_shared_index(core.shared_index_path(name), os.getpid())
+
+    # and use the parent's index_path
+    dataset = IndexTypeDataset(data_home, version="test")
+    dataset.index_path = core.convert_index(
+        dataset.index_path, str(tmp_path / "esc50.sqlite")
+    )
+    results = list(dataset._map_clips("index_types", clip_ids, 2, "process", True, 4))
+    assert results == [("SqliteIndex", "dict")] * len(clip_ids)
+
+    settings = fsd50k.Dataset("not/a/path", version="test")._worker_settings()
+    assert settings["cache_metadata"] is False
+
+
+@pytest.mark.parametrize("backend", ["thread", "process"])
+def test_load_audio_batch(backend):
+    dataset = soundata.initialize(
+        "fsd50k", data_home="tests/resources/sound_datasets/fsd50k", version="test"
+    )
+    clip_ids = dataset.clip_ids[::-1]
+    batch = dataset.load_audio_batch(clip_ids, num_workers=2, backend=backend)
+    assert list(batch) == clip_ids
+    for clip_id, (audio, sample_rate) in batch.items():
+        expected_audio, expected_sample_rate = dataset.clip(clip_id).audio
+        assert sample_rate == expected_sample_rate
+        assert np.array_equal(audio, expected_audio)
+
+    unordered = dataset.load_audio_batch(
+        clip_ids, num_workers=2, backend=backend, ordered=False
+    )
+    assert sorted(unordered) == sorted(clip_ids)
+
+
+def test_iter_audio():
+    dataset = soundata.initialize(
+        "fsd50k", data_home="tests/resources/sound_datasets/fsd50k", version="test"
+    )
+    loaded = [clip_id for clip_id, _, _ in dataset.iter_audio(num_workers=1)]
+    assert loaded == dataset.clip_ids
+
+    # stopping early does not wait for the remaining clips
+    audio_iterator = dataset.iter_audio(num_workers=1)
+    clip_id, audio, sample_rate = next(audio_iterator)
+    assert clip_id == dataset.clip_ids[0]
+    assert isinstance(audio, np.ndarray)
+    audio_iterator.close()
+
+    with pytest.raises(ValueError):
+        next(dataset.iter_audio(backend="gpu"))
+
+
+@pytest.mark.parametrize("backend", ["thread", "process"])
+def test_stream(backend):
+    dataset = soundata.initialize(
+        "fsd50k", data_home="tests/resources/sound_datasets/fsd50k", version="test"
+    )
+    records = list(
+        dataset.stream(
+            fields=("audio", "tags"), prefetch=2, num_workers=2, backend=backend
+        )
+    )
+    assert [record["clip_id"] for record in records] == dataset.clip_ids
+    for record in records:
+        clip = dataset.clip(record["clip_id"])
+        assert sorted(record) == ["audio", "clip_id", "tags"]
+        assert np.array_equal(record["audio"][0], clip.audio[0])
+        assert record["tags"].labels == clip.tags.labels
+
+    # exceptions raised while loading a clip are raised by the iterator
+    with pytest.raises(ValueError):
+        list(dataset.stream(clip_ids=["not_a_clip"], backend=backend))
+
+    with pytest.raises(ValueError):
+        dataset.stream(prefetch=0)
+
+
+def test_stream_prefetch(mocker):
+    dataset = soundata.initialize(
+        "fsd50k", data_home="tests/resources/sound_datasets/fsd50k", version="test"
+    )
+    load = mocker.spy(dataset, "_load_clip_fields")
+    records = dataset.stream(fields=("audio",), prefetch=1, num_workers=2)
+    assert next(records)["clip_id"] == dataset.clip_ids[0]
+    # workers do not load clips ahead of the consumer beyond the prefetch size
+    time.sleep(0.2)
+    assert load.call_count == 1
+    assert [record["clip_id"] for record in records] == dataset.clip_ids[1:]
+    assert load.call_count == len(dataset.clip_ids)
+
+
+def test_clip_aaudio():
+    dataset = soundata.initialize(
+        "fsd50k", data_home="tests/resources/sound_datasets/fsd50k", version="test"
+    )
+    clip = dataset.clip(dataset.clip_ids[0])
+    audio, sample_rate = asyncio.run(clip.aaudio())
+    assert sample_rate == clip.audio[1]
+    assert np.array_equal(audio, clip.audio[0])
+    tags = asyncio.run(clip.aload("tags"))
+    assert tags.labels == clip.tags.labels
+
+
+def test_dataset_aload_clip(mocker):
+    dataset = soundata.initialize(
+        "fsd50k", data_home="tests/resources/sound_datasets/fsd50k", version="test"
+    )
+    dataset.async_max_concurrency = 2
+    running = []
+    max_running = []
+    lock = threading.Lock()
+    load_clip_fields = dataset._load_clip_fields
+
+    def slow_load_clip_fields(clip_id, fields):
+        with lock:
+            running.append(clip_id)
+            max_running.append(len(running))
+        time.sleep(0.05)
+        with lock:
+            running.remove(clip_id)
+        return load_clip_fields(clip_id, fields)
+
+    mocker.patch.object(dataset, "_load_clip_fields", slow_load_clip_fields)
+
+    async def load_all():
+        return await asyncio.gather(
+            *[dataset.aload_clip(clip_id) for clip_id in dataset.clip_ids * 4]
+        )
+
+    records = asyncio.run(load_all())
+    assert [record["clip_id"] for record in records] == dataset.clip_ids * 4
+    # at most async_max_concurrency loads run at once
+    assert max(max_running) == 2
+
+
+def test_dataset_astream():
+    dataset = soundata.initialize(
+        "fsd50k", data_home="tests/resources/sound_datasets/fsd50k", version="test"
+    )
+
+    async def collect(**kwargs):
+        return [record async for record in dataset.astream(**kwargs)]
+
+    records = asyncio.run(collect(fields=("audio", "tags"), prefetch=2))
+    assert [record["clip_id"] for record in records] == dataset.clip_ids
+    assert np.array_equal(
+        records[0]["audio"][0], dataset.clip(records[0]["clip_id"]).audio[0]
+    )
+    unordered = asyncio.run(collect(ordered=False))
+    assert sorted(record["clip_id"] for record in unordered) == sorted(dataset.clip_ids)
+
+    with pytest.raises(ValueError):
+        asyncio.run(collect(clip_ids=["not_a_clip"]))
+    with pytest.raises(ValueError):
+        asyncio.run(collect(prefetch=0))
+
+    async def close_early():
+        records = dataset.astream(prefetch=3)
+        record = await records.__anext__()
+        await records.aclose()
+        return record
+
+    assert asyncio.run(close_early())["clip_id"] == dataset.clip_ids[0]
+
+    async def cancel_load():
+        task = asyncio.ensure_future(dataset.aload_clip(dataset.clip_ids[0]))
+        await asyncio.sleep(0)
+        task.cancel()
+        await task
+
+    with pytest.raises(asyncio.CancelledError):
+        asyncio.run(cancel_load())
+
+
 def test_list_versions():
     assert (
         soundata.list_dataset_versions("urbansound8k")
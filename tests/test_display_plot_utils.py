@@ -3,7 +3,7 @@ from unittest import mock
 from unittest.mock import MagicMock, Mock, patch
 import pytest
 import numpy as np
-from soundata import display_plot_utils
+from soundata import display_plot_utils, io
 import soundata
 import simpleaudio as sa
 
@@ -36,6 +36,9 @@ class MockDataset:
 class MockClip:
     def __init__(self, duration, tags):
         self.audio = (np.random.random(int(duration * 44100)), 44100)
+        self.audio_info = io.AudioInfo(
+            44100, int(duration * 44100), 1, "PCM_16", duration
+        )
         self.tags = MockTags(tags)
 
 
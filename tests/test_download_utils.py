@@ -3,12 +3,19 @@ from pathlib import Path
 import shutil
 import zipfile
 import re
+import socket
+import tracemalloc
+import urllib.error
+import numpy as np
+import py7zr
 
-from soundata import download_utils, core
+from soundata import download_utils, core, validate
 from soundata.datasets import esc50
 
 import pytest
 import tempfile
+from pytest_localserver.http import WSGIServer
+from werkzeug.wrappers import Request, Response
 
 
 @pytest.fixture
@@ -76,12 +83,12 @@ def test_downloader(mocker, mock_path):
 
     # Zip only
     download_utils.downloader("a", index=index, remotes={"b": zip_remote})
-    mock_zip.assert_called_once_with(zip_remote, "a", False, False)
+    mock_zip.assert_called_once_with(zip_remote, "a", False, False, 1)
     mocker.resetall()
 
     # tar only
     download_utils.downloader("a", index=index, remotes={"b": tar_remote})
-    mock_tar.assert_called_once_with(tar_remote, "a", False, False)
+    mock_tar.assert_called_once_with(tar_remote, "a", False, False, False)
     mocker.resetall()
 
     # 7z only
@@ -98,15 +105,15 @@ def test_downloader(mocker, mock_path):
     download_utils.downloader(
         "a", index=index, remotes={"b": zip_remote, "c": tar_remote}
     )
-    mock_zip.assert_called_once_with(zip_remote, "a", False, False)
-    mock_tar.assert_called_once_with(tar_remote, "a", False, False)
+    mock_zip.assert_called_once_with(zip_remote, "a", False, False, 1)
+    mock_tar.assert_called_once_with(tar_remote, "a", False, False, False)
     mocker.resetall()
 
     # zip and file
     download_utils.downloader(
         "a", index=index, remotes={"b": zip_remote, "c": file_remote}
     )
-    mock_zip.assert_called_once_with(zip_remote, "a", False, False)
+    mock_zip.assert_called_once_with(zip_remote, "a", False, False, 1)
     mock_download_from_remote.assert_called_once_with(file_remote, "a", False)
     mocker.resetall()
 
@@ -114,7 +121,7 @@ def test_downloader(mocker, mock_path):
     download_utils.downloader(
         "a", index=index, remotes={"b": tar_remote, "c": file_remote}
     )
-    mock_tar.assert_called_once_with(tar_remote, "a", False, False)
+    mock_tar.assert_called_once_with(tar_remote, "a", False, False, False)
     mock_download_from_remote.assert_called_once_with(file_remote, "a", False)
     mocker.resetall()
 
@@ -122,14 +129,16 @@ def test_downloader(mocker, mock_path):
     download_utils.downloader(
         "a", index=index, remotes={"b": zip_remote, "c": tar_remote, "d": file_remote}
     )
-    mock_zip.assert_called_once_with(zip_remote, "a", False, False)
+    mock_zip.assert_called_once_with(zip_remote, "a", False, False, 1)
     mock_download_from_remote.assert_called_once_with(file_remote, "a", False)
-    mock_tar.assert_called_once_with(tar_remote, "a", False, False)
+    mock_tar.assert_called_once_with(tar_remote, "a", False, False, False)
     mocker.resetall()
 
     # Zip multipart
     download_utils.downloader("a", index=index, remotes={"b": multipart_zip_remote})
-    mock_multipart_zip.assert_called_once_with(multipart_zip_remote, "a", False, False)
+    mock_multipart_zip.assert_called_once_with(
+        multipart_zip_remote, "a", False, False, 1
+    )
     mocker.resetall()
 
     # test partial download
@@ -139,7 +148,7 @@ def test_downloader(mocker, mock_path):
         remotes={"b": zip_remote, "c": tar_remote, "d": file_remote},
         partial_download=["b", "d"],
     )
-    mock_zip.assert_called_once_with(zip_remote, "a", False, False)
+    mock_zip.assert_called_once_with(zip_remote, "a", False, False, 1)
     mock_download_from_remote.assert_called_once_with(file_remote, "a", False)
     mocker.resetall()
 
@@ -230,7 +239,7 @@ def test_download_index_cases(mocker, mock_path):
         remotes={"b": zip_remote, "d": file_remote},
         partial_download=None,
     )
-    mock_zip.assert_called_once_with(zip_remote, "a", False, False)
+    mock_zip.assert_called_once_with(zip_remote, "a", False, False, 1)
     mock_download_from_remote.assert_not_called()
     mocker.resetall()
 
@@ -263,7 +272,7 @@ def test_download_index_cases(mocker, mock_path):
         remotes={"b": zip_remote},
         partial_download=None,
     )
-    mock_zip.assert_called_once_with(zip_remote, "a", False, False)
+    mock_zip.assert_called_once_with(zip_remote, "a", False, False, 1)
     mock_download_from_remote.assert_called_once_with(remote_index.remote, "a", False)
     mocker.resetall()
 
@@ -384,6 +393,59 @@ def test_downloader_with_server_tar(httpserver):
     _clean(save_dir)
 
 
+def test_downloader_with_server_tar_stream(httpserver, tmpdir, mocker):
+    index = core.Index("asdf.json")
+    httpserver.serve_content(open("tests/resources/remote.tar.gz", "rb").read())
+    TEST_REMOTE = download_utils.RemoteFileMetadata(
+        filename="remote.tar.gz",
+        url=httpserver.url,
+        checksum=("9042f5eebdcd0b94aa7a3c9bf12dc51d"),
+    )
+    save_dir = str(tmpdir)
+    tar_path = os.path.join(save_dir, "remote.tar.gz")
+    wav_path = os.path.join(save_dir, "remote.wav")
+    untar = mocker.spy(download_utils, "untar")
+
+    # the archive is never written to disk
+    download_utils.downloader(
+        save_dir, index=index, remotes={"b": TEST_REMOTE}, cleanup=True, stream=True
+    )
+    assert os.path.exists(wav_path)
+    assert not os.path.exists(tar_path)
+    assert untar.call_count == 0
+
+    # the archive is kept when cleanup is False
+    os.remove(wav_path)
+    download_utils.downloader(
+        save_dir, index=index, remotes={"b": TEST_REMOTE}, stream=True
+    )
+    assert os.path.exists(wav_path)
+    assert validate.md5(tar_path) == TEST_REMOTE.checksum
+    assert untar.call_count == 0
+
+    # an archive on disk is extracted from there
+    download_utils.downloader(
+        save_dir, index=index, remotes={"b": TEST_REMOTE}, stream=True
+    )
+    assert len(httpserver.requests) == 2
+    assert untar.call_count == 1
+
+    download_utils.downloader(
+        save_dir,
+        index=index,
+        remotes={"b": TEST_REMOTE},
+        stream=True,
+        force_overwrite=True,
+    )
+    assert len(httpserver.requests) == 3
+
+    # the checksum of the streamed bytes is verified
+    TEST_REMOTE.checksum = "1234"
+    with pytest.raises(IOError):
+        download_utils.stream_tar_file(TEST_REMOTE, save_dir, True, False)
+    assert not os.path.exists(tar_path + ".part")
+
+
 def test_download_from_remote(httpserver, tmpdir):
     httpserver.serve_content(open("tests/resources/remote.wav").read())
 
@@ -411,6 +473,183 @@ def test_download_from_remote_destdir(httpserver, tmpdir):
     assert expected_download_path == download_path
 
 
+@pytest.fixture
+def range_server():
+    """A server supporting Range requests, which fails the first
+    `server.failures` requests with a `server.failure_status` (503) error"""
+    requests = []
+
+    def app(environ, start_response):
+        request = Request(environ)
+        requests.append(request.headers.get("Range"))
+        if server.failures > 0:
+            server.failures -= 1
+            return Response("unavailable", status=server.failure_status)(
+                environ, start_response
+            )
+        with open("tests/resources/remote.wav", "rb") as fhandle:
+            response = Response(fhandle.read())
+        response.make_conditional(request, accept_ranges=True)
+        return response(environ, start_response)
+
+    server = WSGIServer(application=app)
+    server.failures = 0
+    server.failure_status = 503
+    server.requests = requests
+    server.start()
+    yield server
+    server.stop()
+
+
+def test_download_from_remote_resume(range_server, tmpdir):
+    with open("tests/resources/remote.wav", "rb") as fhandle:
+        content = fhandle.read()
+    TEST_REMOTE = download_utils.RemoteFileMetadata(
+        filename="remote.wav",
+        url=range_server.url,
+        checksum=("3f77d0d69dc41b3696f074ad6bf2852f"),
+    )
+    download_path = os.path.join(str(tmpdir), "remote.wav")
+
+    # an interrupted download is resumed from the end of the part file
+    with open(download_path + ".part", "wb") as fhandle:
+        fhandle.write(content[:50])
+    assert (
+        download_utils.download_from_remote(TEST_REMOTE, str(tmpdir), False)
+        == download_path
+    )
+    assert range_server.requests == ["bytes=50-"]
+    assert not os.path.exists(download_path + ".part")
+
+    # a complete part file is only renamed
+    os.rename(download_path, download_path + ".part")
+    download_utils.download_from_remote(TEST_REMOTE, str(tmpdir), False)
+    assert range_server.requests[-1] == "bytes={}-".format(len(content))
+
+    # force_overwrite discards the part file
+    with open(download_path + ".part", "wb") as fhandle:
+        fhandle.write(b"corrupted")
+    download_utils.download_from_remote(TEST_REMOTE, str(tmpdir), True)
+    assert range_server.requests[-1] is None
+
+
+def test_download_from_remote_hashes_stream(range_server, tmpdir, mocker):
+    with open("tests/resources/remote.wav", "rb") as fhandle:
+        content = fhandle.read()
+    TEST_REMOTE = download_utils.RemoteFileMetadata(
+        filename="remote.wav",
+        url=range_server.url,
+        checksum=("3f77d0d69dc41b3696f074ad6bf2852f"),
+    )
+    download_path = os.path.join(str(tmpdir), "remote.wav")
+    md5 = mocker.spy(validate, "md5")
+
+    # the downloaded file is not read again to compute its checksum
+    download_utils.download_from_remote(TEST_REMOTE, str(tmpdir), False)
+    assert md5.call_count == 0
+    manifest = validate.load_manifest(str(tmpdir))
+    assert manifest["remote.wav"][3] == TEST_REMOTE.checksum
+
+    # neither is an unchanged file that was already downloaded
+    download_utils.download_from_remote(TEST_REMOTE, str(tmpdir), False)
+    assert md5.call_count == 0
+
+    # a resumed download only hashes the bytes that were already on disk
+    os.remove(download_path)
+    with open(download_path + ".part", "wb") as fhandle:
+        fhandle.write(content[:50])
+    download_utils.download_from_remote(TEST_REMOTE, str(tmpdir), False)
+    assert md5.call_count == 0
+
+    # a modified file is hashed again
+    with open(download_path, "ab") as fhandle:
+        fhandle.write(b"0")
+    with pytest.raises(IOError):
+        download_utils.download_from_remote(TEST_REMOTE, str(tmpdir), False)
+    assert md5.call_count == 1
+
+
+def test_download_from_remote_retries(range_server, tmpdir, mocker):
+    sleep = mocker.patch("soundata.download_utils.time.sleep")
+    TEST_REMOTE = download_utils.RemoteFileMetadata(
+        filename="remote.wav",
+        url=range_server.url,
+        checksum=("3f77d0d69dc41b3696f074ad6bf2852f"),
+    )
+
+    range_server.failures = 2
+    download_utils.download_from_remote(TEST_REMOTE, str(tmpdir), False)
+    assert len(range_server.requests) == 3
+    sleep.assert_has_calls(
+        [
+            mocker.call(download_utils.RETRY_BACKOFF),
+            mocker.call(2 * download_utils.RETRY_BACKOFF),
+        ]
+    )
+
+    range_server.failures = download_utils.DOWNLOAD_RETRIES
+    with pytest.raises(IOError):
+        download_utils.download_from_remote(TEST_REMOTE, str(tmpdir), True)
+
+    # too many requests is transient, other client errors are not
+    range_server.failures = 1
+    range_server.failure_status = 429
+    download_utils.download_from_remote(TEST_REMOTE, str(tmpdir), True)
+    range_server.failures = 1
+    range_server.failure_status = 403
+    with pytest.raises(urllib.error.HTTPError):
+        download_utils.download_from_remote(TEST_REMOTE, str(tmpdir), True)
+
+
+def test_download_from_remote_retries_timeout(range_server, tmpdir, mocker):
+    mocker.patch("soundata.download_utils.time.sleep")
+    TEST_REMOTE = download_utils.RemoteFileMetadata(
+        filename="remote.wav",
+        url=range_server.url,
+        checksum=("3f77d0d69dc41b3696f074ad6bf2852f"),
+    )
+    response = download_utils.urllib.request.urlopen(range_server.url)
+    urlopen = mocker.patch(
+        "soundata.download_utils.urllib.request.urlopen",
+        side_effect=[socket.timeout("timed out"), ConnectionResetError(), response],
+    )
+    download_utils.download_from_remote(TEST_REMOTE, str(tmpdir), False)
+    assert urlopen.call_count == 3
+    assert urlopen.call_args[1]["timeout"] == download_utils.DOWNLOAD_TIMEOUT
+
+
+def test_downloader_concurrent(range_server, tmpdir):
+    remotes = {
+        "file_{}".format(i): download_utils.RemoteFileMetadata(
+            filename="remote_{}.wav".format(i),
+            url=range_server.url,
+            checksum=("3f77d0d69dc41b3696f074ad6bf2852f"),
+        )
+        for i in range(4)
+    }
+    remotes["multipart"] = [
+        download_utils.RemoteFileMetadata(
+            filename="remote.z0{}".format(i),
+            url=range_server.url,
+            checksum=("3f77d0d69dc41b3696f074ad6bf2852f"),
+        )
+        for i in range(1, 3)
+    ]
+    remotes["multipart"][0].filename = "remote.zip"
+    with pytest.raises(zipfile.BadZipFile):
+        # the multipart parts are not valid zip files, but are downloaded first
+        download_utils.downloader(
+            str(tmpdir),
+            remotes=remotes,
+            index=core.Index("asdf.json"),
+            num_workers=3,
+        )
+    for i in range(4):
+        assert os.path.exists(os.path.join(str(tmpdir), "remote_{}.wav".format(i)))
+    assert os.path.exists(os.path.join(str(tmpdir), "remote.zip"))
+    assert os.path.exists(os.path.join(str(tmpdir), "remote.z02"))
+
+
 def test_download_from_remote_raises_IOError(httpserver, tmpdir):
     httpserver.serve_content("File not found!", 404)
 
@@ -486,13 +725,12 @@ def test_download_zip_file(mocker, mock_download_from_remote, mock_unzip):
     download_utils.download_zip_file("a", "b", False, False)
 
     mock_download_from_remote.assert_called_once_with("a", "b", False)
-    mock_unzip.assert_called_once_with("foo", cleanup=False)
+    mock_unzip.assert_called_once_with("foo", cleanup=False, num_workers=1)
     _clean("a")
 
 
-def test_download_multipart_zip(mocker, mock_download_from_remote, mock_unzip):
-    Path("tests/resources/foo.zip").touch()
-    Path("tests/resources/foo.z01").touch()
+def test_download_multipart_zip(mocker, mock_download_from_remote):
+    mock_unzip_multipart = mocker.patch.object(download_utils, "unzip_multipart")
     multipart_zip_remote = {
         "foo": [
             download_utils.RemoteFileMetadata(
@@ -524,11 +762,72 @@ def test_download_multipart_zip(mocker, mock_download_from_remote, mock_unzip):
             ),
         ]
     )
-    mock_unzip.assert_called_once_with(
-        os.path.normpath("tests/resources/foo_single.zip"), cleanup=True
+    mock_unzip_multipart.assert_called_once_with(
+        [
+            os.path.normpath("tests/resources/foo.z01"),
+            os.path.normpath("tests/resources/foo.zip"),
+        ],
+        cleanup=True,
+        num_workers=1,
+    )
+
+
+@pytest.mark.parametrize("name", ["multipart", "multipart64"])
+def test_unzip_multipart(name, tmpdir):
+    part_paths = []
+    for extension in [".zip", ".z02", ".z01"]:
+        part_paths.append(os.path.join(str(tmpdir), name + extension))
+        shutil.copy(
+            os.path.join("tests/resources/multipart", name + extension),
+            part_paths[-1],
+        )
+    part_paths.sort(key=download_utils.multipart_zip_order)
+    assert [os.path.splitext(path)[1] for path in part_paths] == [
+        ".z01",
+        ".z02",
+        ".zip",
+    ]
+
+    # the last member starts in the third part
+    with download_utils.MultipartZipStream(part_paths) as stream:
+        with zipfile.ZipFile(stream) as zfile:
+            assert zfile.testzip() is None
+            assert zfile.getinfo("split/text.txt").header_offset > 2 * 65536
+
+    download_utils.unzip_multipart(part_paths, cleanup=True)
+    assert validate.md5(os.path.join(str(tmpdir), "split", "noise.bin")) == (
+        "bf05093497575d6ae6a471ce5e3a6570"
+    )
+    assert validate.md5(os.path.join(str(tmpdir), "split", "text.txt")) == (
+        "dda51be2edae020652055121717f34c0"
+    )
+    assert not any(os.path.exists(path) for path in part_paths)
+    assert not os.path.exists(os.path.join(str(tmpdir), name + "_single.zip"))
+
+
+def test_unzip_multipart_parallel(tmpdir):
+    part_paths = []
+    for extension in [".z01", ".z02", ".zip"]:
+        part_paths.append(os.path.join(str(tmpdir), "multipart" + extension))
+        shutil.copy(
+            os.path.join("tests/resources/multipart", "multipart" + extension),
+            part_paths[-1],
+        )
+
+    download_utils.unzip_multipart(part_paths, cleanup=True, num_workers=4)
+    assert validate.md5(os.path.join(str(tmpdir), "split", "noise.bin")) == (
+        "bf05093497575d6ae6a471ce5e3a6570"
+    )
+    assert validate.md5(os.path.join(str(tmpdir), "split", "text.txt")) == (
+        "dda51be2edae020652055121717f34c0"
     )
 
 
+def test_multipart_zip_stream_invalid():
+    with pytest.raises(zipfile.BadZipFile):
+        download_utils.MultipartZipStream(["tests/resources/remote.wav"])
+
+
 def test_download_tar_file(mocker, mock_download_from_remote, mock_untar):
     mock_download_from_remote.return_value = "foo"
     download_utils.download_tar_file("a", "b", False, False)
@@ -570,6 +869,70 @@ def test_extractall_unicode(mocker, mock_download_from_remote, mock_unzip):
         os.remove(expected_file_location)
 
 
+def test_extractall_unicode_parallel(tmpdir):
+    zip_path = os.path.join(str(tmpdir), "many.zip")
+    rng = np.random.default_rng(0)
+    with zipfile.ZipFile(zip_path, "w", zipfile.ZIP_DEFLATED) as zfile:
+        zfile.writestr("empty/", "")
+        for i in range(64):
+            zfile.writestr(
+                "fold{}/{}.bin".format(i % 4, i),
+                rng.integers(0, 4, size=1000 * (i + 1), dtype=np.uint8).tobytes(),
+            )
+
+    serial_dir = os.path.join(str(tmpdir), "serial")
+    parallel_dir = os.path.join(str(tmpdir), "parallel")
+    with zipfile.ZipFile(zip_path) as zfile:
+        download_utils.extractall_unicode(zfile, serial_dir)
+        download_utils.extractall_unicode(zfile, parallel_dir, num_workers=8)
+
+    serial_files = sorted(
+        os.path.relpath(os.path.join(root, name), serial_dir)
+        for root, _, names in os.walk(serial_dir)
+        for name in names
+    )
+    assert len(serial_files) == 64
+    assert os.path.isdir(os.path.join(parallel_dir, "empty"))
+    for relative_path in serial_files:
+        assert validate.md5(os.path.join(serial_dir, relative_path)) == validate.md5(
+            os.path.join(parallel_dir, relative_path)
+        )
+
+
+def test_un7z_blocks(tmpdir):
+    # every append to a 7z archive is stored in its own solid block
+    sevenz_path = os.path.join(str(tmpdir), "blocks.7z")
+    with py7zr.SevenZipFile(sevenz_path, "w") as z:
+        z.writestr("first", "a.txt")
+    for name in ["b.txt", "c.txt", "d.txt"]:
+        with py7zr.SevenZipFile(sevenz_path, "a") as z:
+            z.writestr(name * 1000, name)
+
+    download_utils.un7z(sevenz_path, cleanup=True)
+    assert sorted(os.listdir(str(tmpdir))) == ["a.txt", "b.txt", "c.txt", "d.txt"]
+    with open(os.path.join(str(tmpdir), "c.txt")) as fhandle:
+        assert fhandle.read() == "c.txt" * 1000
+
+
+def test_extractall_unicode_streams_members(tmpdir):
+    zip_path = os.path.join(str(tmpdir), "large.zip")
+    with zipfile.ZipFile(zip_path, "w", zipfile.ZIP_DEFLATED) as zfile:
+        with zfile.open("large.bin", "w") as fhandle:
+            for _ in range(32):
+                fhandle.write(b"\x00" * (1 << 20))
+
+    out_dir = os.path.join(str(tmpdir), "out")
+    tracemalloc.start()
+    with zipfile.ZipFile(zip_path) as zfile:
+        download_utils.extractall_unicode(zfile, out_dir)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    assert os.path.getsize(os.path.join(out_dir, "large.bin")) == 32 * (1 << 20)
+    # the 32 MB member is never held in memory at once
+    assert peak < 8 * (1 << 20)
+
+
 def test_unicode_filename():
     # Create a zip file with a non-ASCII filename
     test_zip = "test.zip"
@@ -1,3 +1,6 @@
+import subprocess
+import sys
+
 import pytest
 
 from soundata import core
@@ -19,3 +22,31 @@ def test_initialize():
 
     with pytest.raises(ValueError):
         initialize("asdfasdfasdfa")
+
+
+def test_initialize_lazy_imports():
+    # cold interpreter, so modules cached by other tests do not hide regressions
+    heavy_modules = [
+        "matplotlib",
+        "seaborn",
+        "ipywidgets",
+        "IPython",
+        "pydub",
+        "simpleaudio",
+        "soundata.display_plot_utils",
+    ]
+    code = (
+        "import sys; import soundata; "
+        "dataset = soundata.initialize('urbansound8k', "
+        "data_home='tests/resources/sound_datasets/urbansound8k', version='test'); "
+        "dataset.clip(dataset.clip_ids[0]).audio; "
+        "print(','.join(m for m in {} if m in sys.modules))".format(heavy_modules)
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    # the plotting stack must only be imported by explore_dataset
+    assert result.stdout.strip() == ""
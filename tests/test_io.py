@@ -1,6 +1,11 @@
+import os
+import shutil
 import tempfile
+import time
 from io import BufferedReader, BytesIO, StringIO, TextIOWrapper
 
+import librosa
+import numpy as np
 import pytest
 
 from soundata import io
@@ -76,3 +81,253 @@ def test_invalid_coerce_to_bytes_io():
 
     with pytest.raises(ValueError):
         func(123)
+
+
+AUDIO_FILES = [
+    "tests/resources/test.wav",
+    "tests/resources/sound_datasets/urbansound8k/audio/fold1/135776-2-0-49.wav",
+    "tests/resources/sound_datasets/starss2022/foa_dev/dev-train-sony/fold3_room21_mix001.wav",
+    "tests/resources/sound_datasets/eigenscape/Beach.1.wav",
+    "tests/resources/sound_datasets/fsd50k/FSD50K.eval_audio/99.wav",
+]
+
+
+@pytest.mark.parametrize("audio_path", AUDIO_FILES)
+@pytest.mark.parametrize("sr", [None, 24000, 44100])
+@pytest.mark.parametrize("mono", [True, False])
+def test_load_audio_matches_librosa(audio_path, sr, mono):
+    with open(audio_path, "rb") as fhandle:
+        audio, audio_sr = io.load_audio(fhandle, sr=sr, mono=mono)
+    expected, expected_sr = librosa.load(audio_path, sr=sr, mono=mono)
+
+    assert audio_sr == expected_sr
+    assert audio.dtype == expected.dtype
+    assert audio.shape == expected.shape
+    assert np.allclose(audio, expected, atol=1e-6)
+
+
+def test_load_audio_skips_resampling(mocker):
+    resample = mocker.patch("soundata.io.librosa.resample")
+    audio, sr = io.load_audio(AUDIO_FILES[1], sr=48000, mono=False)
+    assert sr == 48000
+    assert audio.shape == (2, 48000)
+    resample.assert_not_called()
+
+    io.load_audio(AUDIO_FILES[1], sr=44100)
+    resample.assert_called_once()
+
+
+def test_load_audio_fallback(mocker):
+    fallback = mocker.patch(
+        "soundata.io.librosa.load", return_value=(np.zeros((10,)), 22050)
+    )
+    with open("tests/resources/file.zip", "rb") as fhandle:
+        audio, sr = io.load_audio(fhandle, sr=22050)
+    fallback.assert_called_once_with(
+        "tests/resources/file.zip",
+        sr=None,
+        mono=False,
+        offset=0.0,
+        duration=None,
+        dtype=np.float32,
+    )
+    assert sr == 22050
+    assert audio.shape == (10,)
+
+
+@pytest.mark.parametrize("audio_path", AUDIO_FILES)
+def test_audio_info(audio_path):
+    audio, sr = io.load_audio(audio_path, mono=False)
+    audio_info = io.audio_info(audio_path)
+    assert audio_info.sample_rate == sr
+    assert audio_info.frames == audio.shape[-1]
+    assert audio_info.channels == (1 if audio.ndim == 1 else audio.shape[0])
+    assert audio_info.duration == audio.shape[-1] / sr
+    assert isinstance(audio_info.subtype, str)
+
+
+def test_audio_info_fallback(mocker):
+    mocker.patch("soundata.io.librosa.get_samplerate", return_value=22050)
+    mocker.patch("soundata.io.librosa.get_duration", return_value=2.0)
+    audio_info = io.audio_info("tests/resources/file.zip")
+    assert audio_info == io.AudioInfo(22050, 44100, None, None, 2.0)
+
+
+def test_audio_info_table(tmp_path, mocker):
+    paths = []
+    for i, audio_path in enumerate(AUDIO_FILES):
+        paths.append("{}{}".format(i, os.path.splitext(audio_path)[1]))
+        shutil.copy(audio_path, str(tmp_path / paths[-1]))
+    cache_path = str(tmp_path / "cache.npz")
+
+    table = io.audio_info_table(str(tmp_path), paths + ["missing.wav", None])
+    assert sorted(table.keys()) == sorted(io.AUDIO_INFO_COLUMNS)
+    for i, audio_path in enumerate(AUDIO_FILES):
+        audio_info = io.audio_info(audio_path)
+        assert table["sample_rate"][i] == audio_info.sample_rate
+        assert table["frames"][i] == audio_info.frames
+        assert table["channels"][i] == audio_info.channels
+        assert table["duration"][i] == audio_info.duration
+    assert np.all(np.isnan(table["duration"][-2:]))
+    assert np.all(table["frames"][-2:] == 0)
+    assert not os.path.exists(cache_path)
+
+    # the first call fills the cache, the second only reads it
+    io.audio_info_table(str(tmp_path), paths, cache_path=cache_path, num_workers=2)
+    assert os.path.exists(cache_path)
+    probe = mocker.spy(io, "audio_info")
+    cached_table = io.audio_info_table(str(tmp_path), paths, cache_path=cache_path)
+    assert probe.call_count == 0
+    for column in io.AUDIO_INFO_COLUMNS:
+        assert np.array_equal(cached_table[column], table[column][: len(paths)])
+
+    # only modified files are read again
+    shutil.copy(AUDIO_FILES[0], str(tmp_path / paths[1]))
+    updated_table = io.audio_info_table(str(tmp_path), paths, cache_path=cache_path)
+    probe.assert_called_once_with(str(tmp_path / paths[1]))
+    assert updated_table["frames"][1] == table["frames"][0]
+
+    # an unreadable cache is ignored and rewritten
+    with open(cache_path, "wb") as fhandle:
+        fhandle.write(b"not a cache")
+    rebuilt_table = io.audio_info_table(str(tmp_path), paths, cache_path=cache_path)
+    assert np.array_equal(rebuilt_table["frames"], updated_table["frames"])
+    assert probe.call_count == 1 + len(paths)
+
+    # a cache which can't be written, e.g. on a read-only mount, is skipped
+    mocker.patch.object(io.os, "replace", side_effect=PermissionError("read-only"))
+    unwritable_path = str(tmp_path / "unwritable.npz")
+    unwritable_table = io.audio_info_table(
+        str(tmp_path), paths, cache_path=unwritable_path
+    )
+    assert np.array_equal(unwritable_table["frames"], updated_table["frames"])
+    assert not any(name.startswith("unwritable") for name in os.listdir(str(tmp_path)))
+
+
+def test_load_cached(tmp_path, mocker):
+    source_path = str(tmp_path / "source.txt")
+    cache_path = str(tmp_path / "cache.json")
+    with open(source_path, "w") as fhandle:
+        fhandle.write("a")
+
+    build = mocker.Mock(side_effect=lambda: {"a": [1, 2]})
+    assert io.load_cached(cache_path, [source_path], build, key=1) == {"a": [1, 2]}
+    assert io.load_cached(cache_path, [source_path], build, key=1) == {"a": [1, 2]}
+    assert build.call_count == 1
+    assert os.path.exists(cache_path)
+
+    # the cache is rebuilt when the key or a source file changes
+    io.load_cached(cache_path, [source_path], build, key=2)
+    assert build.call_count == 2
+    with open(source_path, "w") as fhandle:
+        fhandle.write("ab")
+    io.load_cached(cache_path, [source_path], build, key=2)
+    assert build.call_count == 3
+
+    # an unreadable cache is ignored and rewritten
+    with open(cache_path, "wb") as fhandle:
+        fhandle.write(b"not a cache")
+    assert io.load_cached(cache_path, [source_path], build, key=2) == {"a": [1, 2]}
+    assert build.call_count == 4
+    with open(cache_path, "w") as fhandle:
+        fhandle.write("[1, 2]")
+    assert io.load_cached(cache_path, [source_path], build, key=2) == {"a": [1, 2]}
+    assert build.call_count == 5
+
+    # data which can't be written as JSON is returned without being cached
+    unserializable = mocker.Mock(side_effect=lambda: {"a": object()})
+    os.remove(cache_path)
+    assert "a" in io.load_cached(cache_path, [source_path], unserializable)
+    assert not os.path.exists(cache_path)
+    assert os.listdir(str(tmp_path)) == ["source.txt"]
+
+    # nothing is cached when the cache directory does not exist
+    missing_cache_path = str(tmp_path / "missing" / "cache.json")
+    io.load_cached(missing_cache_path, [source_path], build)
+    assert not os.path.exists(missing_cache_path)
+
+
+@pytest.mark.parametrize("audio_path", AUDIO_FILES)
+def test_load_audio_partial(audio_path):
+    full, sr = io.load_audio(audio_path, mono=False)
+
+    segment, segment_sr = io.load_audio(audio_path, mono=False, offset=0.25)
+    assert segment_sr == sr
+    assert np.array_equal(segment, full[..., int(0.25 * sr) :])
+
+    segment, _ = io.load_audio(audio_path, mono=False, offset=0.25, duration=0.5)
+    assert np.array_equal(segment, full[..., int(0.25 * sr) : int(0.75 * sr)])
+
+    segment, _ = io.load_audio(audio_path, mono=False, duration=0.1)
+    assert np.array_equal(segment, full[..., : int(0.1 * sr)])
+
+    # reading past the end of the file returns what is left
+    segment, _ = io.load_audio(audio_path, mono=False, offset=100.0, duration=1.0)
+    assert segment.shape[-1] == 0
+
+    # resampled segments have the target length
+    segment, segment_sr = io.load_audio(
+        audio_path, sr=16000, mono=True, offset=0.25, duration=0.5
+    )
+    assert segment_sr == 16000
+    assert segment.shape == (8000,)
+
+
+def test_load_audio_partial_invalid():
+    with pytest.raises(ValueError):
+        io.load_audio(AUDIO_FILES[0], offset=-1.0)
+    with pytest.raises(ValueError):
+        io.load_audio(AUDIO_FILES[0], duration=-1.0)
+
+
+@pytest.mark.parametrize("channels", [[0], [1, 3], [3, 0], [-1]])
+def test_load_audio_channels(channels, mocker):
+    audio_path = AUDIO_FILES[2]  # 4-channel file
+    full, sr = io.load_audio(audio_path, mono=False)
+
+    audio, audio_sr = io.load_audio(audio_path, mono=False, channels=channels)
+    assert audio_sr == sr
+    assert np.array_equal(audio, np.squeeze(full[channels]))
+
+    audio, _ = io.load_audio(audio_path, mono=True, channels=channels)
+    assert np.allclose(audio, np.mean(full[channels], axis=0))
+
+    # small blocks and a partial read
+    mocker.patch("soundata.io.BLOCK_FRAMES", 1000)
+    audio, _ = io.load_audio(
+        audio_path, mono=False, offset=0.1, duration=0.5, channels=channels
+    )
+    segment = full[channels, int(0.1 * sr) : int(0.6 * sr)]
+    assert np.array_equal(audio, np.squeeze(segment))
+
+
+def test_load_audio_channels_invalid():
+    with pytest.raises(ValueError):
+        io.load_audio(AUDIO_FILES[2], channels=[4])
+    with pytest.raises(ValueError):
+        io.load_audio(AUDIO_FILES[0], channels=[0, 1])
+
+
+def test_load_audio_benchmark():
+    # compares clips/sec of the soundfile backend against librosa.load
+    n_runs = 20
+    start = time.perf_counter()
+    for _ in range(n_runs):
+        for audio_path in AUDIO_FILES:
+            with open(audio_path, "rb") as fhandle:
+                librosa.load(fhandle, sr=None, mono=False)
+    librosa_rate = n_runs * len(AUDIO_FILES) / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for _ in range(n_runs):
+        for audio_path in AUDIO_FILES:
+            with open(audio_path, "rb") as fhandle:
+                io.load_audio(fhandle, sr=None, mono=False)
+    soundfile_rate = n_runs * len(AUDIO_FILES) / (time.perf_counter() - start)
+
+    print(
+        "librosa.load: {:.1f} clips/sec, io.load_audio: {:.1f} clips/sec".format(
+            librosa_rate, soundfile_rate
+        )
+    )
+    assert soundfile_rate > 0 and librosa_rate > 0
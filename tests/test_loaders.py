@@ -10,7 +10,7 @@ import requests
 
 
 import soundata
-from soundata import core
+from soundata import core, validate
 from tests.test_utils import get_attributes_and_properties
 
 DATASETS = soundata.DATASETS
@@ -173,6 +173,11 @@ def test_validate(skip_local):
         except:
             assert False, "{}: {}".format(dataset_name, sys.exc_info()[0])
 
+        # don't leave the checksum manifest behind in the test resources
+        manifest_path = os.path.join(dataset.data_home, validate.MANIFEST_FILENAME)
+        if os.path.exists(manifest_path):
+            os.remove(manifest_path)
+
 
 def test_load_and_clipids():
     for dataset_name in DATASETS:
@@ -282,6 +287,32 @@ def test_clip():
             dataset.clip("~fakeclipid~?!")
 
 
+def test_clip_audio_segment():
+    for dataset_name in DATASETS:
+        dataset = soundata.initialize(
+            dataset_name, os.path.join(TEST_DATA_HOME, dataset_name), version="test"
+        )
+
+        if dataset_name in CUSTOM_TEST_CLIPS:
+            clipid = CUSTOM_TEST_CLIPS[dataset_name]
+        else:
+            clipid = dataset.clip_ids[0]
+        clip = dataset.clip(clipid)
+
+        full = clip.audio
+        segment, sr = clip.audio_segment(0.25, 0.75)
+        # some loaders' audio property only returns the audio signal
+        if isinstance(full, tuple):
+            full, full_sr = full
+            assert full_sr == sr, dataset_name
+
+        assert segment.shape[:-1] == full.shape[:-1], dataset_name
+        assert abs(segment.shape[-1] - 0.5 * sr) <= 1, dataset_name
+
+        segment, _ = clip.audio_segment(0.25)
+        assert abs(segment.shape[-1] - (full.shape[-1] - 0.25 * sr)) <= 1, dataset_name
+
+
 # This tests the case where there is no data in data_home.
 # It makes sure that the clip can be initialized and the
 # attributes accessed, but that anything requiring data
@@ -341,7 +372,7 @@ def test_load_methods():
             method_name = load_method.__name__
 
             # skip default methods
-            if method_name == "load_clips" or method_name == "load_clipgroups":
+            if method_name in ["load_clips", "load_clipgroups", "load_audio_batch"]:
                 continue
 
             # skip overrides, add to the SKIP dictionary to skip a specific load method
@@ -0,0 +1,173 @@
+import time
+import warnings
+
+import numpy as np
+import pytest
+
+import soundata
+from soundata import sampling
+
+FSD50K_DATA_HOME = "tests/resources/sound_datasets/fsd50k"
+
+
+@pytest.fixture
+def fsd50k_dataset():
+    return soundata.initialize("fsd50k", data_home=FSD50K_DATA_HOME, version="test")
+
+
+def test_random_crop_batch_sampler(fsd50k_dataset):
+    sampler = sampling.RandomCropBatchSampler(
+        fsd50k_dataset, window=0.25, batch_size=8, seed=0, cache=False
+    )
+    batch = next(iter(sampler))
+    assert isinstance(batch, sampling.CropBatch)
+    assert batch.sample_rate == 44100
+    assert batch.audio.shape == (8, 1, 11025)
+    assert batch.audio.dtype == np.float32
+    assert batch.mask.shape == (8, 11025)
+    assert batch.mask.all()
+    assert len(batch.clip_ids) == 8
+
+    # windows match a crop of the fully decoded clip
+    for clip_id, offset, audio in zip(batch.clip_ids, batch.offsets, batch.audio):
+        full_audio, sample_rate = fsd50k_dataset.clip(clip_id).audio
+        start = int(round(offset * sample_rate))
+        assert 0 <= offset <= len(full_audio) / sample_rate - 0.25
+        assert np.allclose(audio[0], full_audio[start : start + 11025], atol=1e-4)
+
+    # the same seed draws the same batches
+    same_sampler = sampling.RandomCropBatchSampler(
+        fsd50k_dataset, window=0.25, batch_size=8, seed=0, num_workers=4, cache=False
+    )
+    same_batch = next(same_sampler)
+    assert same_batch.clip_ids == batch.clip_ids
+    assert np.array_equal(same_batch.audio, batch.audio)
+
+
+def test_random_crop_batch_sampler_padding(fsd50k_dataset):
+    # the 0.5 s clip is shorter than the window
+    sampler = sampling.RandomCropBatchSampler(
+        fsd50k_dataset, window=1.0, batch_size=2, clip_ids=["21914"], cache=False
+    )
+    clip_ids, offsets = sampler.sample()
+    assert clip_ids == ["21914", "21914"]
+    assert np.array_equal(offsets, [0.0, 0.0])
+
+    batch = sampler.load(clip_ids, offsets)
+    assert batch.audio.shape == (2, 1, 44100)
+    assert batch.mask.sum(axis=1).tolist() == [22050, 22050]
+    assert not batch.audio[:, :, 22050:].any()
+
+
+def test_random_crop_batch_sampler_invalid(fsd50k_dataset):
+    with pytest.raises(ValueError):
+        sampling.RandomCropBatchSampler(fsd50k_dataset, window=0, batch_size=2)
+    with pytest.raises(ValueError):
+        sampling.RandomCropBatchSampler(fsd50k_dataset, window=1.0, batch_size=0)
+
+    dataset = soundata.initialize("fsd50k", data_home="not/a/path", version="test")
+    with pytest.raises(ValueError):
+        sampling.RandomCropBatchSampler(dataset, window=1.0, batch_size=2, cache=False)
+
+
+def test_random_crop_batch_sampler_benchmark(fsd50k_dataset):
+    # compares windows/sec of partial decoding against full decode plus crop
+    sampler = sampling.RandomCropBatchSampler(
+        fsd50k_dataset, window=0.25, batch_size=16, seed=0, cache=False
+    )
+    n_runs = 10
+    batches = [sampler.sample() for _ in range(n_runs)]
+
+    start = time.perf_counter()
+    for clip_ids, offsets in batches:
+        for clip_id, offset in zip(clip_ids, offsets):
+            audio, sample_rate = fsd50k_dataset.clip(clip_id).audio
+            first = int(round(offset * sample_rate))
+            audio[first : first + int(round(0.25 * sample_rate))]
+    full_rate = n_runs * 16 / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for clip_ids, offsets in batches:
+        sampler.load(clip_ids, offsets)
+    partial_rate = n_runs * 16 / (time.perf_counter() - start)
+
+    print(
+        "full decode + crop: {:.1f} windows/sec, partial decode: {:.1f} windows/sec".format(
+            full_rate, partial_rate
+        )
+    )
+    assert full_rate > 0 and partial_rate > 0
+
+
+def test_bucket_batches():
+    durations = np.array([1.0, 10.0, 1.05, 9.5, 5.0, 1.0])
+    batches = sampling.bucket_batches(durations, 2, 0.1)
+    assert [batch.tolist() for batch in batches] == [[0, 5], [2], [4], [3, 1]]
+    assert np.isclose(sampling.padding_fraction(durations, batches), 0.5 / 28.05)
+
+    # every clip is batched exactly once, within the padding and size limits
+    rng = np.random.default_rng(0)
+    durations = rng.lognormal(1.0, 1.0, size=500)
+    batches = sampling.bucket_batches(durations, 16, 0.05, np.random.default_rng(1))
+    assert sorted(np.concatenate(batches).tolist()) == list(range(500))
+    for batch in batches:
+        assert len(batch) <= 16
+        assert sampling.padding_fraction(durations, [batch]) <= 0.05
+
+    # the same seed draws the same batches
+    same_batches = sampling.bucket_batches(
+        durations, 16, 0.05, np.random.default_rng(1)
+    )
+    assert all(np.array_equal(a, b) for a, b in zip(batches, same_batches))
+
+    # zero-duration clips are batched together without dividing by zero
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        batches = sampling.bucket_batches(np.array([0.0, 0.0, 1.0]), 4, 0.1)
+    assert [batch.tolist() for batch in batches] == [[0, 1], [2]]
+
+
+def test_bucket_batch_sampler(fsd50k_dataset):
+    sampler = sampling.BucketBatchSampler(
+        fsd50k_dataset, batch_size=2, max_padding_ratio=0.5, shuffle=False, cache=False
+    )
+    assert list(sampler) == [["21914", "64760"], ["99"]]
+    assert np.isclose(
+        sampler.padding_fraction(sampler.batches()), (75601 - 22050) / (151202 + 653312)
+    )
+
+    sampler = sampling.BucketBatchSampler(
+        fsd50k_dataset, batch_size=2, max_padding_ratio=0.0, seed=0, cache=False
+    )
+    batches = list(sampler)
+    assert sorted(batches) == [["21914"], ["64760"], ["99"]]
+    assert sampler.padding_fraction(sampler.batches()) == 0.0
+
+    with pytest.raises(ValueError):
+        sampling.BucketBatchSampler(fsd50k_dataset, batch_size=0)
+    with pytest.raises(ValueError):
+        sampling.BucketBatchSampler(fsd50k_dataset, batch_size=2, max_padding_ratio=1)
+    dataset = soundata.initialize("fsd50k", data_home="not/a/path", version="test")
+    with pytest.raises(ValueError):
+        sampling.BucketBatchSampler(dataset, batch_size=2, cache=False)
+
+
+def test_bucket_batches_benchmark():
+    # compares the padding of random batches with bucketed batches over
+    # long-tailed durations, like FSD50K's
+    rng = np.random.default_rng(0)
+    durations = np.clip(rng.lognormal(1.5, 1.0, size=20000), 0.3, 30.0)
+    random_batches = np.array_split(rng.permutation(len(durations)), 20000 // 32)
+    before = sampling.padding_fraction(durations, random_batches)
+
+    start = time.perf_counter()
+    batches = sampling.bucket_batches(durations, 32, 0.05, rng)
+    elapsed = time.perf_counter() - start
+    after = sampling.padding_fraction(durations, batches)
+
+    print(
+        "padding fraction: {:.3f} random, {:.3f} bucketed ({} batches in {:.3f} s)".format(
+            before, after, len(batches), elapsed
+        )
+    )
+    assert after <= 0.05 < before
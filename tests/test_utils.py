@@ -1,6 +1,7 @@
 import itertools
 import json
 import os
+import time
 import types
 
 import soundata
@@ -154,4 +155,177 @@ def test_validator(mocker, mock_validate_index, missing_files, invalid_checksums
     m, c = validate.validator("foo", "bar", False)
     assert m == missing_files
     assert c == invalid_checksums
-    mock_validate_index.assert_called_once_with("foo", "bar", False)
+    mock_validate_index.assert_called_once_with(
+        "foo", "bar", False, 1, validate.CHUNK_SIZE, {}, "checksum", 0.1
+    )
+
+
+def test_validator_manifest(tmp_path, mocker):
+    data_home = str(tmp_path / "data")
+    os.makedirs(data_home)
+    with open(os.path.join("tests/indexes", "test_index_valid.json")) as index_file:
+        test_index = json.load(index_file)
+    with open("tests/resources/test.wav", "rb") as fhandle:
+        audio = fhandle.read()
+    with open(os.path.join(data_home, "test.wav"), "wb") as fhandle:
+        fhandle.write(audio)
+    local_path = os.path.join(data_home, "test.wav")
+    manifest_path = os.path.join(data_home, validate.MANIFEST_FILENAME)
+
+    assert validate.validator(test_index, data_home, False) == (
+        {"clips": {}},
+        {"clips": {}},
+    )
+    with open(manifest_path) as fhandle:
+        manifest = json.load(fhandle)
+    assert manifest["test.wav"][3] == "623560248732df138674f7afe337cd84"
+
+    # unchanged files are not hashed again, unless full is True
+    md5 = mocker.spy(validate, "md5")
+    validate.validator(test_index, data_home, False)
+    assert md5.call_count == 0
+    validate.validator(test_index, data_home, False, full=True)
+    assert md5.call_count == 1
+
+    # entries still apply when the data is moved or reached through a symlink
+    moved_home = str(tmp_path / "moved")
+    os.rename(data_home, moved_home)
+    os.symlink(moved_home, data_home)
+    validate.validator(test_index, moved_home, False)
+    validate.validator(test_index, data_home, False)
+    assert md5.call_count == 1
+
+    # modified files are hashed again
+    with open(local_path, "wb") as fhandle:
+        fhandle.write(audio[:-1] + b"0")
+    assert validate.validator(test_index, data_home, False) == (
+        {"clips": {}},
+        {"clips": {"test": [local_path]}},
+    )
+    assert md5.call_count == 2
+
+    # missing files are dropped from the manifest
+    os.remove(local_path)
+    assert validate.validator(test_index, data_home, False) == (
+        {"clips": {"test": [local_path]}},
+        {"clips": {}},
+    )
+    assert validate.load_manifest(data_home) == {}
+
+    with open(manifest_path, "w") as fhandle:
+        fhandle.write("not json")
+    assert validate.load_manifest(data_home) == {}
+
+
+@pytest.mark.parametrize(
+    "test_index,expected_missing,expected_inv_checksum",
+    [
+        (
+            "test_index_missing_file.json",
+            {"clips": {"test_missing": ["tests/resources/test_missing.wav"]}},
+            {"clips": {}},
+        ),
+        (
+            "test_index_invalid_checksum.json",
+            {"clips": {}},
+            {"clips": {"test": ["tests/resources/test.wav"]}},
+        ),
+    ],
+)
+def test_validate_index_parallel(test_index, expected_missing, expected_inv_checksum):
+    index_path = os.path.join("tests/indexes", test_index)
+    with open(index_path) as index_file:
+        test_index = json.load(index_file)
+
+    missing_files, invalid_checksums = validate.validate_index(
+        test_index, "tests/resources/", num_workers=4, chunk_size=1024
+    )
+
+    assert expected_missing == missing_files
+    assert expected_inv_checksum == invalid_checksums
+
+
+def test_validate_paths_order(tmp_path):
+    file_paths = []
+    for i in range(20):
+        local_path = str(tmp_path / "{}.bin".format(i))
+        with open(local_path, "wb") as fhandle:
+            fhandle.write(os.urandom(10000 * (20 - i)))
+        checksum = validate.md5(local_path) if i % 2 else "0" * 32
+        file_paths.append(("file_{}".format(i % 3), local_path, checksum))
+    file_paths.append(("file_0", str(tmp_path / "missing.bin"), "0" * 32))
+
+    sequential = validate.validate_paths(file_paths, False)
+    parallel = validate.validate_paths(
+        file_paths, False, num_workers=8, chunk_size=4096
+    )
+    assert sequential == parallel
+    assert parallel[0] == {"file_0": [str(tmp_path / "missing.bin")]}
+    assert sum(len(paths) for paths in parallel[1].values()) == 10
+
+
+def test_validate_paths_modes(tmp_path, mocker):
+    file_paths = []
+    for i in range(10):
+        local_path = str(tmp_path / "{}.bin".format(i))
+        with open(local_path, "wb") as fhandle:
+            fhandle.write(os.urandom(1000))
+        file_paths.append(("file_{}".format(i), local_path, validate.md5(local_path)))
+    empty_path = str(tmp_path / "empty.bin")
+    open(empty_path, "wb").close()
+    file_paths.append(("empty", empty_path, "0" * 32))
+    file_paths.append(("missing", str(tmp_path / "missing.bin"), "0" * 32))
+    missing = {"missing": [str(tmp_path / "missing.bin")]}
+
+    md5 = mocker.spy(validate, "md5")
+    assert validate.validate_paths(file_paths, False, mode="exists") == (missing, {})
+    assert validate.validate_paths(file_paths, False, mode="size") == (
+        missing,
+        {"empty": [empty_path]},
+    )
+    assert md5.call_count == 0
+
+    validate.validate_paths(file_paths, False, mode="sample", sample_fraction=0.25)
+    assert md5.call_count == 3
+    validate.validate_paths(file_paths, False, mode="sample", sample_fraction=0.0)
+    assert md5.call_count == 4
+
+    # sizes are compared with the ones recorded in the manifest
+    manifest = {}
+    validate.validate_paths(file_paths, False, manifest=manifest)
+    with open(file_paths[0][1], "ab") as fhandle:
+        fhandle.write(b"0")
+    with open(file_paths[1][1], "r+b") as fhandle:
+        fhandle.write(b"0")
+    assert validate.validate_paths(
+        file_paths, False, manifest=manifest, mode="size"
+    ) == (missing, {"file_0": [file_paths[0][1]], "empty": [empty_path]})
+
+    with pytest.raises(ValueError):
+        validate.validate_paths(file_paths, False, mode="asdf")
+
+
+def test_validate_benchmark(tmp_path):
+    # compares MB/sec of sequential 4 KB reads against parallel 1 MB reads
+    file_paths = []
+    for i in range(16):
+        local_path = str(tmp_path / "{}.bin".format(i))
+        with open(local_path, "wb") as fhandle:
+            fhandle.write(os.urandom(4 * 1024 * 1024))
+        file_paths.append((str(i), local_path, "0" * 32))
+    n_megabytes = 4 * len(file_paths)
+
+    start = time.perf_counter()
+    validate.validate_paths(file_paths, False, num_workers=1, chunk_size=4096)
+    sequential_rate = n_megabytes / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    validate.validate_paths(file_paths, False, num_workers=8)
+    parallel_rate = n_megabytes / (time.perf_counter() - start)
+
+    print(
+        "sequential: {:.1f} MB/sec, num_workers=8: {:.1f} MB/sec".format(
+            sequential_rate, parallel_rate
+        )
+    )
+    assert sequential_rate > 0 and parallel_rate > 0